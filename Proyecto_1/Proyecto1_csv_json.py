@@ -1,5 +1,14 @@
 import pandas as pd
 import os
+import sys
+import time
+import json
+import hashlib
+import re
+import threading
+import importlib.util
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, as_completed
 
 # Carpeta principal donde están los CSV originales
 CARPETA_SUPER = r"C:\Users\Fer\OneDrive\Escritorio\Modelado de Mineria de Datos\Proyecto_1\supermercado"
@@ -8,54 +17,597 @@ CARPETA_SUPER = r"C:\Users\Fer\OneDrive\Escritorio\Modelado de Mineria de Datos\
 CARPETA_EXCEL = os.path.join(CARPETA_SUPER, "archivos_excel")
 CARPETA_JSON = os.path.join(CARPETA_SUPER, "archivos_json")
 CARPETA_CSV = os.path.join(CARPETA_SUPER, "archivos_csv")
+CARPETA_PARQUET = os.path.join(CARPETA_SUPER, "archivos_parquet")
+CARPETA_FEATHER = os.path.join(CARPETA_SUPER, "archivos_feather")
+CARPETA_ARROW = os.path.join(CARPETA_SUPER, "archivos_arrow")
+
+# Formatos que se generan (parquet, feather y arrow necesitan pyarrow; sin él se omiten con un aviso)
+FORMATOS_ACTIVOS = ["excel", "json", "csv", "parquet", "feather", "arrow"]
+
+# Procesos que convierten a la vez, un archivo por proceso (1 = uno por uno, sin pool; ej: os.cpu_count())
+TRABAJADORES = 1
+
+# Modo streaming: lee el CSV por bloques y escribe cada salida a medida (memoria acotada para cualquier tamaño)
+MODO_STREAMING = False
+TAMANO_BLOQUE = 100_000  # filas por bloque en modo streaming
+
+# Límite de filas de una hoja de Excel (encabezado incluido); pasado esto se sigue en otra hoja
+FILAS_MAX_EXCEL = 1_048_576
+
+# Modo vigilancia (--watch): segundos sin cambios antes de convertir un CSV que se está copiando,
+# y cada cuánto se revisa la carpeta si no hay notificaciones del sistema (watchdog)
+ESPERA_ESTABLE = 2.0
+INTERVALO_REVISION = 1.0
+
+# Manifiesto con la huella de cada CSV y los parámetros con que se generó cada salida
+MANIFIESTO = os.path.join(CARPETA_SUPER, ".manifiesto_conversion.json")
 
 # --- Crear carpetas si no existen ---
-for carpeta in [CARPETA_EXCEL, CARPETA_JSON, CARPETA_CSV]:
+for carpeta in [CARPETA_EXCEL, CARPETA_JSON, CARPETA_CSV, CARPETA_PARQUET, CARPETA_FEATHER, CARPETA_ARROW]:
     os.makedirs(carpeta, exist_ok=True)
 
 
+# --- Carpeta, extensión y parámetros de cada formato de salida ---
+SALIDAS = {
+    "excel": (CARPETA_EXCEL, ".xlsx"),
+    "json": (CARPETA_JSON, ".json"),
+    "csv": (CARPETA_CSV, ".csv"),
+    "parquet": (CARPETA_PARQUET, ".parquet"),
+    "feather": (CARPETA_FEATHER, ".feather"),
+    "arrow": (CARPETA_ARROW, ".arrow"),
+}
+
+# Si cambian, el manifiesto detecta que la salida quedó vieja y se vuelve a generar
+PARAMETROS = {
+    "excel": {"index": False},
+    "json": {"orient": "records", "indent": 4},
+    "csv": {"index": False},
+    "parquet": {"compression": "zstd", "row_group_size": 100_000},
+    "feather": {"compression": "zstd"},
+    "arrow": {"compression": None},  # sin comprimir: se puede abrir con memory map sin copiar
+}
+
+# Paquete que necesita cada formato (el Excel por bloques usa xlsxwriter en lugar de openpyxl)
+PAQUETES = {"excel": "openpyxl", "parquet": "pyarrow", "feather": "pyarrow", "arrow": "pyarrow"}
+
+@lru_cache(maxsize=None)
+def formatos_disponibles(formatos, streaming=False):
+    # Los formatos cuyo paquete no está instalado se sacan de la lista con un solo aviso por ejecución
+    # (si no, fallarían en cada corrida, nunca entrarían al manifiesto y no se podría saltear nada)
+    disponibles, faltan = [], {}
+    for formato in formatos:
+        paquete = "xlsxwriter" if formato == "excel" and streaming else PAQUETES.get(formato)
+        if paquete and importlib.util.find_spec(paquete) is None:
+            faltan.setdefault(paquete, []).append(formato)
+        else:
+            disponibles.append(formato)
+    for paquete, formatos_sin_paquete in faltan.items():
+        print(f" Falta {paquete} (pip install {paquete}): no se generan {', '.join(formatos_sin_paquete)}.")
+    return disponibles
+
+def ruta_salida(nombre_base, formato):
+    carpeta, extension = SALIDAS[formato]
+    return os.path.join(carpeta, f"{nombre_base}{extension}")
+
+
+# --- Escritores de cada formato de salida ---
+def guardar_excel(df, nombre_base):
+    df.to_excel(ruta_salida(nombre_base, "excel"), **PARAMETROS["excel"])
+
+def guardar_json(df, nombre_base):
+    df.to_json(ruta_salida(nombre_base, "json"), **PARAMETROS["json"])
+
+def guardar_csv(df, nombre_base):
+    df.to_csv(ruta_salida(nombre_base, "csv"), **PARAMETROS["csv"])
+
+
+# --- Formatos columnares: guardan el tipo de cada columna (fechas como fechas, números como números) ---
+def importar_pyarrow():
+    try:
+        import pyarrow as pa  # solo hace falta para parquet, feather y arrow
+        import pyarrow.parquet  # noqa: F401 (registra pa.parquet)
+        import pyarrow.feather  # noqa: F401
+    except ImportError as e:
+        raise ImportError("Los formatos parquet, feather y arrow necesitan pyarrow (pip install pyarrow)") from e
+    return pa
+
+def son_fechas(valores):
+    # Todos los valores (sin los vacíos) son fechas ISO (2025-08-01 o 2025-08-01 10:30:00)
+    valores = valores.dropna()
+    if valores.empty:
+        return True
+    if not pd.api.types.is_string_dtype(valores) or pd.api.types.is_numeric_dtype(valores):
+        return False
+    return bool(pd.to_datetime(valores, format="ISO8601", errors="coerce").notna().all())
+
+def columnas_fecha(df):
+    # Columnas de texto en las que todos los valores son fechas ISO
+    fechas = []
+    for col in df.columns:
+        valores = df[col].dropna()
+        if valores.empty or not re.match(r"\d{4}-\d{2}-\d{2}", str(valores.iloc[0])):
+            continue
+        if son_fechas(valores):
+            fechas.append(col)
+    return fechas
+
+def tabla_arrow(df, fechas=None):
+    pa = importar_pyarrow()
+    cambios = {}
+    for col in columnas_fecha(df) if fechas is None else fechas:
+        convertidas = pd.to_datetime(df[col], format="ISO8601", errors="coerce")
+        if (convertidas.dropna() == convertidas.dropna().dt.normalize()).all():
+            convertidas = convertidas.astype(pd.ArrowDtype(pa.date32()))  # solo fecha, sin hora
+        cambios[col] = convertidas
+    return pa.Table.from_pandas(df.assign(**cambios), preserve_index=False)
+
+def guardar_parquet(df, nombre_base):
+    pa = importar_pyarrow()
+    pa.parquet.write_table(tabla_arrow(df), ruta_salida(nombre_base, "parquet"), **PARAMETROS["parquet"])
+
+def guardar_feather(df, nombre_base):
+    pa = importar_pyarrow()
+    pa.feather.write_feather(tabla_arrow(df), ruta_salida(nombre_base, "feather"), **PARAMETROS["feather"])
+
+def guardar_arrow(df, nombre_base):
+    pa = importar_pyarrow()
+    tabla = tabla_arrow(df)
+    opciones = pa.ipc.IpcWriteOptions(compression=PARAMETROS["arrow"]["compression"])
+    with pa.ipc.new_file(ruta_salida(nombre_base, "arrow"), tabla.schema, options=opciones) as escritor:
+        escritor.write_table(tabla)
+
+FORMATOS = {
+    "excel": guardar_excel,
+    "json": guardar_json,
+    "csv": guardar_csv,
+    "parquet": guardar_parquet,
+    "feather": guardar_feather,
+    "arrow": guardar_arrow,
+}
+
+
+# --- Escritores por bloques (modo streaming): reciben un bloque a la vez y no guardan el archivo entero ---
+class ExcelPorBloques:
+    def __init__(self, ruta):
+        try:
+            import xlsxwriter  # solo hace falta en modo streaming
+        except ImportError as e:
+            raise ImportError("El modo streaming a Excel necesita xlsxwriter (pip install xlsxwriter)") from e
+        # constant_memory: cada fila se escribe al disco apenas se completa
+        self.libro = xlsxwriter.Workbook(ruta, {"constant_memory": True})
+        self.hoja = None
+        self.fila = 0
+        self.columnas = []
+
+    def _nueva_hoja(self):
+        self.hoja = self.libro.add_worksheet(f"Sheet{len(self.libro.worksheets()) + 1}")
+        self.hoja.write_row(0, 0, self.columnas)
+        self.fila = 1
+
+    def escribir(self, bloque):
+        self.columnas = list(bloque.columns)
+        # NaN -> celda vacía y tipos nativos de Python
+        for valores in bloque.astype(object).where(bloque.notna(), None).values.tolist():
+            if self.hoja is None or self.fila >= FILAS_MAX_EXCEL:
+                self._nueva_hoja()
+            self.hoja.write_row(self.fila, 0, valores)
+            self.fila += 1
+
+    def cerrar(self):
+        if self.hoja is None:
+            self._nueva_hoja()  # CSV sin filas: hoja solo con el encabezado
+        self.libro.close()
+
+class JSONPorBloques:
+    # Mismo arreglo JSON que guardar_json, escrito de a un bloque de registros
+    def __init__(self, ruta):
+        self.archivo = open(ruta, "w", encoding="utf-8")
+        self.archivo.write("[")
+        self.vacio = True
+
+    def escribir(self, bloque):
+        if bloque.empty:
+            return
+        registros = bloque.to_json(**PARAMETROS["json"]).strip()[1:-1].rstrip()  # sin los corchetes del bloque
+        if not self.vacio:
+            self.archivo.write(",")
+        self.archivo.write(registros)
+        self.vacio = False
+
+    def cerrar(self):
+        self.archivo.write("]" if self.vacio else "\n]")
+        self.archivo.close()
+
+class CSVPorBloques:
+    def __init__(self, ruta):
+        self.archivo = open(ruta, "w", encoding="utf-8", newline="")
+        self.primero = True
+
+    def escribir(self, bloque):
+        bloque.to_csv(self.archivo, header=self.primero, **PARAMETROS["csv"])
+        self.primero = False
+
+    def cerrar(self):
+        self.archivo.close()
+
+class ColumnarPorBloques:
+    # El primer bloque fija las columnas de fecha y el esquema. Si un bloque posterior no entra en el esquema
+    # (texto en una columna que era numérica, decimales en una de enteros, un valor que no es fecha ISO en una
+    # columna de fechas), esa columna se amplía (a float o a texto) y lo ya escrito se reescribe con el esquema
+    # nuevo, de a un lote por vez. Se escribe en un temporal que reemplaza a la salida al cerrar.
+    def __init__(self, ruta, formato):
+        self.pa = importar_pyarrow()
+        self.ruta = ruta
+        self.temporal = ruta + ".tmp"
+        self.formato = formato
+        self.escritor = None
+        self.esquema = None
+        self.fechas = None
+
+    def _abrir(self, esquema):
+        pa = self.pa
+        # Una columna vacía en el primer bloque queda como texto para que entren los valores de los siguientes
+        self.esquema = pa.schema([campo.with_type(pa.string()) if pa.types.is_null(campo.type) else campo
+                                  for campo in esquema], metadata=esquema.metadata)
+        parametros = PARAMETROS[self.formato]
+        if self.formato == "parquet":
+            self.escritor = pa.parquet.ParquetWriter(self.temporal, self.esquema,
+                                                     compression=parametros["compression"])
+        else:
+            # feather (v2) y arrow son el mismo formato de archivo IPC de Arrow, con o sin compresión
+            opciones = pa.ipc.IpcWriteOptions(compression=parametros["compression"])
+            self.escritor = pa.ipc.new_file(self.temporal, self.esquema, options=opciones)
+
+    def _escribir_tabla(self, tabla):
+        if self.formato == "parquet":
+            self.escritor.write_table(tabla, row_group_size=PARAMETROS["parquet"]["row_group_size"])
+        else:
+            self.escritor.write_table(tabla)
+
+    def _lotes_escritos(self, ruta):
+        # Lo ya escrito, de a un lote (row group en parquet, record batch en IPC)
+        if self.formato == "parquet":
+            with self.pa.parquet.ParquetFile(ruta) as archivo:
+                for numero in range(archivo.num_row_groups):
+                    yield archivo.read_row_group(numero)
+        else:
+            with self.pa.ipc.open_file(ruta) as lector:
+                for numero in range(lector.num_record_batches):
+                    yield self.pa.Table.from_batches([lector.get_batch(numero)])
+
+    def _ampliar(self, tabla):
+        # Cada columna que no se puede convertir al tipo del esquema pasa a float (si las dos son números) o a texto
+        pa = self.pa
+        campos = []
+        for campo in self.esquema:
+            columna = tabla.column(campo.name)
+            tipo = campo.type
+            try:
+                columna.cast(tipo)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                numericos = all(pa.types.is_integer(t) or pa.types.is_floating(t) for t in (tipo, columna.type))
+                tipo = pa.float64() if numericos else pa.string()
+                print(f"  {os.path.basename(self.ruta)}: la columna '{campo.name}' cambia de tipo en un bloque "
+                      f"posterior, se guarda como {tipo}.")
+            campos.append(campo.with_type(tipo))
+        esquema = pa.schema(campos)  # sin la metadata de pandas, que describe los tipos viejos
+
+        # Se cierra lo escrito, se relee y se pasa al esquema nuevo
+        self.escritor.close()
+        anterior = self.temporal + ".anterior"
+        os.replace(self.temporal, anterior)
+        self._abrir(esquema)
+        lotes = self._lotes_escritos(anterior)
+        try:
+            for lote in lotes:
+                self._escribir_tabla(lote.cast(self.esquema))
+        finally:
+            lotes.close()  # cierra el archivo aunque la copia se corte, así se puede borrar
+            os.remove(anterior)
+
+    def escribir(self, bloque):
+        if self.fechas is None:
+            self.fechas = columnas_fecha(bloque)
+        # Una columna de fechas con algún valor que no es fecha ISO pasa a texto (no se convierte en nulo)
+        self.fechas = [col for col in self.fechas if son_fechas(bloque[col])]
+        tabla = tabla_arrow(bloque, self.fechas)
+        if self.escritor is None:
+            self._abrir(tabla.schema)
+        try:
+            tabla = tabla.cast(self.esquema)
+        except (self.pa.ArrowInvalid, self.pa.ArrowNotImplementedError):
+            self._ampliar(tabla)
+            tabla = tabla.cast(self.esquema)
+        self._escribir_tabla(tabla)
+
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+            os.replace(self.temporal, self.ruta)
+
+ESCRITORES_POR_BLOQUES = {
+    "excel": ExcelPorBloques,
+    "json": JSONPorBloques,
+    "csv": CSVPorBloques,
+    "parquet": lambda ruta: ColumnarPorBloques(ruta, "parquet"),
+    "feather": lambda ruta: ColumnarPorBloques(ruta, "feather"),
+    "arrow": lambda ruta: ColumnarPorBloques(ruta, "arrow"),
+}
+
+
+# --- Manifiesto: qué salidas están al día ---
+def cargar_manifiesto():
+    if not os.path.exists(MANIFIESTO):
+        return {}
+    try:
+        with open(MANIFIESTO, "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        print(" Manifiesto ilegible, se vuelve a convertir todo.")
+        return {}
+
+def guardar_manifiesto(manifiesto):
+    temporal = MANIFIESTO + ".tmp"  # se escribe aparte y se reemplaza, así nunca queda a medio escribir
+    with open(temporal, "w", encoding="utf-8") as f:
+        json.dump(manifiesto, f, indent=2)
+    os.replace(temporal, MANIFIESTO)
+
+def sha256_archivo(ruta):
+    sha = hashlib.sha256()
+    with open(ruta, "rb") as f:
+        for bloque in iter(lambda: f.read(1024 * 1024), b""):
+            sha.update(bloque)
+    return sha.hexdigest()
+
+def huella_csv(ruta, anterior=None):
+    # Si tamaño y fecha no cambiaron se reutiliza el hash guardado; si cambió cualquiera de los dos se
+    # recalcula, y las salidas se regeneran solo si el hash es distinto (un cambio de fecha solo no alcanza)
+    info = os.stat(ruta)
+    huella = {"tamano": info.st_size, "mtime_ns": info.st_mtime_ns}
+    if anterior and anterior["tamano"] == info.st_size and anterior["mtime_ns"] == info.st_mtime_ns:
+        huella["sha256"] = anterior["sha256"]
+    else:
+        huella["sha256"] = sha256_archivo(ruta)
+    return huella
+
+def formatos_desactualizados(archivo, huella, manifiesto, formatos, forzar=False):
+    entrada = manifiesto.get(archivo, {})
+    nombre_base = os.path.splitext(archivo)[0]
+    mismo_origen = entrada.get("sha256") == huella["sha256"]
+
+    pendientes = []
+    for formato in formatos:
+        if (forzar or not mismo_origen
+                or entrada.get("salidas", {}).get(formato) != PARAMETROS[formato]
+                or not os.path.exists(ruta_salida(nombre_base, formato))):
+            pendientes.append(formato)
+    return pendientes
+
+def registrar_salida(manifiesto, archivo, huella, formato):
+    entrada = manifiesto.setdefault(archivo, {"salidas": {}})
+    if entrada.get("sha256") != huella["sha256"]:
+        entrada["salidas"] = {}  # las salidas de la versión anterior del CSV ya no valen
+    entrada.update(huella)
+    entrada["salidas"][formato] = PARAMETROS[formato]
+
+
 # --- Listar los archivos CSV dentro de la carpeta supermercado ---
 def listar_csv():
     archivos = [f for f in os.listdir(CARPETA_SUPER) if f.endswith(".csv")]
     return archivos
 
+# --- Convertir un archivo leyéndolo por bloques, con todas sus salidas abiertas a la vez ---
+def convertir_por_bloques(archivo, formatos, tamano_bloque=TAMANO_BLOQUE):
+    # Devuelve los segundos de cada formato escrito y el error de los que fallaron: si falla una salida,
+    # las demás siguen
+    nombre_base = os.path.splitext(archivo)[0]
+    tiempos = {}
+    errores = {}
+    escritores = {}
+    try:
+        for formato in formatos:
+            try:
+                escritores[formato] = ESCRITORES_POR_BLOQUES[formato](ruta_salida(nombre_base, formato))
+                tiempos[formato] = 0.0
+            except Exception as e:
+                errores[formato] = e
+
+        with pd.read_csv(os.path.join(CARPETA_SUPER, archivo), chunksize=tamano_bloque) as lector:
+            for bloque in lector:
+                for formato, escritor in list(escritores.items()):
+                    inicio = time.perf_counter()
+                    try:
+                        escritor.escribir(bloque)
+                    except Exception as e:
+                        errores[formato] = e
+                        del escritores[formato], tiempos[formato]
+                        continue
+                    tiempos[formato] += time.perf_counter() - inicio
+    finally:
+        for formato, escritor in escritores.items():
+            try:
+                escritor.cerrar()
+            except Exception as e:
+                errores[formato] = e
+                tiempos.pop(formato, None)
+    return tiempos, errores
+
+# --- Convertir un archivo a todos sus formatos pendientes (lo que hace cada proceso del pool) ---
+def convertir_archivo(archivo, formatos, streaming=False, tamano_bloque=TAMANO_BLOQUE):
+    # El CSV se lee una sola vez. Devuelve los segundos de cada formato escrito y el error de los que fallaron
+    # (si falla la lectura, la excepción sale de acá y se informa una vez por archivo)
+    if streaming:
+        return convertir_por_bloques(archivo, formatos, tamano_bloque)
+    df = pd.read_csv(os.path.join(CARPETA_SUPER, archivo))
+    nombre_base = os.path.splitext(archivo)[0]  # quita la extensión .csv
+    tiempos, errores = {}, {}
+    for formato in formatos:
+        inicio = time.perf_counter()
+        try:
+            FORMATOS[formato](df, nombre_base)
+            tiempos[formato] = time.perf_counter() - inicio
+        except Exception as e:
+            errores[formato] = e
+    return tiempos, errores
+
+# --- Mostrar cuánto tardó cada formato y la conversión completa ---
+def mostrar_tiempos(tiempos, total):
+    print("\n" + "=" * 50)
+    print(" TIEMPOS DE CONVERSIÓN")
+    print("=" * 50)
+    for formato, segundos in tiempos.items():
+        print(f" {formato:<8} {segundos:8.2f}s")
+    print(f" Suma de tareas: {sum(tiempos.values()):.2f}s - tiempo total: {total:.2f}s")
+
 # --- Cargar y convertir cada archivo ---
-def convertir_archivos():
-    archivos_csv = listar_csv()
+def convertir_archivos(trabajadores=TRABAJADORES, forzar=False, streaming=MODO_STREAMING, tamano_bloque=TAMANO_BLOQUE,
+                       archivos=None):
+    archivos_csv = listar_csv() if archivos is None else archivos
 
     if not archivos_csv:
         print(" No se encontraron archivos CSV en la carpeta.")
         return
 
+    inicio = time.perf_counter()
+    formatos_activos = formatos_disponibles(tuple(FORMATOS_ACTIVOS), streaming)
+    tiempos = {formato: 0.0 for formato in formatos_activos}
+    manifiesto = cargar_manifiesto()
+
+    # Solo se convierten las salidas que faltan o quedaron viejas (forzar = todas)
+    huellas = {}
+    pendientes = {}
     for archivo in archivos_csv:
-        ruta_csv = os.path.join(CARPETA_SUPER, archivo)
-        nombre_base = os.path.splitext(archivo)[0]  # quita la extensión .csv
+        huellas[archivo] = huella_csv(os.path.join(CARPETA_SUPER, archivo), manifiesto.get(archivo))
+        formatos = formatos_desactualizados(archivo, huellas[archivo], manifiesto, formatos_activos, forzar)
+        if formatos:
+            pendientes[archivo] = formatos
+        else:
+            manifiesto[archivo].update(huellas[archivo])  # puede haber cambiado solo la fecha
+    omitidos = len(archivos_csv) - len(pendientes)
+    if omitidos:
+        print(f" {omitidos} archivo(s) sin cambios, se omiten.")
+    if not pendientes:
+        guardar_manifiesto(manifiesto)
+        print(f" Todo al día ({(time.perf_counter() - inicio) * 1000:.0f} ms).")
+        return
 
-        try:
-            df = pd.read_csv(ruta_csv)
-            print(f" Archivo '{archivo}' cargado correctamente.")
+    def terminar(archivo, tiempos_archivo, errores):
+        for formato, segundos in tiempos_archivo.items():
+            tiempos[formato] += segundos
+            registrar_salida(manifiesto, archivo, huellas[archivo], formato)
+        if tiempos_archivo:
+            modo = " por bloques" if streaming else ""
+            print(f" Archivo '{archivo}' convertido{modo} a {', '.join(tiempos_archivo)} en sus respectivas carpetas.")
+        if errores:
+            print(f" Error al procesar {archivo}: {'; '.join(f'{formato}: {e}' for formato, e in errores.items())}")
 
-            # Guardar como Excel
-            ruta_excel = os.path.join(CARPETA_EXCEL, f"{nombre_base}.xlsx")
-            df.to_excel(ruta_excel, index=False)
+    if trabajadores <= 1 or len(pendientes) == 1:
+        for archivo, formatos in pendientes.items():
+            try:
+                terminar(archivo, *convertir_archivo(archivo, formatos, streaming, tamano_bloque))
+            except Exception as e:
+                print(f" Error al procesar {archivo}: {e}")
+    else:
+        # Una tarea por archivo: cada CSV se lee una sola vez y escribe todas sus salidas pendientes
+        with ProcessPoolExecutor(max_workers=min(trabajadores, len(pendientes))) as pool:
+            tareas = {pool.submit(convertir_archivo, archivo, formatos, streaming, tamano_bloque): archivo
+                      for archivo, formatos in pendientes.items()}
+            for tarea in as_completed(tareas):
+                archivo = tareas[tarea]
+                try:
+                    terminar(archivo, *tarea.result())
+                except Exception as e:
+                    print(f" Error al procesar {archivo}: {e}")
 
-            # Guardar como JSON
-            ruta_json = os.path.join(CARPETA_JSON, f"{nombre_base}.json")
-            df.to_json(ruta_json, orient="records", indent=4)
+    guardar_manifiesto(manifiesto)
+    mostrar_tiempos(tiempos, time.perf_counter() - inicio)
 
-            # Guardar copia en carpeta CSV
-            ruta_csv_salida = os.path.join(CARPETA_CSV, archivo)
-            df.to_csv(ruta_csv_salida, index=False)
+# --- Vigilar la carpeta y convertir solo los CSV que cambian ---
+def firmas_csv():
+    firmas = {}
+    for entrada in os.scandir(CARPETA_SUPER):
+        if entrada.is_file() and entrada.name.endswith(".csv"):
+            info = entrada.stat()
+            firmas[entrada.name] = (info.st_size, info.st_mtime_ns)
+    return firmas
 
-            print(f"  Convertido a Excel, JSON y CSV en sus respectivas carpetas.\n")
+def iniciar_notificaciones(marcar):
+    # Notificaciones del sistema de archivos (inotify en Linux, ReadDirectoryChangesW en Windows) si está watchdog
+    try:
+        from watchdog.observers import Observer
+        from watchdog.events import FileSystemEventHandler
+    except ImportError:
+        return None
 
-        except Exception as e:
-            print(f" Error al procesar {archivo}: {e}")
+    class AvisoCSV(FileSystemEventHandler):
+        def on_any_event(self, evento):
+            # Solo escrituras: leer el CSV (incluso al convertirlo) también genera eventos de apertura
+            if evento.is_directory or evento.event_type not in ("created", "modified", "moved", "closed"):
+                return
+            ruta = getattr(evento, "dest_path", "") or evento.src_path  # al renombrar cuenta el nombre nuevo
+            if ruta.endswith(".csv"):
+                marcar(os.path.basename(ruta))
+
+    observador = Observer()
+    observador.schedule(AvisoCSV(), CARPETA_SUPER, recursive=False)
+    observador.start()
+    return observador
+
+def vigilar_carpeta(espera=ESPERA_ESTABLE, intervalo=INTERVALO_REVISION, forzar=False):
+    convertir_archivos(forzar=forzar)  # primero se pone al día lo que cambió mientras no se vigilaba
+
+    cambios = {}  # archivo -> momento del último cambio visto
+    candado = threading.Lock()
+
+    def marcar(archivo):
+        with candado:
+            cambios[archivo] = time.monotonic()
+
+    observador = iniciar_notificaciones(marcar)
+    if observador is None:
+        print(f" Vigilando '{CARPETA_SUPER}' revisando cada {intervalo:g}s (instalar watchdog para usar notificaciones).")
+    else:
+        print(f" Vigilando '{CARPETA_SUPER}' con notificaciones del sistema de archivos.")
+    print(" Ctrl+C para terminar.")
+
+    firmas = firmas_csv()
+    try:
+        while True:
+            time.sleep(intervalo)
+            if observador is None:
+                nuevas = firmas_csv()
+                for archivo, firma in nuevas.items():
+                    if firmas.get(archivo) != firma:
+                        marcar(archivo)
+                firmas = nuevas
+
+            # Un archivo se convierte recién cuando pasó `espera` segundos sin cambios (copia terminada)
+            ahora = time.monotonic()
+            with candado:
+                listos = [archivo for archivo, momento in cambios.items() if ahora - momento >= espera]
+                for archivo in listos:
+                    del cambios[archivo]
+
+            listos = [archivo for archivo in listos if os.path.exists(os.path.join(CARPETA_SUPER, archivo))]
+            if listos:
+                print(f"\n Cambios en: {', '.join(listos)}")
+                convertir_archivos(trabajadores=1, archivos=listos)
+    except KeyboardInterrupt:
+        print("\n Vigilancia terminada.")
+    finally:
+        if observador is not None:
+            observador.stop()
+            observador.join()
 
 # --- Ejecutar ---
 if __name__== "__main__":
-    convertir_archivos()
-    print(" Conversión completada. Los archivos se guardaron en sus carpetas correspondientes.")
+    # python Proyecto1_csv_json.py --force  -> vuelve a convertir todo aunque no haya cambios
+    # python Proyecto1_csv_json.py --watch  -> queda esperando CSV nuevos o modificados y convierte solo esos
+    if "--watch" in sys.argv[1:]:
+        vigilar_carpeta(forzar="--force" in sys.argv[1:])
+    else:
+        convertir_archivos(forzar="--force" in sys.argv[1:])
+        print(" Conversión completada. Los archivos se guardaron en sus carpetas correspondientes.")
 
 
 
@@ -1,80 +1,274 @@
 import pandas as pd
 import os
+import json
+import hashlib
+import sys
+import time
+from visor_csv import ver_csv
+import registros
 
 # Carpeta donde están los CSV
 CARPETA = r"C:\\Users\\Fer\\OneDrive\\Escritorio\\Modelado de Mineria de Datos\\Proyecto_1\\supermercado"
 
+# Cada cambio se anota en un journal (archivo.csv.journal) apenas se hace; el CSV se reescribe
+# recién al compactar: apenas el journal junta esta cantidad de cambios o cuando se pide con la opción 6
+COMPACTAR_CADA = 1000
+
+# True: al salir con la opción 5 se compacta, así otros programas que lean el CSV ven los cambios
+# (reescribe el CSV entero). Con False los cambios quedan en el journal y se aplican al volver a abrirlo
+COMPACTAR_AL_SALIR = False
+
 def listar_csv():
     archivos = [f for f in os.listdir(CARPETA) if f.endswith(".csv")]
     return archivos
 
+# --- Journal de cambios ---
+def ruta_journal(ruta):
+    return ruta + ".journal"
+
+CAMBIOS = {}  # ruta -> cambios anotados en el journal desde la última compactación
+
+def huella_base(ruta):
+    # Identifica la versión del CSV sobre la que se anotaron los cambios: tamaño, fecha y hash del primer MB
+    # (como el checkpoint de python_sql_union), sin leer el archivo entero
+    if not os.path.exists(ruta):
+        return None
+    info = os.stat(ruta)
+    with open(ruta, "rb") as f:
+        inicio = hashlib.sha256(f.read(1024 * 1024)).hexdigest()
+    return [info.st_size, info.st_mtime_ns, inicio]
+
+def registrar_operacion(ruta, operacion):
+    registrar_operaciones(ruta, [operacion])  # el cambio queda en disco aunque el programa se corte
+
+def registrar_operaciones(ruta, operaciones):
+    # Varias operaciones con una sola escritura a disco (inserción de muchas filas)
+    journal = ruta_journal(ruta)
+    nuevo = not os.path.exists(journal)
+    with open(journal, "a", encoding="utf-8") as f:
+        if nuevo:
+            f.write(json.dumps({"op": "base", "huella": huella_base(ruta)}) + "\n")
+        f.writelines(json.dumps(operacion, ensure_ascii=False, default=str) + "\n" for operacion in operaciones)
+        f.flush()
+        os.fsync(f.fileno())
+    CAMBIOS[ruta] = CAMBIOS.get(ruta, 0) + len(operaciones)
+
+def leer_journal(ruta):
+    journal = ruta_journal(ruta)
+    if not os.path.exists(journal):
+        return []
+    operaciones = []
+    with open(journal, "r", encoding="utf-8") as f:
+        for linea in f:
+            try:
+                operaciones.append(json.loads(linea))
+            except ValueError:
+                break  # última línea a medio escribir por un corte: se descarta
+    if not operaciones or operaciones[0] != {"op": "base", "huella": huella_base(ruta)}:
+        # El journal es de otra versión del CSV (ya se compactó o el CSV se cambió por fuera): no se aplica
+        os.replace(journal, journal + ".descartado")
+        print(f"El journal no corresponde a la versión actual del CSV, se apartó en {journal}.descartado")
+        return []
+    return operaciones[1:]
+
+def aplicar_operaciones(df, operaciones):
+    # Repite los cambios con las mismas funciones que usa el menú, así el índice queda igual que en la sesión
+    for operacion in operaciones:
+        if operacion["op"] == "insertar":
+            registros.indexar([operacion["fila"][registros.CLAVE]], len(df) + len(registros.PENDIENTES))
+            registros.PENDIENTES.append(operacion["fila"])  # inserciones seguidas se agregan juntas, no de a una
+            continue
+        df = registros.agregar_pendientes(df)
+        clave = operacion.get("clave")
+        if clave not in registros.INDICE:
+            continue
+        if operacion["op"] == "modificar":
+            registros.modificar_por_clave(df, clave, operacion["cambios"])
+        elif operacion["op"] == "eliminar":
+            registros.eliminar_por_clave(clave)
+    return registros.agregar_pendientes(df)
+
+def cambios_pendientes(ruta):
+    return CAMBIOS.get(ruta, 0)
+
 def cargar_datos(archivo):
     ruta= os.path.join(CARPETA, archivo)
     try:
-        df = pd.read_csv(ruta)
+        df = registros.enteros_con_nulos(pd.read_csv(ruta))
         print(f"Archivo {archivo} cargado con éxito ")
     except FileNotFoundError:
         print(f"El archivo {archivo} no existe, se creará uno nuevo al guardar.")
         df = pd.DataFrame()
+    registros.construir_indice(df)
+    operaciones = leer_journal(ruta)
+    CAMBIOS[ruta] = len(operaciones)
+    if operaciones:
+        df = aplicar_operaciones(df, operaciones)
+        print(f"Se recuperaron {len(operaciones)} cambios sin compactar del journal.")
     return df, ruta
 
+def compactar(df, ruta):
+    # Reescribe el CSV con todos los cambios y recién después borra el journal
+    df = registros.quitar_borradas(registros.agregar_pendientes(df))
+    temporal = ruta + ".tmp"
+    df.to_csv(temporal, index=False)
+    os.replace(temporal, ruta)
+    if os.path.exists(ruta_journal(ruta)):
+        os.remove(ruta_journal(ruta))
+    CAMBIOS[ruta] = 0
+    return df
+
+def compactar_si_hace_falta(df, ruta):
+    # Se llama después de cada cambio: el journal nunca pasa de COMPACTAR_CADA operaciones
+    pendientes = cambios_pendientes(ruta)
+    if pendientes >= COMPACTAR_CADA:
+        df = compactar(df, ruta)
+        print(f"El journal juntó {pendientes} cambios: se compactaron en el archivo ")
+    return df
+
 def guardar_datos(df, ruta):
-    df.to_csv(ruta, index=False)
-    print("Cambios guardados en el archivo ")
+    # Los cambios ya están en el journal; el CSV completo se reescribe al salir solo con COMPACTAR_AL_SALIR
+    pendientes = cambios_pendientes(ruta)
+    if not pendientes:
+        print("No hay cambios sin guardar.")
+    elif COMPACTAR_AL_SALIR:
+        compactar(df, ruta)
+        print(f"Cambios guardados en el archivo ({pendientes} cambios compactados) ")
+    else:
+        print(f"Cambios guardados en el journal ({pendientes} sin compactar; el CSV todavía no los tiene) ")
     
 def mostrar_datos(df):
     if df.empty:
         print("No hay datos cargados.")
     else:
         print("\n--- DATOS ACTUALES ---")
-        print(df)
+        print(df.drop(index=list(registros.BORRADAS)) if registros.BORRADAS else df)
 
-def insertar_registro(df):
+def insertar_registro(df, ruta=None):
     if df.empty:
         print(" No se puede insertar porque no hay columnas definidas en el CSV.")
         return df
     nuevo = {}
     for col in df.columns:
         nuevo[col] = input(f"Ingrese valor para {col}: ")
-    df.loc[len(df)] = nuevo
+    invalidas = registros.columnas_invalidas(df, nuevo)
+    if invalidas:
+        print(f"No es un número válido para {', '.join(invalidas)}, no se insertó.")
+        return df
+    if nuevo[registros.CLAVE].strip() == "":
+        print(f"Debe ingresar un {registros.CLAVE}, no se insertó.")
+        return df
+    if str(nuevo[registros.CLAVE]) in registros.INDICE:
+        print(f"Ya existe un registro con {registros.CLAVE} = {nuevo[registros.CLAVE]}, no se insertó.")
+        return df
+    registros.indexar([nuevo[registros.CLAVE]], len(df) + len(registros.PENDIENTES))
+    registros.PENDIENTES.append(nuevo)
+    # Si se juntan muchas, se agregan en un bloque proporcional a la tabla (cada fila se copia pocas veces)
+    if len(registros.PENDIENTES) >= max(1000, len(df) // 10):
+        df = registros.agregar_pendientes(df)
+    if ruta:
+        registrar_operacion(ruta, {"op": "insertar", "fila": nuevo})
     print("Registro insertado ")
     return df
 
-def modificar_registro(df):
+def insertar_varios(df, ruta=None):
+    # Inserta muchas filas de una vez, desde un archivo CSV o pegadas en la consola
     if df.empty:
-        print(" No hay registros para modificar.")
+        print("No se puede insertar porque no hay columnas definidas en el CSV.")
         return df
-    mostrar_datos(df)
-    try:
-        indice = int(input("Ingrese el índice (fila) a modificar: "))
-        if 0 <= indice < len(df):
-            for col in df.columns:
-                nuevo = input(f"{col} (actual: {df.at[indice, col]}): ")
-                if nuevo != "":
-                    df.at[indice, col] = nuevo
-            print("Registro modificado ")
-        else:
-            print("Índice fuera de rango.")
-    except ValueError:
-        print("Debe ingresar un número válido.")
+    nuevos = registros.leer_filas(list(df.columns))
+    if nuevos is None:
+        return df
+    nuevos, invalidos = registros.convertir_filas(df, nuevos)
+    invalidas = invalidos.any(axis=1)
+    if invalidas.any():
+        print(f"Se omiten {int(invalidas.sum())} filas con valores que no son números en columnas numéricas.")
+        nuevos = nuevos[~invalidas]
+    vacias = registros.claves_vacias(nuevos)
+    if vacias.any():
+        print(f"Se omiten {int(vacias.sum())} filas sin {registros.CLAVE}.")
+        nuevos = nuevos[~vacias]
+    repetidas = registros.claves_repetidas(nuevos)
+    if repetidas.any():
+        print(f"Se omiten {int(repetidas.sum())} filas con un {registros.CLAVE} que ya existe.")
+        nuevos = nuevos[~repetidas]
+    df = registros.insertar_filas(df, nuevos)
+    if ruta:
+        filas = nuevos.astype(object).where(nuevos.notna(), None).to_dict("records")
+        registrar_operaciones(ruta, [{"op": "insertar", "fila": fila} for fila in filas])
+    print(f"{len(nuevos)} registros insertados ")
     return df
 
-def eliminar_registro(df):
-    if df.empty:
+def modificar_registro(df, ruta=None):
+    if not registros.INDICE:
+        print("No hay registros para modificar.")
+        return df
+    clave = input(f"Ingrese el {registros.CLAVE} del registro a modificar: ").strip()
+    posicion = registros.buscar_registro(clave)
+    if posicion is None:
+        return df
+    cambios = {}
+    for col in df.columns:
+        nuevo = input(f"{col} (actual: {df.at[posicion, col]}): ")
+        if nuevo != "":
+            cambios[col] = nuevo
+    if not cambios:
+        return df
+    invalidas = registros.columnas_invalidas(df, cambios)
+    if invalidas:
+        print(f"No es un número válido para {', '.join(invalidas)}, no se modificó.")
+        return df
+    if registros.CLAVE in cambios and cambios[registros.CLAVE] != clave and cambios[registros.CLAVE] in registros.INDICE:
+        print(f"Ya existe un registro con {registros.CLAVE} = {cambios[registros.CLAVE]}, no se modificó.")
+        return df
+    registros.modificar_por_clave(df, clave, cambios)
+    if ruta:
+        registrar_operacion(ruta, {"op": "modificar", "clave": clave, "cambios": cambios})
+    print("Registro modificado ")
+    return df
+
+def eliminar_registro(df, ruta=None):
+    if not registros.INDICE:
         print("No hay registros para eliminar.")
         return df
-    mostrar_datos(df)
-    try:
-        indice = int(input("Ingrese el índice (fila) a eliminar: "))
-        if 0 <= indice < len(df):
-            df = df.drop(indice).reset_index(drop=True)
-            print("Registro eliminado 9")
-        else:
-            print("Índice fuera de rango.")
-    except ValueError:
-        print("Debe ingresar un número válido.")
+    clave = input(f"Ingrese el {registros.CLAVE} del registro a eliminar: ").strip()
+    if registros.buscar_registro(clave) is None:
+        return df
+    registros.eliminar_por_clave(clave)
+    if ruta:
+        registrar_operacion(ruta, {"op": "eliminar", "clave": clave})
+    print("Registro eliminado ")
     return df
 
+# --- Modo por lotes (sin menú) ---
+# python Proyecto_Final_variosCSV.py --lote operaciones.jsonl archivo.csv
+# Una operación JSON por línea, con el mismo formato que el journal:
+#   {"op": "insertar", "fila": {"id_producto": 10, "nombre": "Yerba"}}
+#   {"op": "modificar", "clave": 10, "cambios": {"precio": 1500}}
+#   {"op": "eliminar", "clave": 10}
+#   {"op": "eliminar", "donde": "precio <= 0"}   (condición de DataFrame.eval)
+# Se aplican en el orden del archivo (ver registros.aplicar_lote); el CSV se escribe una sola vez.
+
+def ejecutar_lote(ruta_lote, archivo):
+    inicio = time.perf_counter()
+    df, ruta = cargar_datos(archivo)
+    if df.empty:
+        print("No se puede aplicar el lote porque no hay columnas definidas en el CSV.")
+        return
+    try:
+        operaciones = registros.leer_lote(ruta_lote)
+        df, resumen = registros.aplicar_lote(df, operaciones)
+    except (OSError, ValueError, KeyError, TypeError, SyntaxError, NameError) as e:
+        print(f"No se aplicó el lote, el archivo quedó como estaba: {e}")
+        return
+    df = compactar(df, ruta)
+    print(f"Lote de {len(operaciones)} operaciones aplicado en {time.perf_counter() - inicio:.2f} s: "
+          f"{resumen['insertadas']} filas insertadas, {resumen['modificadas']} modificadas, {resumen['eliminadas']} eliminadas")
+    if resumen["repetidas"] or resumen["no_encontradas"] or resumen["invalidas"]:
+        print(f"Omitidas: {resumen['repetidas']} inserciones con {registros.CLAVE} repetido, "
+              f"{resumen['no_encontradas']} claves no encontradas, "
+              f"{resumen['invalidas']} operaciones sin {registros.CLAVE} o con valores no numéricos en columnas numéricas")
+
 # --- Programa principal ---
 def main():
     print("=== GESTOR DE CSV ===")
@@ -88,14 +282,20 @@ def main():
     for i, f in enumerate(archivos):
         print(f"{i+1}. {f}")
 
+    eleccion = input("\nSeleccione el número del archivo a abrir (v + número para solo verlo, sin cargarlo): ").strip()
     try:
-        opcion = int(input("\nSeleccione el número del archivo a abrir: ")) - 1
+        opcion = int(eleccion.lstrip("vV")) - 1
         archivo = archivos[opcion]
     except (ValueError, IndexError):
         print("Opción inválida.")
         return
 
+    if eleccion[:1] in ("v", "V"):
+        ver_csv(os.path.join(CARPETA, archivo))  # visor paginado: sirve para archivos de varios GB
+        return
+
     df, ruta = cargar_datos(archivo)
+    df = compactar_si_hace_falta(df, ruta)  # el journal recuperado ya puede tener muchos cambios
 
     while True:
         print("\n--- MENÚ ---")
@@ -103,24 +303,39 @@ def main():
         print("2. Insertar registro")
         print("3. Modificar registro")
         print("4. Eliminar registro")
-        print("5. Guardar y salir")
+        print("5. Guardar en el CSV y salir" if COMPACTAR_AL_SALIR else "5. Salir (los cambios quedan en el journal, no en el CSV)")
+        print("6. Compactar cambios en el CSV")
+        print("7. Insertar varios registros (archivo o filas pegadas)")
 
         opcion = input("Seleccione una opción: ")
+        if opcion != "2":
+            df = registros.agregar_pendientes(df)  # las filas insertadas pasan a la tabla antes de verla o tocarla
 
         if opcion == "1":
             mostrar_datos(df)
         elif opcion == "2":
-            df = insertar_registro(df)
+            df = insertar_registro(df, ruta)
         elif opcion == "3":
-            df = modificar_registro(df)
+            df = modificar_registro(df, ruta)
         elif opcion == "4":
-            df = eliminar_registro(df)
+            df = eliminar_registro(df, ruta)
         elif opcion == "5":
             guardar_datos(df, ruta)
             print(" Programa finalizado.")
             break
+        elif opcion == "6":
+            df = compactar(df, ruta)
+            print("Cambios compactados en el archivo ")
+        elif opcion == "7":
+            df = insertar_varios(df, ruta)
         else:
             print("Opción no válida.")
 
+        if opcion in ("2", "3", "4", "7"):
+            df = compactar_si_hace_falta(df, ruta)
+
 if __name__== "__main__":
-    main()
+    if len(sys.argv) == 4 and sys.argv[1] == "--lote":
+        ejecutar_lote(sys.argv[2], sys.argv[3])
+    else:
+        main()
@@ -1,10 +1,17 @@
 import pandas as pd
 import os
+import sys
+import time
+from visor_csv import ver_csv
+import registros
 
 # Nombre del archivo CSV
 
 ARCHIVO = r"C:\\Users\\Fer\\OneDrive\\Escritorio\\Modelado de Mineria de Datos\\Proyecto_1\\supermercado\\producto.csv"
 
+# A partir de este tamaño se ofrece abrir el archivo en el visor paginado en lugar de cargarlo entero
+TAMANO_VISOR = 100 * 1024 * 1024
+
 def listar_csv():
     archivos = [f for f in os.listdir(ARCHIVO)if f.endswith(".csv")]
     return archivos
@@ -13,14 +20,16 @@ def listar_csv():
 def cargar_datos(archivo):
     ruta = os.path.join(ARCHIVO, archivo)
     try:
-        df = pd.read_csv(ARCHIVO)
+        df = registros.enteros_con_nulos(pd.read_csv(ARCHIVO))
         print(f"Archivo {ARCHIVO} cargado con éxito ")
     except FileNotFoundError:
         print(f"El archivo {ARCHIVO} no existe, se creará uno nuevo al guardar.")
         df = pd.DataFrame()  # vacío
+    registros.construir_indice(df)
     return df
 
 def guardar_datos(df):
+    df = registros.quitar_borradas(df)
     df.to_csv(ARCHIVO, index=False)
     print("Cambios guardados en el archivo ")
 
@@ -29,7 +38,7 @@ def mostrar_datos(df):
         print("No hay datos cargados.")
     else:
         print("\n--- DATOS ACTUALES ---")
-        print(df)
+        print(df.drop(index=list(registros.BORRADAS)) if registros.BORRADAS else df)
 
 def insertar_registro(df):
     if df.empty:
@@ -38,47 +47,122 @@ def insertar_registro(df):
     nuevo = {}
     for col in df.columns:
         nuevo[col] = input(f"Ingrese valor para {col}: ")
-    df.loc[len(df)] = nuevo
+    invalidas = registros.columnas_invalidas(df, nuevo)
+    if invalidas:
+        print(f"No es un número válido para {', '.join(invalidas)}, no se insertó.")
+        return df
+    if nuevo[registros.CLAVE].strip() == "":
+        print(f"Debe ingresar un {registros.CLAVE}, no se insertó.")
+        return df
+    if str(nuevo[registros.CLAVE]) in registros.INDICE:
+        print(f"Ya existe un registro con {registros.CLAVE} = {nuevo[registros.CLAVE]}, no se insertó.")
+        return df
+    registros.indexar([nuevo[registros.CLAVE]], len(df) + len(registros.PENDIENTES))
+    registros.PENDIENTES.append(nuevo)
+    # Si se juntan muchas, se agregan en un bloque proporcional a la tabla (cada fila se copia pocas veces)
+    if len(registros.PENDIENTES) >= max(1000, len(df) // 10):
+        df = registros.agregar_pendientes(df)
     print("Registro insertado ")
     return df
 
-def modificar_registro(df):
+def insertar_varios(df):
+    # Inserta muchas filas de una vez, desde un archivo CSV o pegadas en la consola
     if df.empty:
+        print("No se puede insertar porque no hay columnas definidas en el CSV.")
+        return df
+    nuevos = registros.leer_filas(list(df.columns))
+    if nuevos is None:
+        return df
+    nuevos, invalidos = registros.convertir_filas(df, nuevos)
+    invalidas = invalidos.any(axis=1)
+    if invalidas.any():
+        print(f"Se omiten {int(invalidas.sum())} filas con valores que no son números en columnas numéricas.")
+        nuevos = nuevos[~invalidas]
+    vacias = registros.claves_vacias(nuevos)
+    if vacias.any():
+        print(f"Se omiten {int(vacias.sum())} filas sin {registros.CLAVE}.")
+        nuevos = nuevos[~vacias]
+    repetidas = registros.claves_repetidas(nuevos)
+    if repetidas.any():
+        print(f"Se omiten {int(repetidas.sum())} filas con un {registros.CLAVE} que ya existe.")
+        nuevos = nuevos[~repetidas]
+    df = registros.insertar_filas(df, nuevos)
+    print(f"{len(nuevos)} registros insertados ")
+    return df
+
+def modificar_registro(df):
+    if not registros.INDICE:
         print("No hay registros para modificar.")
         return df
-    mostrar_datos(df)
-    try:
-        indice = int(input("Ingrese el índice (fila) a modificar: "))
-        if 0 <= indice < len(df):
-            for col in df.columns:
-                nuevo = input(f"{col} (actual: {df.at[indice, col]}): ")
-                if nuevo != "":
-                    df.at[indice, col] = nuevo
-            print("Registro modificado ")
-        else:
-            print("Índice fuera de rango.")
-    except ValueError:
-        print("Debe ingresar un número válido.")
+    clave = input(f"Ingrese el {registros.CLAVE} del registro a modificar: ").strip()
+    posicion = registros.buscar_registro(clave)
+    if posicion is None:
+        return df
+    cambios = {}
+    for col in df.columns:
+        nuevo = input(f"{col} (actual: {df.at[posicion, col]}): ")
+        if nuevo != "":
+            cambios[col] = nuevo
+    if not cambios:
+        return df
+    invalidas = registros.columnas_invalidas(df, cambios)
+    if invalidas:
+        print(f"No es un número válido para {', '.join(invalidas)}, no se modificó.")
+        return df
+    if registros.CLAVE in cambios and cambios[registros.CLAVE] != clave and cambios[registros.CLAVE] in registros.INDICE:
+        print(f"Ya existe un registro con {registros.CLAVE} = {cambios[registros.CLAVE]}, no se modificó.")
+        return df
+    registros.modificar_por_clave(df, clave, cambios)
+    print("Registro modificado ")
     return df
 
 def eliminar_registro(df):
-    if df.empty:
+    if not registros.INDICE:
         print("No hay registros para eliminar.")
         return df
-    mostrar_datos(df)
-    try:
-        indice = int(input("Ingrese el índice (fila) a eliminar: "))
-        if 0 <= indice < len(df):
-            df = df.drop(indice).reset_index(drop=True)
-            print("Registro eliminado ")
-        else:
-            print("Índice fuera de rango.")
-    except ValueError:
-        print("Debe ingresar un número válido.")
+    clave = input(f"Ingrese el {registros.CLAVE} del registro a eliminar: ").strip()
+    if registros.buscar_registro(clave) is None:
+        return df
+    registros.eliminar_por_clave(clave)
+    print("Registro eliminado ")
     return df
 
+# --- Modo por lotes (sin menú) ---
+# python Proyecto_de_a_un_CSV.py --lote operaciones.jsonl
+# Una operación JSON por línea:
+#   {"op": "insertar", "fila": {"id_producto": 10, "nombre": "Yerba"}}
+#   {"op": "modificar", "clave": 10, "cambios": {"precio": 1500}}
+#   {"op": "eliminar", "clave": 10}
+#   {"op": "eliminar", "donde": "precio <= 0"}   (condición de DataFrame.eval)
+# Se aplican en el orden del archivo (ver registros.aplicar_lote); el CSV se escribe una sola vez.
+
+def ejecutar_lote(ruta_lote):
+    inicio = time.perf_counter()
+    df = cargar_datos(ARCHIVO)
+    if df.empty:
+        print("No se puede aplicar el lote porque no hay columnas definidas en el CSV.")
+        return
+    try:
+        operaciones = registros.leer_lote(ruta_lote)
+        df, resumen = registros.aplicar_lote(df, operaciones)
+    except (OSError, ValueError, KeyError, TypeError, SyntaxError, NameError) as e:
+        print(f"No se aplicó el lote, el archivo quedó como estaba: {e}")
+        return
+    guardar_datos(df)
+    print(f"Lote de {len(operaciones)} operaciones aplicado en {time.perf_counter() - inicio:.2f} s: "
+          f"{resumen['insertadas']} filas insertadas, {resumen['modificadas']} modificadas, {resumen['eliminadas']} eliminadas")
+    if resumen["repetidas"] or resumen["no_encontradas"] or resumen["invalidas"]:
+        print(f"Omitidas: {resumen['repetidas']} inserciones con {registros.CLAVE} repetido, "
+              f"{resumen['no_encontradas']} claves no encontradas, "
+              f"{resumen['invalidas']} operaciones sin {registros.CLAVE} o con valores no numéricos en columnas numéricas")
+
 # --- Programa principal ---
 def main():
+    if os.path.exists(ARCHIVO) and os.path.getsize(ARCHIVO) > TAMANO_VISOR:
+        megas = os.path.getsize(ARCHIVO) / (1024 * 1024)
+        if input(f"El archivo pesa {megas:.0f} MB. ¿Abrirlo en el visor paginado (solo lectura)? (s/n): ").strip().lower() == "s":
+            ver_csv(ARCHIVO)
+            return
     df = cargar_datos(ARCHIVO)
 
     while True:
@@ -88,8 +172,11 @@ def main():
         print("3. Modificar registro")
         print("4. Eliminar registro")
         print("5. Guardar y salir")
+        print("6. Insertar varios registros (archivo o filas pegadas)")
 
         opcion = input("Seleccione una opción: ")
+        if opcion != "2":
+            df = registros.agregar_pendientes(df)  # las filas insertadas pasan a la tabla antes de verla o tocarla
 
         if opcion == "1":
             mostrar_datos(df)
@@ -103,9 +190,14 @@ def main():
             guardar_datos(df)
             print(" Programa finalizado.")
             break
+        elif opcion == "6":
+            df = insertar_varios(df)
         else:
             print("Opción no válida.")
 
 if __name__ == "__main__":
-    main()
+    if len(sys.argv) == 3 and sys.argv[1] == "--lote":
+        ejecutar_lote(sys.argv[2])
+    else:
+        main()
 
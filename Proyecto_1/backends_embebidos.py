@@ -0,0 +1,272 @@
+# Interfaz de los motores de MySQLImporter y los motores embebidos (sin servidor): SQLite y DuckDB.
+# Cada backend implementa las operaciones que el importador necesita usando
+# el camino de carga masiva propio de cada motor (el de MySQL está en python_sql_union.py).
+
+import sqlite3 # viene con Python, no hace falta instalar nada.
+import logging
+import time
+from abc import ABC, abstractmethod
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+
+class Backend(ABC):
+    """Operaciones que MySQLImporter delega en el motor de base de datos"""
+
+    nombre = ''
+    marcador = '?'  # placeholder de parámetros del motor
+
+    # Caminos propios de MySQL que el importador solo usa si el motor los tiene
+    sentencias_multifila = False  # upsert con VALUES (...),(...) acotado por max_allowed_packet
+    load_data = False  # LOAD DATA LOCAL INFILE
+    carga_masiva = False  # desactivar foreign_key_checks y diferir índices no únicos durante la carga
+    verificacion_csv = False  # checksums por rango de clave contra el CSV
+
+    @abstractmethod
+    def conectar(self):
+        """Abre la conexión y la devuelve"""
+
+    @abstractmethod
+    def desconectar(self):
+        """Cierra la conexión"""
+
+    @abstractmethod
+    def cargar_esquema(self):
+        """Diccionario tabla -> columnas de su PRIMARY KEY"""
+
+    @abstractmethod
+    def crear_tabla_desde_df(self, df, nombre_tabla, clave_primaria, muestra=False):
+        """Crea la tabla con PRIMARY KEY a partir de las columnas del DataFrame"""
+
+    @abstractmethod
+    def agregar_clave_primaria(self, nombre_tabla, clave_primaria):
+        """Agrega la PRIMARY KEY a una tabla existente que no la tiene"""
+
+    @abstractmethod
+    def limpiar_duplicados(self, nombre_tabla, clave_primaria, estrategia='en_lugar', tamano_lote=10000):
+        """Deja una sola fila por clave y devuelve cuántas filas se borraron"""
+
+    @abstractmethod
+    def insertar_datos_bulk(self, df, nombre_tabla, clave_primaria):
+        """Upsert de todo el DataFrame; devuelve la cantidad de filas procesadas"""
+
+    @abstractmethod
+    def eliminar_por_clave(self, nombre_tabla, clave_primaria, claves, tamano_lote=1000):
+        """Elimina las filas cuyas claves primarias se indican, en lotes"""
+
+    @abstractmethod
+    def contar_filas(self, nombre_tabla):
+        """Cantidad de filas de la tabla"""
+
+    @abstractmethod
+    def borrar_tabla(self, nombre_tabla):
+        """Elimina la tabla si existe"""
+
+
+class BackendEmbebido(Backend):
+    """Base de los motores embebidos: la "base de datos" es un archivo local"""
+
+    def __init__(self, ruta_base):
+        self.ruta_base = ruta_base  # ruta del archivo de la base (o ':memory:')
+        self.connection = None
+
+    def desconectar(self):
+        """Cierra la conexión"""
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+    @abstractmethod
+    def _tipo_columna(self, serie):
+        """Tipo SQL de la columna según el dtype de pandas"""
+
+    def crear_tabla_desde_df(self, df, nombre_tabla, clave_primaria, muestra=False):
+        """Crea la tabla con PRIMARY KEY a partir de las columnas del DataFrame (los tipos no dependen de la muestra)"""
+        columnas_sql = []
+        for col in df.columns:
+            definicion = f'"{col}" {self._tipo_columna(df[col])}'
+            if col == clave_primaria:
+                definicion += " PRIMARY KEY"
+            columnas_sql.append(definicion)
+
+        self.connection.execute(f'CREATE TABLE "{nombre_tabla}" ({", ".join(columnas_sql)})')
+        self.connection.commit()
+        logger.info(f" Tabla '{nombre_tabla}' creada en {self.nombre} con PRIMARY KEY en '{clave_primaria}'")
+
+    def limpiar_duplicados(self, nombre_tabla, clave_primaria, estrategia='en_lugar', tamano_lote=10000):
+        """Borra en el lugar las filas sobrantes de cada clave (se queda la de menor rowid)"""
+        # El rowcount de DuckDB es -1: lo borrado se cuenta comparando COUNT(*) antes y después
+        filas_antes = self.contar_filas(nombre_tabla)
+        self.connection.execute(f'''
+            DELETE FROM "{nombre_tabla}"
+            WHERE rowid NOT IN (SELECT MIN(rowid) FROM "{nombre_tabla}" GROUP BY "{clave_primaria}")
+        ''')
+        self.connection.commit()
+        return filas_antes - self.contar_filas(nombre_tabla)
+
+    def eliminar_por_clave(self, nombre_tabla, clave_primaria, claves, tamano_lote=1000):
+        """Elimina las filas cuyas claves primarias se indican, en lotes"""
+        claves = list(claves)
+        eliminadas = 0
+        cursor = self.connection.cursor()
+        try:
+            for inicio in range(0, len(claves), tamano_lote):
+                lote = claves[inicio:inicio + tamano_lote]
+                placeholders = ", ".join([self.marcador] * len(lote))
+                cursor.execute(f'DELETE FROM "{nombre_tabla}" WHERE "{clave_primaria}" IN ({placeholders})', lote)
+                eliminadas += max(cursor.rowcount, 0)
+            self.connection.commit()
+            return eliminadas
+        finally:
+            cursor.close()
+
+    def contar_filas(self, nombre_tabla):
+        """Cantidad de filas de la tabla"""
+        return self.connection.execute(f'SELECT COUNT(*) FROM "{nombre_tabla}"').fetchone()[0]
+
+    def borrar_tabla(self, nombre_tabla):
+        """Elimina la tabla si existe"""
+        self.connection.execute(f'DROP TABLE IF EXISTS "{nombre_tabla}"')
+        self.connection.commit()
+
+
+class BackendSQLite(BackendEmbebido):
+    """SQLite: executemany de un upsert dentro de una sola transacción"""
+
+    nombre = 'SQLite'
+
+    def conectar(self):
+        self.connection = sqlite3.connect(self.ruta_base)
+        # Sin fsync por cada página: la base es local y se puede volver a importar
+        self.connection.execute("PRAGMA journal_mode = WAL")
+        self.connection.execute("PRAGMA synchronous = NORMAL")
+        return self.connection
+
+    def cargar_esquema(self):
+        """Tablas y columnas de PRIMARY KEY (pragma table_info)"""
+        esquema = {}
+        tablas = self.connection.execute("SELECT name FROM sqlite_master WHERE type = 'table'").fetchall()
+        for (tabla,) in tablas:
+            info = self.connection.execute(f'PRAGMA table_info("{tabla}")').fetchall()
+            # Columna 5 de table_info: posición dentro de la PK (0 = no es parte de la PK)
+            esquema[tabla] = [fila[1] for fila in sorted(info, key=lambda fila: fila[5]) if fila[5] > 0]
+        return esquema
+
+    def _tipo_columna(self, serie):
+        if pd.api.types.is_bool_dtype(serie) or pd.api.types.is_integer_dtype(serie):
+            return 'INTEGER'
+        if pd.api.types.is_float_dtype(serie):
+            return 'REAL'
+        return 'TEXT'
+
+    def agregar_clave_primaria(self, nombre_tabla, clave_primaria):
+        raise ValueError("SQLite no permite agregar una PRIMARY KEY a una tabla existente")
+
+    def insertar_datos_bulk(self, df, nombre_tabla, clave_primaria):
+        """Upsert (INSERT ... ON CONFLICT DO UPDATE) de todo el DataFrame en una transacción"""
+        columnas = list(df.columns)
+        cols_str = ", ".join(f'"{col}"' for col in columnas)
+        placeholders = ", ".join(["?"] * len(columnas))
+        update_cols = [col for col in columnas if col != clave_primaria]
+
+        if update_cols:
+            update_str = ", ".join(f'"{col}" = excluded."{col}"' for col in update_cols)
+            sql = f'''
+                INSERT INTO "{nombre_tabla}" ({cols_str}) VALUES ({placeholders})
+                ON CONFLICT("{clave_primaria}") DO UPDATE SET {update_str}
+            '''
+        else:
+            sql = f'INSERT OR IGNORE INTO "{nombre_tabla}" ({cols_str}) VALUES ({placeholders})'
+
+        # NaN -> None y tipos nativos de Python, columna por columna
+        datos = zip(*(serie.to_numpy(dtype=object, na_value=None) for _, serie in df.items()))
+
+        inicio = time.perf_counter()
+        try:
+            self.connection.executemany(sql, datos)
+            self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+        duracion = time.perf_counter() - inicio
+        logger.info(f" Procesadas {len(df)} filas en '{nombre_tabla}' (SQLite, {duracion:.2f}s)")
+        return len(df)
+
+
+class BackendDuckDB(BackendEmbebido):
+    """DuckDB: el DataFrame se registra como vista y se inserta con un solo INSERT OR REPLACE ... SELECT"""
+
+    nombre = 'DuckDB'
+
+    def conectar(self):
+        try:
+            import duckdb  # dependencia opcional: solo hace falta si se usa este motor
+        except ImportError as e:
+            raise ImportError("Para usar motor='duckdb' hay que instalar duckdb (pip install duckdb)") from e
+
+        self.connection = duckdb.connect(self.ruta_base)
+        return self.connection
+
+    def cargar_esquema(self):
+        """Tablas y columnas de PRIMARY KEY (duckdb_tables / duckdb_constraints)"""
+        esquema = {tabla: [] for (tabla,) in self.connection.execute("SELECT table_name FROM duckdb_tables()").fetchall()}
+        claves = self.connection.execute("""
+            SELECT table_name, constraint_column_names
+            FROM duckdb_constraints()
+            WHERE constraint_type = 'PRIMARY KEY'
+        """).fetchall()
+        for tabla, columnas in claves:
+            esquema[tabla] = list(columnas)
+        return esquema
+
+    def _tipo_columna(self, serie):
+        if pd.api.types.is_bool_dtype(serie):
+            return 'BOOLEAN'
+        if pd.api.types.is_integer_dtype(serie):
+            return 'BIGINT'
+        if pd.api.types.is_float_dtype(serie):
+            return 'DOUBLE'
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return 'TIMESTAMP'
+        return 'VARCHAR'
+
+    def agregar_clave_primaria(self, nombre_tabla, clave_primaria):
+        self.connection.execute(f'ALTER TABLE "{nombre_tabla}" ADD PRIMARY KEY ("{clave_primaria}")')
+        self.connection.commit()
+
+    def insertar_datos_bulk(self, df, nombre_tabla, clave_primaria):
+        """Escaneo columnar del DataFrame (sin convertir fila por fila) y upsert en una sentencia"""
+        # DuckDB no permite actualizar la misma clave dos veces en una sentencia: gana la última, como en MySQL
+        df = df.drop_duplicates(subset=[clave_primaria], keep='last')
+        cols_str = ", ".join(f'"{col}"' for col in df.columns)
+
+        inicio = time.perf_counter()
+        self.connection.register('df_importacion', df)
+        try:
+            self.connection.execute(f'''
+                INSERT OR REPLACE INTO "{nombre_tabla}" ({cols_str})
+                SELECT {cols_str} FROM df_importacion
+            ''')
+            self.connection.commit()
+        finally:
+            self.connection.unregister('df_importacion')
+
+        duracion = time.perf_counter() - inicio
+        logger.info(f" Procesadas {len(df)} filas en '{nombre_tabla}' (DuckDB, {duracion:.2f}s)")
+        return len(df)
+
+
+BACKENDS = {
+    'sqlite': BackendSQLite,
+    'duckdb': BackendDuckDB,
+}
+
+
+def crear_backend(motor, ruta_base):
+    """Devuelve el backend embebido para `motor` (el de MySQL lo crea MySQLImporter)"""
+    if motor not in BACKENDS:
+        raise ValueError(f"Motor desconocido: '{motor}'. Opciones: mysql, {', '.join(BACKENDS)}")
+    return BACKENDS[motor](ruta_base)
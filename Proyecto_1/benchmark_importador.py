@@ -0,0 +1,122 @@
+# Benchmark del importador: genera tablas sintéticas de tamaño creciente, las importa
+# con cada modo de MySQLImporter y guarda tiempos, filas/s y memoria de cada etapa.
+# Corre contra un servidor MySQL/MariaDB local o contra una base embebida (SQLite/DuckDB)
+# que no necesita servidor. No usar una base con datos reales: las tablas se borran.
+
+import json
+import logging
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from python_sql_union import MySQLImporter
+
+logger = logging.getLogger(__name__)
+
+
+def generar_tabla_sintetica(ruta_csv, filas, semilla=0, tamano_bloque=100_000):
+    """Escribe un CSV parecido a factura_detalle con `filas` filas, bloque a bloque"""
+    rng = np.random.default_rng(semilla)
+    fechas = pd.date_range('2025-01-01', periods=365).strftime('%Y-%m-%d').to_numpy()
+
+    with open(ruta_csv, 'w', encoding='utf-8', newline='') as f:
+        for inicio in range(0, filas, tamano_bloque):
+            n = min(tamano_bloque, filas - inicio)
+            bloque = pd.DataFrame({
+                'id_detalle': np.arange(inicio + 1, inicio + n + 1),
+                'id_factura': rng.integers(1, max(filas // 3, 2), n),
+                'id_producto': rng.integers(1, 500, n),
+                'cantidad': rng.integers(1, 10, n),
+                'precio_unitario': rng.integers(100, 200_000, n) / 100,
+                'fecha': fechas[rng.integers(0, len(fechas), n)],
+                'descripcion': np.char.add('Producto ', rng.integers(1, 500, n).astype(str)),
+            })
+            bloque.to_csv(f, index=False, header=inicio == 0)
+
+
+def correr_benchmark(db_config, tamanos, modos, carpeta):
+    """Importa cada tamaño con cada modo y devuelve una fila de resultados por corrida"""
+    resultados = []
+
+    for filas in tamanos:
+        ruta_csv = Path(carpeta) / f"sintetica_{filas}.csv"
+        if not ruta_csv.exists():
+            logger.info(f" Generando tabla sintética de {filas} filas")
+            generar_tabla_sintetica(ruta_csv, filas)
+
+        for nombre_modo, opciones in modos.items():
+            importer = MySQLImporter(**db_config, medir_memoria=True)
+            if not importer.conectar():
+                raise ConnectionError("No se pudo conectar al servidor del benchmark")
+
+            try:
+                importer.borrar_tabla('benchmark_detalle')
+                importer.importar_csv_completo(ruta_csv, 'benchmark_detalle', 'id_detalle', **opciones)
+                informe = importer.informes[-1].a_dict()
+            finally:
+                importer.desconectar()
+
+            informe.update({'modo': nombre_modo, 'filas': filas})
+            resultados.append(informe)
+
+            insertar = informe['etapas'].get('insertar', {})
+            print(f" {filas:>10,} filas | {nombre_modo:<20} | {informe['duracion_segundos']:8.2f}s | "
+                  f"{insertar.get('filas_por_segundo', 0):>12,.0f} filas/s | "
+                  f"{informe['memoria_pico_mb'] or 0:8.1f} MB")
+
+    return resultados
+
+
+def main():
+    # ==================== CONFIGURACIÓN ====================
+
+    # Servidor local para el benchmark
+    DB_CONFIG = {
+        'host': 'localhost',
+        'user': 'root',
+        'password': '',
+        'database': 'benchmark',
+        'port': 3306,
+        'permitir_local_infile': True,
+        'motor': 'mysql'
+    }
+
+    # Sin servidor: base embebida en un archivo local (descomentar para usarla)
+    # DB_CONFIG = {'host': None, 'user': None, 'password': None,
+    #              'database': 'benchmark.db', 'motor': 'sqlite'}  # o 'benchmark.duckdb' con 'duckdb'
+
+    # Tamaños de las tablas sintéticas (filas)
+    TAMANOS = [10_000, 100_000, 1_000_000]
+
+    # Modos de importación a comparar (opciones de importar_csv_completo)
+    MODOS = {
+        'executemany': {},
+        'lotes_1000': {'tamano_lote': 1000},
+        'bloques_50000': {'tamano_bloque': 50_000, 'tamano_lote': 1000},
+        'load_data': {'usar_load_data': True},
+    }
+
+    # Dónde guardar los CSV generados (se reutilizan entre corridas) y el resultado
+    CARPETA_DATOS = Path(tempfile.gettempdir()) / 'benchmark_importador'
+    RESULTADOS_JSON = 'resultados_benchmark.json'
+
+    # ==================== EJECUCIÓN ====================
+
+    logging.getLogger().setLevel(logging.WARNING)  # solo la tabla de resultados en consola
+    CARPETA_DATOS.mkdir(exist_ok=True)
+
+    print("\n" + "="*60)
+    print(" BENCHMARK DEL IMPORTADOR")
+    print("="*60)
+
+    resultados = correr_benchmark(DB_CONFIG, TAMANOS, MODOS, CARPETA_DATOS)
+
+    with open(RESULTADOS_JSON, 'w', encoding='utf-8') as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+    print(f"\n Resultados guardados en: {RESULTADOS_JSON}")
+
+
+if __name__ == "__main__":
+    main()
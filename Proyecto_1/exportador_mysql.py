@@ -0,0 +1,299 @@
+# Exportador de tablas MySQL a CSV, JSON Lines o Parquet (el camino inverso de python_sql_union).
+# Las filas se leen con un cursor sin buffer: el servidor las va mandando a medida que se piden,
+# así que la memoria queda acotada a un bloque sin importar el tamaño de la tabla.
+
+import json
+import logging
+import time
+from datetime import date, datetime, time as hora
+from decimal import Decimal
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import mysql.connector
+from mysql.connector import Error
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+FORMATOS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+
+
+def _valor_json(valor):
+    """Tipos que devuelve MySQL y json no conoce: DECIMAL como número, fechas en formato ISO"""
+    if isinstance(valor, Decimal):
+        return float(valor)
+    if isinstance(valor, (date, datetime, hora)):
+        return valor.isoformat()
+    return str(valor)
+
+
+class EscritorCSV:
+    """Agrega cada bloque al CSV; el encabezado va solo con el primero"""
+
+    def __init__(self, ruta):
+        self.archivo = open(ruta, 'w', encoding='utf-8', newline='')
+        self.primero = True
+
+    def escribir(self, df):
+        df.to_csv(self.archivo, index=False, header=self.primero)
+        self.primero = False
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class EscritorJSONL:
+    """Un objeto JSON por línea: se puede escribir (y leer) de a bloques"""
+
+    def __init__(self, ruta):
+        self.archivo = open(ruta, 'w', encoding='utf-8')
+
+    def escribir(self, df):
+        # Faltantes como null: NaN no es JSON válido (allow_nan=False falla en vez de escribirlo)
+        df = df.astype(object).where(df.notna(), None)
+        for fila in df.to_dict('records'):
+            self.archivo.write(json.dumps(fila, ensure_ascii=False, default=_valor_json, allow_nan=False) + '\n')
+
+    def cerrar(self):
+        self.archivo.close()
+
+
+class EscritorParquet:
+    """Un row group por bloque, con el esquema fijado por el primer bloque"""
+
+    def __init__(self, ruta):
+        try:
+            import pyarrow as pa  # dependencia opcional: solo hace falta para exportar a Parquet
+            import pyarrow.parquet as pq
+        except ImportError as e:
+            raise ImportError("Para exportar a Parquet hay que instalar pyarrow (pip install pyarrow)") from e
+        self.pa, self.pq = pa, pq
+        self.ruta = ruta
+        self.escritor = None
+        self.esquema = None
+
+    def _esquema_estable(self, esquema):
+        """Columnas todo NULL pasan a texto y los DECIMAL a precisión máxima, para que entren los bloques siguientes"""
+        campos = []
+        for campo in esquema:
+            if self.pa.types.is_null(campo.type):
+                campo = campo.with_type(self.pa.string())
+            elif self.pa.types.is_decimal(campo.type):
+                campo = campo.with_type(self.pa.decimal128(38, campo.type.scale))
+            campos.append(campo)
+        return self.pa.schema(campos)
+
+    def escribir(self, df):
+        tabla = self.pa.Table.from_pandas(df, preserve_index=False)
+        if self.escritor is None:
+            self.esquema = self._esquema_estable(tabla.schema)
+            self.escritor = self.pq.ParquetWriter(self.ruta, self.esquema, compression='snappy')
+        self.escritor.write_table(tabla.cast(self.esquema))
+
+    def cerrar(self):
+        if self.escritor is not None:
+            self.escritor.close()
+
+
+ESCRITORES = {'csv': EscritorCSV, 'jsonl': EscritorJSONL, 'parquet': EscritorParquet}
+
+
+class MySQLExporter:
+    """Clase para exportar tablas de MySQL a archivos sin cargarlas enteras en memoria"""
+
+    def __init__(self, host, user, password, database, port=3306):
+        self.host = host
+        self.user = user
+        self.password = password
+        self.database = database
+        self.port = port
+        self.connection = None
+
+    def conectar(self):
+        """Establece conexión con MySQL"""
+        try:
+            self.connection = mysql.connector.connect(
+                host=self.host,
+                user=self.user,
+                password=self.password,
+                database=self.database,
+                port=self.port,
+                charset='utf8mb4'
+            )
+            if self.connection.is_connected():
+                logger.info(f" Conectado a MySQL - Base de datos: {self.database}")
+                return True
+        except Error as e:
+            logger.error(f" Error al conectar a MySQL: {e}")
+            return False
+
+    def desconectar(self):
+        """Cierra la conexión"""
+        if self.connection and self.connection.is_connected():
+            self.connection.close()
+            logger.info(" Conexión cerrada")
+
+    def rangos_de_clave(self, nombre_tabla, clave, partes):
+        """Divide el rango [MIN, MAX] de una clave entera en `partes` rangos [desde, hasta)
+
+        Con una clave que no es entera (VARCHAR, DATE, DECIMAL...) devuelve un solo rango (None, None): la tabla entera
+        """
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT MIN(`{clave}`), MAX(`{clave}`) FROM `{nombre_tabla}`")
+            minimo, maximo = cursor.fetchone()
+        finally:
+            cursor.close()
+
+        if minimo is None:
+            return []
+        if not isinstance(minimo, int) or not isinstance(maximo, int):
+            logger.warning(f" La clave '{clave}' de '{nombre_tabla}' no es entera ({type(minimo).__name__}): "
+                           f"no se puede dividir por rangos, se exporta en un solo archivo")
+            return [(None, None)]
+        paso = max((maximo - minimo + 1) // partes, 1)
+        limites = [minimo + i * paso for i in range(partes) if minimo + i * paso <= maximo] + [maximo + 1]
+        return list(zip(limites[:-1], limites[1:]))
+
+    def leer_por_bloques(self, nombre_tabla, tamano_bloque=50000, clave=None, desde=None, hasta=None):
+        """Genera DataFrames de `tamano_bloque` filas leyendo con un cursor sin buffer"""
+        sql = f"SELECT * FROM `{nombre_tabla}`"
+        params = []
+        if clave is not None and desde is not None:
+            sql += f" WHERE `{clave}` >= %s AND `{clave}` < %s"
+            params = [desde, hasta]
+
+        # buffered=False: el resultado no se descarga entero al ejecutar, se trae a medida que se hace fetch
+        cursor = self.connection.cursor(buffered=False)
+        try:
+            cursor.execute(sql, params)
+            columnas = [descripcion[0] for descripcion in cursor.description]
+            while True:
+                filas = cursor.fetchmany(tamano_bloque)
+                if not filas:
+                    break
+                # dtype=object deja los valores como los manda MySQL: un INT con NULL sigue siendo int
+                # (from_records lo pasaba a float64 con NaN y se exportaba 5.0)
+                yield pd.DataFrame(filas, columns=columnas, dtype=object)
+        finally:
+            cursor.close()
+
+    def exportar_tabla(self, nombre_tabla, ruta_salida, formato=None, tamano_bloque=50000,
+                       clave=None, desde=None, hasta=None):
+        """Exporta la tabla (o el rango de clave indicado) al archivo; devuelve la cantidad de filas"""
+        ruta_salida = Path(ruta_salida)
+        formato = formato or FORMATOS.get(ruta_salida.suffix.lower())
+        if formato not in ESCRITORES:
+            raise ValueError(f"Formato desconocido para '{ruta_salida.name}'. Opciones: {', '.join(ESCRITORES)}")
+
+        inicio = time.perf_counter()
+        filas = 0
+        escritor = ESCRITORES[formato](ruta_salida)
+        try:
+            for bloque in self.leer_por_bloques(nombre_tabla, tamano_bloque, clave, desde, hasta):
+                escritor.escribir(bloque)
+                filas += len(bloque)
+        finally:
+            escritor.cerrar()
+
+        duracion = time.perf_counter() - inicio
+        logger.info(f" Exportadas {filas} filas de '{nombre_tabla}' a {ruta_salida.name} "
+                    f"({duracion:.2f}s, {filas / max(duracion, 1e-9):,.0f} filas/s)")
+        return filas
+
+
+def _exportar_rango(db_config, nombre_tabla, ruta_salida, formato, tamano_bloque, clave, desde, hasta):
+    """Exporta un rango de clave con su propia conexión"""
+    exportador = MySQLExporter(**db_config)
+    if not exportador.conectar():
+        raise ConnectionError(f"No se pudo conectar para exportar {ruta_salida.name}")
+    try:
+        return exportador.exportar_tabla(nombre_tabla, ruta_salida, formato, tamano_bloque, clave, desde, hasta)
+    finally:
+        exportador.desconectar()
+
+
+def exportar_en_paralelo(db_config, nombre_tabla, ruta_salida, clave, partes=4, formato=None, tamano_bloque=50000):
+    """Divide la tabla por rangos de clave y exporta cada rango a su archivo con una conexión propia"""
+    ruta_salida = Path(ruta_salida)
+    exportador = MySQLExporter(**db_config)
+    if not exportador.conectar():
+        raise ConnectionError("No se pudo conectar a MySQL")
+    try:
+        rangos = exportador.rangos_de_clave(nombre_tabla, clave, partes)
+    finally:
+        exportador.desconectar()
+
+    # tabla.csv -> tabla.parte1.csv, tabla.parte2.csv, ...
+    rutas = [ruta_salida.with_name(f"{ruta_salida.stem}.parte{i}{ruta_salida.suffix}")
+             for i in range(1, len(rangos) + 1)]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max(len(rangos), 1)) as ejecutor:
+        futuros = [ejecutor.submit(_exportar_rango, db_config, nombre_tabla, ruta, formato, tamano_bloque,
+                                   clave, desde, hasta)
+                   for ruta, (desde, hasta) in zip(rutas, rangos)]
+        filas = sum(futuro.result() for futuro in futuros)
+
+    logger.info(f" '{nombre_tabla}': {filas} filas en {len(rutas)} archivos ({time.perf_counter() - inicio:.2f}s)")
+    return rutas
+
+
+def main():
+    # ==================== CONFIGURACIÓN ====================
+
+    # Configuración de la base de datos
+    DB_CONFIG = {
+        'host': 'localhost',
+        'user': 'root',
+        'password': '',
+        'database': 'supermercado',
+        'port': 3306
+    }
+
+    # Carpeta donde se guardan los archivos exportados
+    CARPETA_SALIDA = Path('exportados')
+
+    # Tablas a exportar
+    # Formato: (nombre_tabla, nombre_archivo, clave_primaria); la extensión elige el formato (.csv, .jsonl, .parquet)
+    TABLAS_A_EXPORTAR = [
+        ('clientes', 'clientes.csv', 'id_cliente'),
+        ('productos', 'productos.parquet', 'id_producto'),
+        ('venta', 'venta.jsonl', 'id_venta'),
+    ]
+
+    # Filas por bloque (la memoria usada depende de esto, no del tamaño de la tabla)
+    TAMANO_BLOQUE = 50000
+
+    # Archivos por tabla, cada uno con un rango de la clave y su propia conexión (1 = un solo archivo)
+    PARTES = 1
+
+    # ==================== EJECUCIÓN ====================
+
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+    print("\n" + "="*60)
+    print(" EXPORTADOR DE MYSQL A ARCHIVOS")
+    print("="*60)
+
+    CARPETA_SALIDA.mkdir(exist_ok=True)
+    exportador = MySQLExporter(**DB_CONFIG)
+    if PARTES == 1 and not exportador.conectar():
+        logger.error(" No se pudo conectar a MySQL. Verifica las credenciales.")
+        return
+
+    for nombre_tabla, nombre_archivo, clave in TABLAS_A_EXPORTAR:
+        try:
+            if PARTES > 1:
+                exportar_en_paralelo(DB_CONFIG, nombre_tabla, CARPETA_SALIDA / nombre_archivo, clave, PARTES,
+                                     tamano_bloque=TAMANO_BLOQUE)
+            else:
+                exportador.exportar_tabla(nombre_tabla, CARPETA_SALIDA / nombre_archivo, tamano_bloque=TAMANO_BLOQUE)
+        except Exception as e:
+            logger.error(f" Error al exportar {nombre_tabla}: {e}")
+
+    exportador.desconectar()
+    logger.info(" Proceso finalizado")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,106 +2,616 @@
 
 import pandas as pd #importa la libreria pandas,usada para leer datos(csv)
 import mysql.connector # permite conectarse a base de datos MYSQL desde PYTHON.
+from mysql.connector import pooling # permite crear un pool de conexiones para importar varias tablas a la vez.
 from mysql.connector import Error # importa la clase de error para manejar errores que ocurran al conctarse o ejecutar consultas.
+import csv # se usa para detectar el separador y las comillas del CSV (csv.Sniffer).
+import codecs # permite decodificar una muestra del archivo para detectar su encoding.
 from pathlib import Path #permite trabajar con rutas de arhivos(ubicar los CSV en carpetas)
 import logging # se usa para registrar mensajes en consola (informacion, errores)de manera mas profecional.
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait # permite importar tablas independientes en paralelo.
+import time # se usa para medir tiempos y calcular filas por segundo.
+import hashlib # calcula la huella (hash) del contenido de cada CSV para saber si cambió.
+import json # guarda los manifiestos de importación incremental.
+from backends_embebidos import Backend, crear_backend # interfaz de los motores y motores embebidos (SQLite, DuckDB).
+import tracemalloc # mide el pico de memoria de cada importación.
+from contextlib import contextmanager, nullcontext # permite medir cada etapa con un bloque "with".
+import queue # cola acotada entre el hilo que lee/convierte y el que inserta (modo pipeline).
+import threading # hilo productor del modo pipeline.
+import io # permite parsear con pandas un bloque de bytes leido desde un offset del archivo.
+import zlib # CRC32 de cada fila, igual al CRC32() de MySQL, para verificar la tabla contra el CSV.
+from decimal import Decimal, InvalidOperation, ROUND_HALF_UP # normaliza los numeros igual que CAST(... AS DECIMAL) de MySQL.
+import numpy as np # suma los hashes por rango de clave sin recorrer fila por fila.
+import re # quita el largo de prefijo (`col`(10)) de las columnas de un índice.
+from graphlib import TopologicalSorter, CycleError # ordena las tablas padre antes que las hijas al importar en serie.
 
 # Configurar logging(el sistema logs: son menasajes imformativos)
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')#muestra mensajes informativos y errores( muestra la fecha, l hora, INFO:CONEXION ESTABLECIDA CON EXITO)
 logger = logging.getLogger(__name__)  # Crea un "registrador" que vas a usar dentro de la clase para mostrar mensajes
 
+# Códigos de error de MySQL cuando LOAD DATA LOCAL INFILE está deshabilitado (servidor o cliente)
+ERRORES_LOCAL_INFILE = {1148, 2068, 3948}
+
+# Equivalencia entre encodings de Python y CHARACTER SET de MySQL
+CHARSET_MYSQL = {
+    'utf-8': 'utf8mb4',
+    'latin1': 'latin1',
+    'cp1252': 'latin1',  # el latin1 de MySQL es en realidad cp1252
+    'iso-8859-1': 'latin1',
+}
+
+# Tipos de MySQL que se comparan como número al verificar una tabla contra su CSV
+TIPOS_NUMERICOS = {'tinyint', 'smallint', 'mediumint', 'int', 'bigint', 'decimal', 'float', 'double'}
+TIPOS_ENTEROS = {'tinyint', 'smallint', 'mediumint', 'int', 'bigint'}
+
+class InformeImportacion:
+    """Tiempos, filas y memoria de cada etapa de la importación de un archivo"""
+    
+    def __init__(self, archivo, tabla, medir_memoria=False):
+        self.archivo = str(archivo)
+        self.tabla = tabla
+        self.medir_memoria = medir_memoria
+        self.etapas = {}  # nombre -> {'segundos', 'filas', 'llamadas', 'memoria_pico_mb'}
+        self.inicio = time.time()
+        self.duracion = 0.0
+        self.memoria_pico_mb = None
+        self.error = None
+        self.violaciones = []  # problemas de integridad encontrados en modo carga masiva
+    
+    @contextmanager
+    def etapa(self, nombre):
+        """Mide una etapa; quien la usa puede cargar las filas procesadas en medida['filas']"""
+        datos = self.etapas.setdefault(nombre, {'segundos': 0.0, 'filas': 0, 'llamadas': 0})
+        medida = {'filas': 0}
+        if self.medir_memoria:
+            tracemalloc.reset_peak()
+        inicio = time.perf_counter()
+        try:
+            yield medida
+        finally:
+            datos['segundos'] += time.perf_counter() - inicio
+            datos['filas'] += medida['filas']
+            datos['llamadas'] += 1
+            if self.medir_memoria:
+                pico = tracemalloc.get_traced_memory()[1] / 1024 ** 2
+                datos['memoria_pico_mb'] = max(datos.get('memoria_pico_mb', 0.0), pico)
+                self.memoria_pico_mb = max(self.memoria_pico_mb or 0.0, pico)
+    
+    def sumar(self, nombre, segundos, filas):
+        """Agrega a una etapa un tiempo medido en otro hilo (sin memoria: el pico de tracemalloc es de todo el proceso)"""
+        datos = self.etapas.setdefault(nombre, {'segundos': 0.0, 'filas': 0, 'llamadas': 0})
+        datos['segundos'] += segundos
+        datos['filas'] += filas
+        datos['llamadas'] += 1
+    
+    def a_dict(self):
+        """Informe en formato serializable a JSON"""
+        etapas = {}
+        for nombre, datos in self.etapas.items():
+            etapas[nombre] = dict(datos)
+            if datos['filas']:
+                etapas[nombre]['filas_por_segundo'] = round(datos['filas'] / max(datos['segundos'], 1e-9), 1)
+        
+        return {
+            'archivo': self.archivo,
+            'tabla': self.tabla,
+            'exito': self.error is None,
+            'error': self.error,
+            'inicio': self.inicio,
+            'duracion_segundos': round(self.duracion, 4),
+            'memoria_pico_mb': self.memoria_pico_mb,
+            'violaciones': self.violaciones,
+            'etapas': etapas,
+        }
+    
+    def resumen(self):
+        """Una línea legible con el tiempo de cada etapa"""
+        partes = []
+        for nombre, datos in self.etapas.items():
+            texto = f"{nombre} {datos['segundos']:.2f}s"
+            if datos['filas']:
+                texto += f" ({datos['filas'] / max(datos['segundos'], 1e-9):,.0f} filas/s)"
+            partes.append(texto)
+        
+        linea = f" Etapas de '{self.tabla}': {', '.join(partes) or 'ninguna'} - total {self.duracion:.2f}s"
+        if self.memoria_pico_mb is not None:
+            linea += f" - memoria pico {self.memoria_pico_mb:.1f} MB"
+        return linea
+
+
+class BackendMySQL(Backend):
+    """MySQL: usa la conexión (o la del pool) y la configuración del importador"""
+    
+    nombre = 'MySQL'
+    marcador = '%s'
+    sentencias_multifila = True
+    load_data = True
+    carga_masiva = True
+    verificacion_csv = True
+    
+    def __init__(self, importador):
+        self.importador = importador
+    
+    @property
+    def connection(self):
+        return self.importador.connection  # en modo paralelo es una conexión tomada del pool
+    
+    @property
+    def database(self):
+        return self.importador.database
+    
+    def conectar(self):
+        imp = self.importador
+        return mysql.connector.connect(  # usa mysql.connector.connect(), y sele pasan los datos que ya guarde(self.host,self.user,etc).
+            host=imp.host,
+            user=imp.user,
+            password=imp.password,
+            database=imp.database,
+            port=imp.port,
+            charset='utf8mb4',
+            autocommit=False,
+            allow_local_infile=imp.permitir_local_infile
+        )
+    
+    def desconectar(self):
+        if self.connection and self.connection.is_connected():  # resvisa si existe la coneccion y si realmente esta activa.
+            self.connection.close()  #cierra la conexion.
+    
+    def cargar_esquema(self):
+        """Tablas y columnas de PRIMARY KEY (information_schema)"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT TABLE_NAME 
+                FROM information_schema.TABLES 
+                WHERE TABLE_SCHEMA = %s
+            """, (self.database,))
+            esquema = {tabla: [] for (tabla,) in cursor.fetchall()}
+            
+            cursor.execute("""
+                SELECT TABLE_NAME, COLUMN_NAME 
+                FROM information_schema.KEY_COLUMN_USAGE 
+                WHERE TABLE_SCHEMA = %s 
+                AND CONSTRAINT_NAME = 'PRIMARY'
+                ORDER BY TABLE_NAME, ORDINAL_POSITION
+            """, (self.database,))
+            for tabla, columna in cursor.fetchall():
+                esquema.setdefault(tabla, []).append(columna)
+        finally:
+            cursor.close()
+        return esquema
+    
+    def crear_tabla_desde_df(self, df, nombre_tabla, clave_primaria, muestra=False):
+        imp = self.importador
+        # Mapear tipos de pandas a MySQL
+        tipo_mysql = {
+            'int64': 'INT',
+            'float64': 'DECIMAL(10,2)',
+            'object': 'VARCHAR(255)',
+            'datetime64': 'DATETIME',
+            'bool': 'BOOLEAN'
+        }
+        
+        # Los tipos compactos se ajustan a los valores vistos: con solo una parte del archivo
+        # las filas siguientes podrían no entrar (y LOAD DATA las truncaría sin error)
+        compactos = imp.tipos_compactos and not muestra
+        if imp.tipos_compactos and muestra:
+            logger.warning(f"  '{nombre_tabla}': tipos compactos desactivados (solo se leyó una parte del archivo)")
+        
+        # Construir definición de columnas
+        columnas_sql = []
+        for col in df.columns:
+            if compactos:
+                tipo_sql = imp.inferir_tipo_mysql(df[col], es_clave=col == clave_primaria or col.startswith('id_'))
+            else:
+                tipo_pandas = str(df[col].dtype)
+                tipo_sql = tipo_mysql.get(tipo_pandas, 'TEXT')
+            
+            if col == clave_primaria:
+                columnas_sql.append(f"`{col}` {tipo_sql} PRIMARY KEY")
+            else:
+                columnas_sql.append(f"`{col}` {tipo_sql}")
+        
+        cursor = self.connection.cursor()
+        try:
+            # Crear tabla con PRIMARY KEY explícita
+            cursor.execute(f"CREATE TABLE `{nombre_tabla}` ({', '.join(columnas_sql)})")
+            self.connection.commit()
+        finally:
+            cursor.close()
+        logger.info(f" Tabla '{nombre_tabla}' creada con PRIMARY KEY en '{clave_primaria}'")
+        if imp.tipos_compactos:
+            logger.info(f" Tipos: {', '.join(columnas_sql)}")
+    
+    def agregar_clave_primaria(self, nombre_tabla, clave_primaria):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"ALTER TABLE `{nombre_tabla}` ADD PRIMARY KEY (`{clave_primaria}`)")
+            self.connection.commit()
+        finally:
+            cursor.close()
+    
+    def limpiar_duplicados(self, nombre_tabla, clave_primaria, estrategia='en_lugar', tamano_lote=10000):
+        cursor = self.connection.cursor()
+        try:
+            # Contar duplicados antes: si no hay, no se toca la tabla
+            cursor.execute(f"""
+                SELECT COUNT(*) - COUNT(DISTINCT `{clave_primaria}`) 
+                FROM `{nombre_tabla}`
+            """)
+            duplicados_antes = cursor.fetchone()[0]
+            if duplicados_antes == 0:
+                return 0
+            
+            logger.warning(f"  Encontrados {duplicados_antes} registros duplicados en '{nombre_tabla}'")
+            
+            if estrategia == 'temporal':
+                return self._limpiar_duplicados_temporal(cursor, nombre_tabla, clave_primaria)
+            return self._limpiar_duplicados_en_lugar(cursor, nombre_tabla, clave_primaria, tamano_lote)
+        finally:
+            cursor.close()
+    
+    def _limpiar_duplicados_en_lugar(self, cursor, nombre_tabla, clave_primaria, tamano_lote):
+        """Borra solo las filas sobrantes de cada clave repetida, por tramos de filas con commit"""
+        cursor.execute("""
+            SELECT COLUMN_NAME, DATA_TYPE, EXTRA
+            FROM information_schema.COLUMNS
+            WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+        """, (self.database, nombre_tabla))
+        columnas = {columna: (tipo.lower(), extra.lower()) for columna, tipo, extra in cursor.fetchall()}
+        
+        # Cada fila necesita un número propio para saber cuál se queda: se usa la columna
+        # AUTO_INCREMENT de la tabla si tiene una (solo puede haber una), si no se agrega una temporal
+        fila = next((c for c, (_, extra) in columnas.items() if 'auto_increment' in extra), None)
+        columna_temporal = fila is None
+        if columna_temporal:
+            fila = '_fila_tmp'
+        
+        # Índice (clave, fila): cada fila encuentra por índice a las de su misma clave, sin recorrer la tabla
+        tipo_clave = columnas[clave_primaria][0]
+        prefijo = '(255)' if tipo_clave.endswith('text') or tipo_clave.endswith('blob') else ''
+        indice = f"ADD INDEX `_idx_duplicados_tmp` (`{clave_primaria}`{prefijo}, `{fila}`)"
+        if columna_temporal:
+            cursor.execute(f"ALTER TABLE `{nombre_tabla}` "
+                           f"ADD COLUMN `{fila}` BIGINT UNSIGNED NOT NULL AUTO_INCREMENT UNIQUE, {indice}")
+        else:
+            cursor.execute(f"ALTER TABLE `{nombre_tabla}` {indice}")
+        
+        eliminados = 0
+        try:
+            cursor.execute(f"SELECT MIN(`{fila}`), MAX(`{fila}`) FROM `{nombre_tabla}`")
+            desde, ultima = cursor.fetchone()
+            
+            # Se queda la primera fila de cada clave; se borran las que tienen otra anterior con
+            # la misma clave (<=> también compara NULL). Commit por tramo: los bloqueos duran poco
+            while desde is not None and desde <= ultima:
+                hasta = desde + tamano_lote
+                cursor.execute(f"""
+                    DELETE t FROM `{nombre_tabla}` AS t
+                    JOIN `{nombre_tabla}` AS anterior
+                      ON anterior.`{clave_primaria}` <=> t.`{clave_primaria}` AND anterior.`{fila}` < t.`{fila}`
+                    WHERE t.`{fila}` >= %s AND t.`{fila}` < %s
+                """, (desde, hasta))
+                eliminados += cursor.rowcount
+                self.connection.commit()
+                desde = hasta
+        finally:
+            if columna_temporal:
+                cursor.execute(f"ALTER TABLE `{nombre_tabla}` DROP INDEX `_idx_duplicados_tmp`, DROP COLUMN `{fila}`")
+            else:
+                cursor.execute(f"ALTER TABLE `{nombre_tabla}` DROP INDEX `_idx_duplicados_tmp`")
+        
+        return eliminados
+    
+    def _limpiar_duplicados_temporal(self, cursor, nombre_tabla, clave_primaria):
+        """Reconstruye la tabla completa desde una tabla temporal agrupada por clave"""
+        cursor.execute(f"SELECT COUNT(*) FROM `{nombre_tabla}`")
+        filas_antes = cursor.fetchone()[0]
+        
+        # Crear tabla temporal con datos únicos
+        cursor.execute(f"""
+            CREATE TEMPORARY TABLE temp_{nombre_tabla} AS
+            SELECT * FROM `{nombre_tabla}`
+            GROUP BY `{clave_primaria}`
+        """)
+        
+        # Vaciar tabla original
+        cursor.execute(f"TRUNCATE TABLE `{nombre_tabla}`")
+        
+        # Reinsertar datos únicos
+        cursor.execute(f"""
+            INSERT INTO `{nombre_tabla}`
+            SELECT * FROM temp_{nombre_tabla}
+        """)
+        filas_despues = cursor.rowcount
+        
+        # Eliminar tabla temporal
+        cursor.execute(f"DROP TEMPORARY TABLE temp_{nombre_tabla}")
+        
+        self.connection.commit()
+        return filas_antes - filas_despues
+    
+    def insertar_datos_bulk(self, df, nombre_tabla, clave_primaria):
+        """Inserta o actualiza datos usando ON DUPLICATE KEY UPDATE"""
+        cursor = self.connection.cursor()
+        
+        try:
+            sql = self.importador._sql_upsert(nombre_tabla, list(df.columns), clave_primaria)
+            
+            # Convertir DataFrame a lista de tuplas (manejar NaN)
+            datos = [tuple(None if pd.isna(val) else val for val in row) 
+                     for row in df.values]
+            
+            # Ejecutar en lote
+            cursor.executemany(sql, datos)
+            filas_afectadas = cursor.rowcount
+            self.connection.commit()
+            
+            logger.info(f" Procesadas {len(datos)} filas en '{nombre_tabla}' ({filas_afectadas} afectadas)")
+            return len(datos)
+            
+        except Exception as e:
+            self.connection.rollback()
+            logger.error(f" Error al insertar en '{nombre_tabla}': {e}")
+            raise
+        finally:
+            cursor.close()
+    
+    def eliminar_por_clave(self, nombre_tabla, clave_primaria, claves, tamano_lote=1000):
+        claves = list(claves)
+        eliminadas = 0
+        cursor = self.connection.cursor()
+        
+        try:
+            for inicio in range(0, len(claves), tamano_lote):
+                lote = claves[inicio:inicio + tamano_lote]
+                placeholders = ", ".join([self.marcador] * len(lote))
+                cursor.execute(f"DELETE FROM `{nombre_tabla}` WHERE `{clave_primaria}` IN ({placeholders})", lote)
+                eliminadas += cursor.rowcount
+            
+            self.connection.commit()
+            return eliminadas
+        except Exception:
+            self.connection.rollback()
+            raise
+        finally:
+            cursor.close()
+    
+    def contar_filas(self, nombre_tabla):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"SELECT COUNT(*) FROM `{nombre_tabla}`")
+            return int(cursor.fetchone()[0])
+        finally:
+            cursor.close()
+    
+    def borrar_tabla(self, nombre_tabla):
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute(f"DROP TABLE IF EXISTS `{nombre_tabla}`")
+            self.connection.commit()
+        finally:
+            cursor.close()
+
+
 # Crea una clase llamada MYSQLIMPORTER(quen agrupa todola logica para conectarse a MYSQL y cargar los ARCHIVOS CSV)
 class MySQLImporter:
     """Clase para importar múltiples CSVs a MySQL""" #Este es un texto llamado, DOCSTRING. ES UNA DESCRIPCION DE LO QUE HACE LA CLASE.
     
-    def __init__(self, host, user, password, database, port=3306): #__int__ es el metodo constructor(ejecuta automaticamente cuando creas un objeto de clase)
+    def __init__(self, host, user, password, database, port=3306, permitir_local_infile=False,
+                 tipos_compactos=False, medir_memoria=False, motor='mysql'): #__int__ es el metodo constructor(ejecuta automaticamente cuando creas un objeto de clase)
         self.host = host # estos lineas son los parametros  de conexion de MYSQL
         self.user = user # self. (guarda los valores dentro de objeto, para poder usarlos en otros metodos.)
         self.password = password
         self.database = database
         self.port = port
+        self.permitir_local_infile = permitir_local_infile # habilita LOAD DATA LOCAL INFILE del lado del cliente.
+        self.tipos_compactos = tipos_compactos # elige el tipo MySQL mas chico que entra segun los datos.
         self.connection = None # indica si inicialmente no hay conexion abierta.
+        self.backend = BackendMySQL(self) if motor == 'mysql' else crear_backend(motor, database) # 'sqlite'/'duckdb' usan database como ruta del archivo.
+        self._esquema = None # cache de tablas y claves primarias (se carga una vez por conexion).
+        self.medir_memoria = medir_memoria # activa tracemalloc para informar el pico de memoria (hace mas lenta la importacion).
+        self.informes = [] # un InformeImportacion por cada archivo importado.
+        self._informe = None # informe del archivo que se esta importando ahora.
     
     def conectar(self):  #define un metodo llamado conector que intenta abrir la conexion con la base.
-        """Establece conexión con MySQL"""
-        try:   # usa mysql.connector.connect(), y sele pasan los datos que ya guarde(self.host,self.user,etc).
-            self.connection = mysql.connector.connect(
-                host=self.host,
-                user=self.user,
-                password=self.password,
-                database=self.database,
-                port=self.port,
-                charset='utf8mb4',
-                autocommit=False
-            )
-            logger.info(f" Conexión exitosa a la base de datos '{self.database}'") # si laconexion es exitosa se guarda en self.connection
+        """Establece conexión con MySQL (o abre la base embebida)"""
+        try:   # el backend abre la conexion (servidor MySQL o archivo de la base embebida).
+            self.connection = self.backend.conectar()
+            self._esquema = None  # conexion nueva: el esquema se vuelve a leer la proxima vez que se use.
+            logger.info(f" Conexión exitosa a la base de datos '{self.database}' ({self.backend.nombre})") # si laconexion es exitosa se guarda en self.connection
             return True
-        except Error as e:
-            logger.error(f" Error al conectar a MySQL: {e}")
+        except Exception as e:
+            logger.error(f" Error al conectar a {self.backend.nombre}: {e}")
             return False
     
     def desconectar(self):  # declara un metodo dentro de la clase para cerrar la coneccion con la base MYSQL-
         """Cierra la conexión"""  # es un DOCSTRING(es decir una pequeña descripcion del metodo)
-        if self.connection and self.connection.is_connected():  # resvisa si existe la coneccion y si realmente esta activa.
-            self.connection.close()  #cierra la conexion.
+        if self.connection is not None:  # resvisa si existe la coneccion.
+            self.backend.desconectar()  #cierra la conexion.
+            self.connection = None
             logger.info(" Conexión cerrada") # muestra un mensaje en consola que la conexion fue cerrada correctamente.
     
-    def leer_csv(self, ruta_archivo, modo='skip'):  # crea un metodo que lee un archivo CSV desde una ruta que le pasas como argumento.
-        """Lee un CSV con manejo robusto de errores"""  # doctring que explica el proposito de la funcion.
-        encodings = ['utf-8', 'latin1', 'cp1252', 'iso-8859-1'] #crea una lista de posibles codificadores de texto(es util para los CSV que viene con acento o caracteres raros segun el sistema donde se genraron)
-        
-        for enc in encodings:  #inicia un bucle que intentara leer los CSV con el enconding actual.
-            try:  #usa panda para leer los CSV
-                df = pd.read_csv(
-                    ruta_archivo, # ubicacion del archivo.
-                    encoding=enc, #usa la codificacion actual del bucle.
-                    sep=',',  # separador de columnas.
-                    quotechar='"',
-                    escapechar='\\',
-                    on_bad_lines=modo, #si hay errores en las filas las saltea.
-                    engine='python',
-                    skipinitialspace=True  # elimina espacios extra al inicio de los datos.
-                )
-                logger.info(f" CSV leído: {len(df)} filas con encoding {enc}")  #muetras un msj informando cuantas filas se leyeron y con que codificacion funciona.
-                return df  #devuelve el dataframe leido, si todo salio bien.
-            except UnicodeDecodeError: #si el archivo no se puede codificar con el enconding actual, entra aca.
-                continue # pasa al siguiente encondig de la lista. para volver a intentar.
-            except Exception as e:  # cptura cual error inesperado.
-                logger.error(f"Error con encoding {enc}: {e}")  #muestra un msj de error en la consola.
-                
+    def leer_csv(self, ruta_archivo, modo='skip', motor='c'):  # crea un metodo que lee un archivo CSV desde una ruta que le pasas como argumento.
+        """Lee un CSV detectando encoding y formato una sola vez"""  # doctring que explica el proposito de la funcion.
+        formato = self.detectar_formato_csv(ruta_archivo)  # detecta encoding, separador y comillas con una muestra del archivo (no relee todo el archivo por cada encoding).
+        inicio = time.perf_counter()  # guarda el momento en que empieza la lectura para informar cuanto tardo.
+        
+        with self._etapa('leer') as etapa:  # mide el tiempo de lectura para el informe de la importacion.
+            try:  #usa panda para leer los CSV una sola vez
+                df = pd.read_csv(ruta_archivo, **self._opciones_lectura(formato, modo, motor))
+            except UnicodeDecodeError:  # la muestra no alcanzo para detectar el encoding (caracter raro mas adelante en el archivo).
+                logger.warning(f" Encoding {formato['encoding']} falló más adelante en el archivo, se usa latin1")
+                formato['encoding'] = 'latin1'  # latin1 puede decodificar cualquier byte, asi que este segundo intento no falla por encoding.
+                df = pd.read_csv(ruta_archivo, **self._opciones_lectura(formato, modo, motor))
+            etapa['filas'] = len(df)
+        
+        duracion = time.perf_counter() - inicio
+        logger.info(f" CSV leído: {len(df)} filas con encoding {formato['encoding']} "
+                    f"en {duracion:.2f}s")  #muetras un msj informando cuantas filas se leyeron, con que codificacion y cuanto tardo.
+        return df  #devuelve el dataframe leido, si todo salio bien.
+    
+    def detectar_formato_csv(self, ruta_archivo, tamano_muestra=64 * 1024):
+        """Detecta encoding, separador y comillas a partir de una muestra acotada"""
+        enc = self._detectar_encoding(ruta_archivo)
+        formato = {'encoding': enc, 'sep': ',', 'quotechar': '"'}
+        
+        with open(ruta_archivo, 'r', encoding=enc, errors='replace', newline='') as f:
+            muestra = f.read(tamano_muestra)
+        
+        # Cortar en el último salto de línea para no analizar una fila a medias
+        if '\n' in muestra:
+            muestra = muestra[:muestra.rfind('\n')]
+        
+        try:
+            dialecto = csv.Sniffer().sniff(muestra, delimiters=',;\t|')
+            formato['sep'] = dialecto.delimiter
+            formato['quotechar'] = dialecto.quotechar or '"'
+        except csv.Error:
+            logger.warning(f" No se pudo detectar el separador de {Path(ruta_archivo).name}, se usa ','")
+        
+        logger.info(f" Formato detectado: encoding={enc}, separador={formato['sep']!r}")
+        return formato
+    
+    def _opciones_lectura(self, formato, modo, motor):
+        """Arma los parámetros de pd.read_csv según el motor de parseo"""
+        if motor == 'pyarrow':
+            # pyarrow no soporta escapechar ni skipinitialspace
+            return {
+                'encoding': formato['encoding'],
+                'sep': formato['sep'],
+                'quotechar': formato['quotechar'],
+                'on_bad_lines': modo,
+                'engine': 'pyarrow',
+            }
+        
+        return {
+            'encoding': formato['encoding'],
+            'sep': formato['sep'],
+            'quotechar': formato['quotechar'],
+            'escapechar': '\\',
+            'on_bad_lines': modo,
+            # on_bad_lines como función solo lo soporta el motor python
+            'engine': 'python' if callable(modo) else motor,
+            'skipinitialspace': True,
+        }
+    
+    def _detectar_encoding(self, ruta_archivo, tamano_muestra=1024 * 1024):
+        """Detecta el encoding probando solo una muestra acotada del archivo"""
+        with open(ruta_archivo, 'rb') as f:
+            muestra = f.read(tamano_muestra)
+        
+        for enc in ['utf-8', 'latin1', 'cp1252', 'iso-8859-1']:
+            try:
+                # final=False tolera un caracter multibyte cortado al final de la muestra
+                codecs.getincrementaldecoder(enc)().decode(muestra, final=False)
+                return enc
+            except UnicodeDecodeError:
                 continue
         
-        raise ValueError(f" No se pudo leer el CSV: {ruta_archivo}")
+        raise ValueError(f" No se pudo detectar el encoding de: {ruta_archivo}")
+    
+    def leer_csv_por_bloques(self, ruta_archivo, tamano_bloque, modo='skip', motor='c', medir=True):
+        """Lee un CSV en bloques de tamaño fijo (memoria constante; medir=False si se lee desde otro hilo)"""
+        formato = self.detectar_formato_csv(ruta_archivo)
+        if motor == 'pyarrow':
+            motor = 'c'  # pyarrow no soporta lectura por bloques con chunksize
+        logger.info(f" Leyendo CSV en bloques de {tamano_bloque} filas con encoding {formato['encoding']}")
+        
+        lector = pd.read_csv(ruta_archivo, chunksize=tamano_bloque,
+                             **self._opciones_lectura(formato, modo, motor))
+        with lector:
+            while True:
+                # Se mide solo el parseo de cada bloque, no lo que hace quien lo consume
+                with self._etapa('leer') if medir else nullcontext({'filas': 0}) as etapa:
+                    bloque = next(lector, None)
+                    etapa['filas'] = 0 if bloque is None else len(bloque)
+                if bloque is None:
+                    break
+                yield bloque
+    
+    def cargar_esquema(self, refrescar=False):
+        """Lee una sola vez las tablas y claves primarias de la base y las guarda en cache"""
+        if self._esquema is None or refrescar:
+            self._esquema = self.backend.cargar_esquema()
+        return self._esquema
+    
+    def clave_primaria_de(self, nombre_tabla):
+        """Columnas de la PRIMARY KEY de la tabla según el cache (lista vacía si no tiene)"""
+        return self.cargar_esquema().get(nombre_tabla, [])
     
     def tabla_existe(self, nombre_tabla):
         """Verifica si una tabla existe en la base de datos"""
-        cursor = self.connection.cursor()
-        try:
-            cursor.execute(f"SHOW TABLES LIKE '{nombre_tabla}'")
-            resultado = cursor.fetchone()
-            return resultado is not None
-        finally:
-            cursor.close()
+        return nombre_tabla in self.cargar_esquema()
     
-    def crear_tabla_desde_df(self, df, nombre_tabla, clave_primaria):
-        """Crea una tabla en MySQL basándose en el DataFrame"""
-        cursor = self.connection.cursor()
+    def borrar_tabla(self, nombre_tabla):
+        """Elimina la tabla si existe y la saca del cache del esquema"""
+        self.backend.borrar_tabla(nombre_tabla)
+        if self._esquema is not None:
+            self._esquema.pop(nombre_tabla, None)
+    
+    def inferir_tipo_mysql(self, serie, es_clave=False):
+        """Elige el tipo MySQL más chico en el que entran los valores de la columna"""
+        valores = serie.dropna()
+        if valores.empty:
+            return 'VARCHAR(255)'
         
-        try:
-            # Verificar si la tabla ya existe
-            cursor.execute(f"SHOW TABLES LIKE '{nombre_tabla}'")
-            tabla_existe = cursor.fetchone() is not None
+        if pd.api.types.is_bool_dtype(serie):
+            return 'BOOLEAN'
+        
+        if pd.api.types.is_datetime64_any_dtype(serie):
+            return 'DATE' if (valores == valores.dt.normalize()).all() else 'DATETIME'
+        
+        if pd.api.types.is_numeric_dtype(serie):
+            numeros = valores.astype(float)
+            # Buscar la menor cantidad de decimales que representa todos los valores (hasta 6)
+            for escala in range(7):
+                escalados = numeros * 10 ** escala
+                if (escalados - escalados.round()).abs().max() < 1e-6:
+                    break
+            else:
+                return 'DOUBLE'
+            
+            # Enteros (o float solo porque hay NaN, como un id opcional)
+            if escala == 0 and (pd.api.types.is_integer_dtype(serie) or serie.isna().any()):
+                maximo = int(numeros.max())
+                if es_clave:
+                    maximo = max(maximo, 2 ** 31 - 1)  # las claves crecen: como mínimo INT
+                return self._tipo_entero(int(numeros.min()), maximo)
             
-            if tabla_existe:
+            # Importes: decimales exactos, al menos con centavos
+            escala = max(escala, 2)
+            digitos_enteros = len(str(int(numeros.abs().max())))
+            return f"DECIMAL({digitos_enteros + escala},{escala})"
+        
+        # Texto: fechas en formato ISO se guardan como DATE/DATETIME
+        texto = valores.astype(str)
+        if texto.str.match(r'^\d{4}-\d{2}-\d{2}( \d{2}:\d{2}(:\d{2})?)?$').all():
+            fechas = pd.to_datetime(texto, errors='coerce')
+            if fechas.notna().all():
+                return 'DATE' if (fechas == fechas.dt.normalize()).all() else 'DATETIME'
+        
+        largo = int(texto.str.len().max())
+        if largo > 16383:  # límite de VARCHAR con utf8mb4 (65535 bytes / 4)
+            return 'MEDIUMTEXT'
+        return f"VARCHAR({max(largo, 1)})"
+    
+    def _tipo_entero(self, minimo, maximo):
+        """Entero más chico (con o sin signo) que cubre el rango [minimo, maximo]"""
+        tipos = [('TINYINT', 8), ('SMALLINT', 16), ('MEDIUMINT', 24), ('INT', 32), ('BIGINT', 64)]
+        for tipo, bits in tipos:
+            if minimo >= 0 and maximo < 2 ** bits:
+                return f"{tipo} UNSIGNED"
+            if -2 ** (bits - 1) <= minimo and maximo < 2 ** (bits - 1):
+                return tipo
+        return 'DECIMAL(65,0)'
+    
+    def crear_tabla_desde_df(self, df, nombre_tabla, clave_primaria, muestra=False):
+        """Crea una tabla en MySQL basándose en el DataFrame (muestra=True: df es solo una parte del archivo)"""
+        with self._etapa('crear_tabla'):
+            # Verificar si la tabla ya existe (según el cache del esquema)
+            if self.tabla_existe(nombre_tabla):
                 # Verificar si tiene PRIMARY KEY
-                cursor.execute(f"""
-                    SELECT COLUMN_NAME 
-                    FROM information_schema.KEY_COLUMN_USAGE 
-                    WHERE TABLE_SCHEMA = '{self.database}' 
-                    AND TABLE_NAME = '{nombre_tabla}' 
-                    AND CONSTRAINT_NAME = 'PRIMARY'
-                """)
-                pk_existente = cursor.fetchone()
+                pk_existente = self.clave_primaria_de(nombre_tabla)
                 
                 if pk_existente:
                     logger.info(f" Tabla '{nombre_tabla}' ya existe con PRIMARY KEY: {pk_existente[0]}")
@@ -109,190 +619,1329 @@ class MySQLImporter:
                     logger.warning(f"  Tabla '{nombre_tabla}' existe pero SIN PRIMARY KEY")
                     # Intentar agregar PRIMARY KEY
                     try:
-                        cursor.execute(f"ALTER TABLE `{nombre_tabla}` ADD PRIMARY KEY (`{clave_primaria}`)")
-                        self.connection.commit()
+                        self.backend.agregar_clave_primaria(nombre_tabla, clave_primaria)
+                        self._esquema[nombre_tabla] = [clave_primaria]
                         logger.info(f" PRIMARY KEY agregada a '{nombre_tabla}'")
                     except Exception as e:
                         logger.error(f" No se pudo agregar PRIMARY KEY: {e}")
                 return
             
-            # Mapear tipos de pandas a MySQL
-            tipo_mysql = {
-                'int64': 'INT',
-                'float64': 'DECIMAL(10,2)',
-                'object': 'VARCHAR(255)',
-                'datetime64': 'DATETIME',
-                'bool': 'BOOLEAN'
-            }
+            try:
+                self.backend.crear_tabla_desde_df(df, nombre_tabla, clave_primaria, muestra)
+            except Exception as e:
+                logger.error(f" Error al crear tabla '{nombre_tabla}': {e}")
+                raise
+            self._esquema[nombre_tabla] = [clave_primaria]
+    
+    def limpiar_duplicados(self, nombre_tabla, clave_primaria, estrategia='en_lugar', tamano_lote=10000):
+        """Elimina filas duplicadas dejando una sola fila por clave"""
+        with self._etapa('limpiar_duplicados') as etapa:
+            inicio = time.perf_counter()
+            try:
+                filas_revisadas = etapa['filas'] = self.backend.contar_filas(nombre_tabla)
+                eliminados = self.backend.limpiar_duplicados(nombre_tabla, clave_primaria, estrategia, tamano_lote)
+            except Exception as e:
+                self.connection.rollback()
+                logger.error(f" Error al limpiar duplicados: {e}")
+                return None
             
-            # Construir definición de columnas
-            columnas_sql = []
-            for col in df.columns:
-                tipo_pandas = str(df[col].dtype)
-                tipo_sql = tipo_mysql.get(tipo_pandas, 'TEXT')
+            duracion = time.perf_counter() - inicio
+            if eliminados == 0:
+                logger.info(f" No hay duplicados en '{nombre_tabla}' ({filas_revisadas} filas revisadas)")
+            else:
+                logger.info(f" {eliminados} duplicados eliminados de '{nombre_tabla}' "
+                            f"({filas_revisadas} filas revisadas en {duracion:.2f}s)")
+            return eliminados
+    
+    def descartar_duplicados_df(self, df, clave_primaria):
+        """Quita claves repetidas del DataFrame antes de insertar (queda la última, como en el upsert)"""
+        inicio = time.perf_counter()
+        filas = len(df)
+        df = df.drop_duplicates(subset=[clave_primaria], keep='last')
+        
+        if len(df) < filas:
+            logger.warning(f"  {filas - len(df)} filas con '{clave_primaria}' repetida descartadas del CSV "
+                           f"({filas} filas revisadas en {time.perf_counter() - inicio:.2f}s)")
+        return df
+    
+    def _verificar_pk(self, nombre_tabla):
+        """Falla si la tabla no tiene PRIMARY KEY (sin ella el upsert duplicaría filas)"""
+        if not self.clave_primaria_de(nombre_tabla):
+            logger.error(f" La tabla '{nombre_tabla}' NO tiene PRIMARY KEY definida")
+            logger.error("   Los datos se duplicarán en cada ejecución")
+            raise ValueError(f"Tabla '{nombre_tabla}' requiere PRIMARY KEY para evitar duplicados")
+    
+    def _sql_upsert(self, nombre_tabla, columnas, clave_primaria, filas=1):
+        """Arma el INSERT ... ON DUPLICATE KEY UPDATE con `filas` grupos de VALUES"""
+        cols_str = ", ".join(f"`{col}`" for col in columnas)
+        placeholders = "(" + ", ".join(["%s"] * len(columnas)) + ")"
+        valores = ", ".join([placeholders] * filas)
+        
+        # Columnas para UPDATE (excluir clave primaria)
+        update_cols = [col for col in columnas if col != clave_primaria]
+        
+        if update_cols:  # Solo si hay columnas para actualizar
+            update_str = ", ".join(f"`{col}` = VALUES(`{col}`)" for col in update_cols)
+            
+            # Query con ON DUPLICATE KEY UPDATE
+            return f"""
+                INSERT INTO `{nombre_tabla}` ({cols_str})
+                VALUES {valores}
+                ON DUPLICATE KEY UPDATE {update_str}
+            """
+        
+        # Si solo hay clave primaria, usar INSERT IGNORE
+        return f"""
+            INSERT IGNORE INTO `{nombre_tabla}` ({cols_str})
+            VALUES {valores}
+        """
+    
+    def insertar_datos_bulk(self, df, nombre_tabla, clave_primaria):
+        """Inserta o actualiza datos (ON DUPLICATE KEY UPDATE o el upsert del motor)"""
+        if not self.connection:
+            raise ConnectionError("No hay conexión activa")
+        
+        # Verificar que hay PRIMARY KEY definida
+        self._verificar_pk(nombre_tabla)
+        return self.backend.insertar_datos_bulk(df, nombre_tabla, clave_primaria)
+    
+    def max_allowed_packet(self):
+        """Devuelve el tamaño máximo de paquete aceptado por el servidor (en bytes)"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SELECT @@max_allowed_packet")
+            return int(cursor.fetchone()[0])
+        finally:
+            cursor.close()
+    
+    def _filas_por_sentencia(self, df, tamano_lote, max_paquete):
+        """Calcula cuántas filas entran en una sentencia sin superar max_allowed_packet"""
+        muestra = df.head(1000)
+        if muestra.empty:
+            return tamano_lote
+        
+        # Peor caso de la muestra: el valor más largo de cada columna, x2 por el escapado de comillas,
+        # más comillas y comas de cada valor
+        ancho_columnas = muestra.astype(str).apply(lambda serie: serie.str.len().max())
+        bytes_por_fila = int(ancho_columnas.sum() * 2) + 4 * len(df.columns) + 4
+        
+        # Se deja un 20% del paquete libre para el texto fijo de la sentencia
+        return max(1, min(tamano_lote, int(max_paquete * 0.8) // bytes_por_fila))
+    
+    def _a_filas_sql(self, df):
+        """Convierte NaN en None columna por columna y devuelve las filas como tuplas de tipos nativos"""
+        # to_numpy(dtype=object) devuelve int/float/str de Python, que es lo que espera mysql.connector
+        columnas = [serie.to_numpy(dtype=object, na_value=None) for _, serie in df.items()]
+        return list(zip(*columnas))
+    
+    def insertar_datos_por_lotes(self, df, nombre_tabla, clave_primaria, tamano_lote=1000):
+        """Inserta o actualiza datos con sentencias multi-fila VALUES (...),(...) por lotes"""
+        if not self.connection:
+            raise ConnectionError("No hay conexión activa")
+        
+        if not self.backend.sentencias_multifila:  # los motores embebidos no tienen límite de paquete: carga masiva directa
+            return self.insertar_datos_bulk(df, nombre_tabla, clave_primaria)
+        
+        filas_por_sentencia = self._filas_por_sentencia(df, tamano_lote, self.max_allowed_packet())
+        columnas = list(df.columns)
+        sql_lote = self._sql_upsert(nombre_tabla, columnas, clave_primaria, filas_por_sentencia)
+        latencias = []
+        filas_afectadas = 0
+        
+        cursor = self.connection.cursor()
+        
+        try:
+            self._verificar_pk(nombre_tabla)
+            
+            for inicio in range(0, len(df), filas_por_sentencia):
+                filas = self._a_filas_sql(df.iloc[inicio:inicio + filas_por_sentencia])
                 
-                if col == clave_primaria:
-                    columnas_sql.append(f"`{col}` {tipo_sql} PRIMARY KEY")
-                else:
-                    columnas_sql.append(f"`{col}` {tipo_sql}")
+                # El último lote puede ser más corto que el resto
+                sql = sql_lote if len(filas) == filas_por_sentencia else \
+                    self._sql_upsert(nombre_tabla, columnas, clave_primaria, len(filas))
+                parametros = [valor for fila in filas for valor in fila]
+                
+                inicio_lote = time.perf_counter()
+                cursor.execute(sql, parametros)
+                latencias.append(time.perf_counter() - inicio_lote)
+                filas_afectadas += cursor.rowcount
+                logger.debug(f" Lote {len(latencias)}: {len(filas)} filas en {latencias[-1] * 1000:.1f} ms")
             
-            # Crear tabla con PRIMARY KEY explícita
-            sql = f"CREATE TABLE `{nombre_tabla}` ({', '.join(columnas_sql)})"
-            cursor.execute(sql)
             self.connection.commit()
-            logger.info(f" Tabla '{nombre_tabla}' creada con PRIMARY KEY en '{clave_primaria}'")
+            
+            logger.info(f" Procesadas {len(df)} filas en '{nombre_tabla}' ({filas_afectadas} afectadas) "
+                        f"en {len(latencias)} lotes de hasta {filas_por_sentencia} filas")
+            if latencias:
+                logger.info(f" Latencia por lote: min {min(latencias) * 1000:.1f} ms, "
+                            f"media {sum(latencias) / len(latencias) * 1000:.1f} ms, "
+                            f"max {max(latencias) * 1000:.1f} ms")
+            return len(df)
             
         except Exception as e:
-            logger.error(f" Error al crear tabla '{nombre_tabla}': {e}")
+            self.connection.rollback()
+            logger.error(f" Error al insertar en '{nombre_tabla}': {e}")
             raise
         finally:
             cursor.close()
     
-    def limpiar_duplicados(self, nombre_tabla, clave_primaria):
-        """Elimina filas duplicadas manteniendo solo la primera ocurrencia"""
-        cursor = self.connection.cursor()
+    def _insertar(self, df, nombre_tabla, clave_primaria, tamano_lote=None):
+        """Elige el modo de inserción: executemany o sentencias multi-fila por lotes"""
+        with self._etapa('insertar') as etapa:
+            if tamano_lote:
+                etapa['filas'] = self.insertar_datos_por_lotes(df, nombre_tabla, clave_primaria, tamano_lote)
+            else:
+                etapa['filas'] = self.insertar_datos_bulk(df, nombre_tabla, clave_primaria)
+            return etapa['filas']
+    
+    def _importar_por_bloques(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla,
+                              limpiar_duplicados, tamano_bloque, tamano_lote=None,
+                              descartar_duplicados_csv=False):
+        """Importa un CSV bloque a bloque, con commit después de cada bloque"""
+        total_filas = 0
+        inicio = time.perf_counter()
         
-        try:
-            # Contar duplicados antes
-            cursor.execute(f"""
-                SELECT COUNT(*) - COUNT(DISTINCT `{clave_primaria}`) 
-                FROM `{nombre_tabla}`
-            """)
-            duplicados_antes = cursor.fetchone()[0]
+        for numero, bloque in enumerate(self.leer_csv_por_bloques(ruta_csv, tamano_bloque), start=1):
+            if numero == 1:
+                # El primer bloque define columnas y tipos de la tabla
+                if clave_primaria not in bloque.columns:
+                    raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
+                                   f"Columnas disponibles: {list(bloque.columns)}")
+                
+                logger.info(f" Columnas: {list(bloque.columns)}")
+                
+                if crear_tabla:
+                    self.crear_tabla_desde_df(bloque, nombre_tabla, clave_primaria, muestra=True)
+                
+                if limpiar_duplicados:
+                    self.limpiar_duplicados(nombre_tabla, clave_primaria)
             
-            if duplicados_antes == 0:
-                logger.info(f" No hay duplicados en '{nombre_tabla}'")
-                return
+            if descartar_duplicados_csv:
+                bloque = self.descartar_duplicados_df(bloque, clave_primaria)
             
-            logger.warning(f"  Encontrados {duplicados_antes} registros duplicados en '{nombre_tabla}'")
+            inicio_bloque = time.perf_counter()
+            filas = self._insertar(bloque, nombre_tabla, clave_primaria, tamano_lote)
+            duracion_bloque = time.perf_counter() - inicio_bloque
+            total_filas += filas
             
-            # Crear tabla temporal con datos únicos
-            cursor.execute(f"""
-                CREATE TEMPORARY TABLE temp_{nombre_tabla} AS
-                SELECT * FROM `{nombre_tabla}`
-                GROUP BY `{clave_primaria}`
-            """)
+            logger.info(f" Bloque {numero}: {filas} filas en {duracion_bloque:.2f}s "
+                        f"({filas / max(duracion_bloque, 1e-9):,.0f} filas/s)")
+        
+        duracion = time.perf_counter() - inicio
+        logger.info(f" Total: {total_filas} filas en {duracion:.2f}s "
+                    f"({total_filas / max(duracion, 1e-9):,.0f} filas/s)")
+    
+    def _ejecutar_upsert(self, filas, columnas, nombre_tabla, clave_primaria, filas_por_sentencia=None):
+        """Envía filas ya convertidas: executemany o sentencias multi-fila de filas_por_sentencia filas"""
+        cursor = self.connection.cursor()
+        try:
+            if not filas_por_sentencia:
+                cursor.executemany(self._sql_upsert(nombre_tabla, columnas, clave_primaria), filas)
+                return
             
-            # Vaciar tabla original
-            cursor.execute(f"TRUNCATE TABLE `{nombre_tabla}`")
+            for inicio in range(0, len(filas), filas_por_sentencia):
+                lote = filas[inicio:inicio + filas_por_sentencia]
+                sql = self._sql_upsert(nombre_tabla, columnas, clave_primaria, len(lote))
+                cursor.execute(sql, [valor for fila in lote for valor in fila])
+        finally:
+            cursor.close()
+    
+    def _producir_bloques(self, ruta_csv, tamano_bloque, convertir, cola, detener):
+        """Hilo productor: parsea y convierte bloques y los deja en la cola (se bloquea si está llena)"""
+        def poner(elemento):
+            # put con timeout para poder abandonar si el consumidor falló
+            while not detener.is_set():
+                try:
+                    cola.put(elemento, timeout=0.5)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+        
+        # El informe (y tracemalloc) no es seguro entre hilos: acá solo se toman tiempos y el consumidor
+        # los suma al informe cuando recibe cada bloque
+        try:
+            bloques = self.leer_csv_por_bloques(ruta_csv, tamano_bloque, medir=False)
+            while True:
+                inicio = time.perf_counter()
+                bloque = next(bloques, None)
+                if bloque is None:
+                    break
+                tiempos = {'leer': time.perf_counter() - inicio}
+                filas = None
+                if convertir:
+                    inicio = time.perf_counter()
+                    filas = self._a_filas_sql(bloque)
+                    tiempos['convertir'] = time.perf_counter() - inicio
+                if not poner((bloque, filas, tiempos)):
+                    return
+            poner(None)  # fin del archivo
+        except Exception as e:
+            poner(e)  # el consumidor vuelve a lanzar el error
+    
+    def _importar_en_pipeline(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla, limpiar_duplicados,
+                              tamano_bloque, tamano_lote=None, descartar_duplicados_csv=False,
+                              profundidad_cola=2):
+        """Lee/convierte el bloque N+1 en otro hilo mientras se inserta el bloque N"""
+        # Con clave repetida dentro del bloque hay que descartar antes de convertir: se convierte en el consumidor
+        convertir = self.backend.sentencias_multifila and not descartar_duplicados_csv
+        cola = queue.Queue(maxsize=profundidad_cola)  # acotada: el lector no se adelanta más de N bloques
+        detener = threading.Event()
+        productor = threading.Thread(target=self._producir_bloques, name=f"lector-{nombre_tabla}",
+                                     args=(ruta_csv, tamano_bloque, convertir, cola, detener), daemon=True)
+        
+        total_filas = 0
+        filas_por_sentencia = None
+        inicio = time.perf_counter()
+        productor.start()
+        
+        try:
+            numero = 0
+            while True:
+                elemento = cola.get()
+                if elemento is None:
+                    break
+                if isinstance(elemento, Exception):
+                    raise elemento
+                
+                bloque, filas, tiempos = elemento
+                numero += 1
+                if self._informe is not None:
+                    for etapa, segundos in tiempos.items():
+                        self._informe.sumar(etapa, segundos, len(bloque))
+                
+                if numero == 1:
+                    # El primer bloque define columnas y tipos de la tabla
+                    if clave_primaria not in bloque.columns:
+                        raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
+                                       f"Columnas disponibles: {list(bloque.columns)}")
+                    
+                    logger.info(f" Columnas: {list(bloque.columns)}")
+                    
+                    if crear_tabla:
+                        self.crear_tabla_desde_df(bloque, nombre_tabla, clave_primaria, muestra=True)
+                    
+                    if limpiar_duplicados:
+                        self.limpiar_duplicados(nombre_tabla, clave_primaria)
+                    
+                    if convertir:
+                        self._verificar_pk(nombre_tabla)
+                        if tamano_lote:
+                            filas_por_sentencia = self._filas_por_sentencia(bloque, tamano_lote,
+                                                                            self.max_allowed_packet())
+                
+                if not convertir:
+                    # Motores embebidos o descarte de duplicados: el bloque se inserta como DataFrame
+                    if descartar_duplicados_csv:
+                        bloque = self.descartar_duplicados_df(bloque, clave_primaria)
+                    total_filas += self._insertar(bloque, nombre_tabla, clave_primaria, tamano_lote)
+                    continue
+                
+                with self._etapa('insertar') as etapa:
+                    try:
+                        self._ejecutar_upsert(filas, list(bloque.columns), nombre_tabla, clave_primaria,
+                                              filas_por_sentencia)
+                        self.connection.commit()
+                    except Exception:
+                        self.connection.rollback()
+                        raise
+                    etapa['filas'] = len(filas)
+                total_filas += len(filas)
+                logger.info(f" Bloque {numero}: {len(filas)} filas insertadas ({total_filas} en total)")
+        finally:
+            detener.set()
+            productor.join()
+        
+        duracion = time.perf_counter() - inicio
+        logger.info(f" Pipeline: {total_filas} filas en {duracion:.2f}s "
+                    f"({total_filas / max(duracion, 1e-9):,.0f} filas/s)")
+    
+    def local_infile_habilitado(self):
+        """Verifica si el servidor acepta LOAD DATA LOCAL INFILE"""
+        if not self.backend.load_data or not self.permitir_local_infile:
+            return False
+        
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("SHOW VARIABLES LIKE 'local_infile'")
+            resultado = cursor.fetchone()
+            return resultado is not None and str(resultado[1]).upper() in ('ON', '1')
+        finally:
+            cursor.close()
+    
+    def _fin_de_linea(self, ruta_archivo):
+        """Detecta si el archivo usa saltos de línea Windows (CRLF) o Unix (LF)"""
+        with open(ruta_archivo, 'rb') as f:
+            primera_linea = f.readline()
+        return '\r\n' if primera_linea.endswith(b'\r\n') else '\n'
+    
+    def cargar_con_load_data(self, ruta_csv, nombre_tabla, clave_primaria, columnas, formato):
+        """Carga el CSV en una tabla staging con LOAD DATA y la fusiona con un único INSERT ... SELECT"""
+        staging = f"staging_{nombre_tabla}"
+        cols_str = ", ".join(f"`{col}`" for col in columnas)
+        
+        # Variables de usuario para convertir campos vacíos en NULL (igual que NaN -> None en pandas)
+        variables = ", ".join(f"@v{i}" for i in range(len(columnas)))
+        asignaciones = ", ".join(f"`{col}` = NULLIF(@v{i}, '')" for i, col in enumerate(columnas))
+        
+        update_cols = [col for col in columnas if col != clave_primaria]
+        if update_cols:
+            update_str = ", ".join(f"`{col}` = VALUES(`{col}`)" for col in update_cols)
+            sql_merge = f"""
+                INSERT INTO `{nombre_tabla}` ({cols_str})
+                SELECT {cols_str} FROM `{staging}`
+                ON DUPLICATE KEY UPDATE {update_str}
+            """
+        else:
+            sql_merge = f"""
+                INSERT IGNORE INTO `{nombre_tabla}` ({cols_str})
+                SELECT {cols_str} FROM `{staging}`
+            """
+        
+        cursor = self.connection.cursor()
+        try:
+            # Staging sin índices: copia solo la estructura de columnas de la tabla destino
+            cursor.execute(f"DROP TEMPORARY TABLE IF EXISTS `{staging}`")
+            cursor.execute(f"CREATE TEMPORARY TABLE `{staging}` AS SELECT {cols_str} FROM `{nombre_tabla}` WHERE 1 = 0")
             
-            # Reinsertar datos únicos
+            inicio = time.perf_counter()
             cursor.execute(f"""
-                INSERT INTO `{nombre_tabla}`
-                SELECT * FROM temp_{nombre_tabla}
-            """)
-            
-            # Eliminar tabla temporal
-            cursor.execute(f"DROP TEMPORARY TABLE temp_{nombre_tabla}")
+                LOAD DATA LOCAL INFILE %s
+                INTO TABLE `{staging}`
+                CHARACTER SET {CHARSET_MYSQL.get(formato['encoding'], 'utf8mb4')}
+                FIELDS TERMINATED BY %s OPTIONALLY ENCLOSED BY %s ESCAPED BY '\\\\'
+                LINES TERMINATED BY %s
+                IGNORE 1 LINES
+                ({variables})
+                SET {asignaciones}
+            """, (Path(ruta_csv).as_posix(), formato['sep'], formato['quotechar'], self._fin_de_linea(ruta_csv)))
+            filas_cargadas = cursor.rowcount
+            duracion_carga = time.perf_counter() - inicio
+            logger.info(f" LOAD DATA: {filas_cargadas} filas en staging en {duracion_carga:.2f}s")
             
+            inicio = time.perf_counter()
+            cursor.execute(sql_merge)
+            filas_afectadas = cursor.rowcount
+            cursor.execute(f"DROP TEMPORARY TABLE `{staging}`")
             self.connection.commit()
-            logger.info(f" {duplicados_antes} duplicados eliminados de '{nombre_tabla}'")
+            duracion_merge = time.perf_counter() - inicio
             
-        except Exception as e:
+            logger.info(f" Procesadas {filas_cargadas} filas en '{nombre_tabla}' ({filas_afectadas} afectadas) "
+                        f"- merge en {duracion_merge:.2f}s")
+            return filas_cargadas
+            
+        except Exception:
             self.connection.rollback()
-            logger.error(f" Error al limpiar duplicados: {e}")
+            raise
         finally:
             cursor.close()
     
-    def insertar_datos_bulk(self, df, nombre_tabla, clave_primaria):
-        """Inserta o actualiza datos usando ON DUPLICATE KEY UPDATE"""
-        if not self.connection:
-            raise ConnectionError("No hay conexión activa")
+    def _importar_con_load_data(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla, limpiar_duplicados):
+        """Importa con LOAD DATA LOCAL INFILE. Devuelve False si hay que usar el camino executemany"""
+        formato = self.detectar_formato_csv(ruta_csv)
         
-        cursor = self.connection.cursor()
+        # Solo se lee una muestra para validar columnas y crear la tabla
+        with self._etapa('leer'):
+            muestra = pd.read_csv(ruta_csv, nrows=1000, **self._opciones_lectura(formato, 'skip', 'c'))
+        
+        if clave_primaria not in muestra.columns:
+            raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
+                           f"Columnas disponibles: {list(muestra.columns)}")
+        
+        logger.info(f" Columnas: {list(muestra.columns)}")
+        
+        if crear_tabla:
+            self.crear_tabla_desde_df(muestra, nombre_tabla, clave_primaria, muestra=True)
+        
+        if not self.local_infile_habilitado():
+            logger.warning(" LOAD DATA LOCAL INFILE deshabilitado, se usa INSERT por lotes")
+            return False
+        
+        if limpiar_duplicados:
+            self.limpiar_duplicados(nombre_tabla, clave_primaria)
         
         try:
-            # Verificar que hay PRIMARY KEY definida
-            cursor.execute(f"""
-                SELECT COUNT(*) 
-                FROM information_schema.KEY_COLUMN_USAGE 
-                WHERE TABLE_SCHEMA = '{self.database}' 
-                AND TABLE_NAME = '{nombre_tabla}' 
-                AND CONSTRAINT_NAME = 'PRIMARY'
-            """)
-            tiene_pk = cursor.fetchone()[0] > 0
+            with self._etapa('insertar') as etapa:
+                etapa['filas'] = self.cargar_con_load_data(ruta_csv, nombre_tabla, clave_primaria,
+                                                           list(muestra.columns), formato)
+        except Error as e:
+            if e.errno in ERRORES_LOCAL_INFILE:
+                logger.warning(f" LOAD DATA LOCAL INFILE rechazado ({e}), se usa INSERT por lotes")
+                return False
+            raise
+        
+        return True
+    
+    def huella_archivo(self, ruta_archivo, calcular_hash=True):
+        """Devuelve tamaño, fecha de modificación y (opcional) hash SHA-256 del archivo"""
+        info = Path(ruta_archivo).stat()
+        huella = {'tamano': info.st_size, 'mtime': info.st_mtime}
+        
+        if calcular_hash:
+            sha = hashlib.sha256()
+            with open(ruta_archivo, 'rb') as f:
+                for bloque in iter(lambda: f.read(1024 * 1024), b''):
+                    sha.update(bloque)
+            huella['sha256'] = sha.hexdigest()
+        
+        return huella
+    
+    def _rutas_manifiesto(self, ruta_csv, nombre_tabla):
+        """Rutas del manifiesto (huella del archivo) y de los hashes por fila de una tabla"""
+        carpeta = Path(ruta_csv).parent / '.manifiestos'
+        base = f"{self.database}.{nombre_tabla}"
+        return carpeta / f"{base}.json", carpeta / f"{base}.filas.pkl"
+    
+    def _hashes_por_fila(self, df, clave_primaria):
+        """Hash de cada fila indexado por clave primaria (si la clave se repite, gana la última como en el upsert)"""
+        hashes = pd.DataFrame({
+            'clave': df[clave_primaria].astype(str).values,
+            'hash': pd.util.hash_pandas_object(df, index=False).values
+        })
+        return hashes.drop_duplicates('clave', keep='last')
+    
+    def eliminar_por_clave(self, nombre_tabla, clave_primaria, claves, tamano_lote=1000):
+        """Elimina las filas cuyas claves primarias se indican, en lotes"""
+        return self.backend.eliminar_por_clave(nombre_tabla, clave_primaria, claves, tamano_lote)
+    
+    def contar_filas(self, nombre_tabla):
+        """Cantidad de filas de la tabla (None si la tabla no existe)"""
+        if not self.tabla_existe(nombre_tabla):
+            return None
+        return self.backend.contar_filas(nombre_tabla)
+    
+    def importar_csv_incremental(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla=True, tamano_lote=None,
+                                 limpiar_duplicados=False, descartar_duplicados_csv=False):
+        """Importa solo lo que cambió desde la última importación (según el manifiesto de la tabla)"""
+        ruta_manifiesto, ruta_hashes = self._rutas_manifiesto(ruta_csv, nombre_tabla)
+        manifiesto = None
+        if ruta_manifiesto.exists() and ruta_hashes.exists():
+            with open(ruta_manifiesto, 'r', encoding='utf-8') as f:
+                manifiesto = json.load(f)
+        
+        # El manifiesto solo vale si la tabla sigue como quedó: si se borró, se vació o cambió
+        # por fuera, los hashes guardados ya no describen su contenido y se importa todo de nuevo
+        if manifiesto and manifiesto['clave_primaria'] == clave_primaria:
+            filas_tabla = self.contar_filas(nombre_tabla)
+            esperadas = manifiesto.get('filas_tabla', manifiesto['filas'])
+            if filas_tabla != esperadas:
+                estado = "no existe" if filas_tabla is None else f"tiene {filas_tabla} filas y se esperaban {esperadas}"
+                logger.warning(f"  La tabla '{nombre_tabla}' {estado}: se importa el archivo completo")
+                manifiesto = None
+        
+        # 1. Archivo sin cambios: se compara tamaño/fecha y, si difieren, el hash del contenido
+        with self._etapa('huella'):
+            huella = self.huella_archivo(ruta_csv, calcular_hash=False)
+        if manifiesto and manifiesto['clave_primaria'] == clave_primaria:
+            anterior = manifiesto['huella']
+            if huella['tamano'] == anterior['tamano'] and huella['mtime'] == anterior['mtime']:
+                logger.info(f" '{Path(ruta_csv).name}' sin cambios desde la última importación - SALTANDO")
+                return
+        
+        with self._etapa('huella'):
+            huella = self.huella_archivo(ruta_csv)
+        if manifiesto and manifiesto['clave_primaria'] == clave_primaria \
+                and huella['sha256'] == manifiesto['huella'].get('sha256'):
+            logger.info(f" '{Path(ruta_csv).name}' tiene el mismo contenido (solo cambió la fecha) - SALTANDO")
+            manifiesto['huella'] = huella
+            self._guardar_manifiesto(ruta_manifiesto, manifiesto)
+            return
+        
+        # 2. Archivo cambiado: comparar hashes por fila con los de la importación anterior
+        df = self.leer_csv(ruta_csv)
+        if clave_primaria not in df.columns:
+            raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
+                           f"Columnas disponibles: {list(df.columns)}")
+        
+        # Mismas opciones de duplicados que los demás modos
+        if descartar_duplicados_csv:
+            df = self.descartar_duplicados_df(df, clave_primaria)
+        
+        if crear_tabla:
+            self.crear_tabla_desde_df(df, nombre_tabla, clave_primaria)
+        
+        if limpiar_duplicados:
+            self.limpiar_duplicados(nombre_tabla, clave_primaria)
+        
+        with self._etapa('comparar') as etapa:
+            actuales = self._hashes_por_fila(df, clave_primaria)
+            etapa['filas'] = len(actuales)
             
-            if not tiene_pk:
-                logger.error(f" La tabla '{nombre_tabla}' NO tiene PRIMARY KEY definida")
-                logger.error("   Los datos se duplicarán en cada ejecución")
-                raise ValueError(f"Tabla '{nombre_tabla}' requiere PRIMARY KEY para evitar duplicados")
+            if manifiesto and manifiesto['clave_primaria'] == clave_primaria:
+                anteriores = pd.read_pickle(ruta_hashes)
+                cruce = actuales.merge(anteriores, on='clave', how='outer', suffixes=('', '_anterior'), indicator=True)
+                nuevas = cruce.loc[cruce['_merge'] == 'left_only', 'clave']
+                modificadas = cruce.loc[(cruce['_merge'] == 'both') & (cruce['hash'] != cruce['hash_anterior']), 'clave']
+                eliminadas = cruce.loc[cruce['_merge'] == 'right_only', 'clave']
+            else:
+                # Sin manifiesto previo: se importa todo (sin borrar nada, igual que la importación completa)
+                logger.info(f" No hay manifiesto previo para '{nombre_tabla}', se importa el archivo completo")
+                nuevas, modificadas, eliminadas = actuales['clave'], actuales['clave'].iloc[:0], actuales['clave'].iloc[:0]
+        
+        logger.info(f" Cambios: {len(nuevas)} nuevas, {len(modificadas)} modificadas, {len(eliminadas)} eliminadas")
+        
+        # 3. Enviar solo las claves que cambiaron
+        claves_upsert = pd.concat([nuevas, modificadas])
+        if len(claves_upsert):
+            cambios = df[df[clave_primaria].astype(str).isin(claves_upsert)]
+            self._insertar(cambios, nombre_tabla, clave_primaria, tamano_lote)
+        if len(eliminadas):
+            with self._etapa('eliminar') as etapa:
+                filas = etapa['filas'] = self.eliminar_por_clave(nombre_tabla, clave_primaria, eliminadas)
+            logger.info(f" Eliminadas {filas} filas de '{nombre_tabla}'")
+        
+        # 4. El manifiesto se guarda solo si todo se aplicó bien
+        ruta_hashes.parent.mkdir(exist_ok=True)
+        actuales.to_pickle(ruta_hashes)
+        self._guardar_manifiesto(ruta_manifiesto, {
+            'tabla': nombre_tabla,
+            'clave_primaria': clave_primaria,
+            'huella': huella,
+            'filas': len(actuales),
+            'filas_tabla': self.contar_filas(nombre_tabla)
+        })
+    
+    def _huella_rapida(self, ruta_csv):
+        """Tamaño, fecha y hash del primer MB: alcanza para invalidar un checkpoint sin leer todo el archivo"""
+        huella = self.huella_archivo(ruta_csv, calcular_hash=False)
+        with open(ruta_csv, 'rb') as f:
+            huella['sha256_inicio'] = hashlib.sha256(f.read(1024 * 1024)).hexdigest()
+        return huella
+    
+    def _ruta_checkpoint(self, ruta_csv, nombre_tabla):
+        """Archivo de checkpoint de la importación reanudable de una tabla"""
+        return Path(ruta_csv).parent / '.manifiestos' / f"{self.database}.{nombre_tabla}.checkpoint.json"
+    
+    def _estado_tras_linea(self, linea, estado, sep, comilla, escape, buscar_comillas, buscar_campo):
+        """Sigue una línea con las reglas del parser C de pandas; None si la fila terminó en ella, si no el estado abierto"""
+        # 0 inicio de campo, 1 campo sin comillas, 2 entre comillas, 3 comilla dentro de comillas,
+        # 4 caracter escapado, 5 caracter escapado entre comillas (el escape también toma un salto de línea)
+        pos, largo = 0, len(linea)
+        while pos < largo:
+            if estado == 2:
+                # Entre comillas solo importan la comilla y el escape (los separadores y saltos son texto)
+                encontrado = buscar_comillas.search(linea, pos)
+                if encontrado is None:
+                    return 2
+                pos = encontrado.start()
+                estado = 5 if linea[pos] == escape else 3
+            elif estado in (4, 5):
+                estado = 1 if estado == 4 else 2
+            elif estado == 1:
+                encontrado = buscar_campo.search(linea, pos)
+                if encontrado is None:
+                    return 1
+                pos = encontrado.start()
+                caracter = linea[pos]
+                if caracter == sep:
+                    estado = 0
+                elif caracter == escape:
+                    estado = 4
+                else:
+                    return None  # salto de línea fuera de comillas: termina la fila
+            else:
+                caracter = linea[pos]
+                if caracter in (10, 13) and estado in (0, 3):
+                    return None
+                if estado == 3 and caracter == comilla:
+                    estado = 2  # comilla doble: una comilla literal
+                elif caracter == sep:
+                    estado = 0
+                elif estado == 0 and caracter == comilla:
+                    estado = 2
+                elif estado == 0 and caracter == escape:
+                    estado = 4
+                elif not (estado == 0 and caracter == 32):  # skipinitialspace: los espacios iniciales se saltean
+                    estado = 1
+            pos += 1
+        return estado
+    
+    def leer_csv_desde_offset(self, ruta_csv, tamano_bloque, offset=None, modo='skip'):
+        """Lee el CSV en bloques desde un byte dado y devuelve (bloque, offset donde termina el bloque)"""
+        formato = self.detectar_formato_csv(ruta_csv)
+        opciones = self._opciones_lectura(formato, modo, 'c')
+        sep, comilla, escape = (opciones[clave].encode(formato['encoding'])
+                                for clave in ('sep', 'quotechar', 'escapechar'))
+        buscar_comillas = re.compile(b'[' + re.escape(comilla + escape) + b']')
+        buscar_campo = re.compile(b'[' + re.escape(sep + escape) + b'\r\n]')
+        
+        with open(ruta_csv, 'rb') as f:
+            encabezado = f.readline()
+            if offset:
+                f.seek(offset)
             
-            columnas = list(df.columns)
-            cols_str = ", ".join(f"`{col}`" for col in columnas)
-            placeholders = ", ".join(["%s"] * len(columnas))
+            while True:
+                lineas = []
+                estado = None  # None: la última línea cerró su fila
+                with self._etapa('leer') as etapa:
+                    # Se junta de a líneas; una fila con saltos de línea entre comillas (o escapados) se completa
+                    # antes de cortar, con las mismas reglas que usa pandas al parsear el bloque
+                    for linea in iter(f.readline, b''):
+                        lineas.append(linea)
+                        if estado is not None or comilla in linea or escape in linea:
+                            estado = self._estado_tras_linea(linea, estado or 0, sep[0], comilla[0], escape[0],
+                                                             buscar_comillas, buscar_campo)
+                        if len(lineas) >= tamano_bloque and estado is None:
+                            break
+                    
+                    if not lineas:
+                        return
+                    bloque = pd.read_csv(io.BytesIO(encabezado + b''.join(lineas)),
+                                         **opciones)
+                    etapa['filas'] = len(bloque)
+                yield bloque, f.tell()
+    
+    def _importar_reanudable(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla, limpiar_duplicados,
+                             tamano_bloque, tamano_lote=None, descartar_duplicados_csv=False):
+        """Importa por bloques guardando un checkpoint después de cada bloque confirmado (commit)"""
+        ruta_checkpoint = self._ruta_checkpoint(ruta_csv, nombre_tabla)
+        huella = self._huella_rapida(ruta_csv)
+        offset, filas_confirmadas = None, 0
+        
+        if ruta_checkpoint.exists():
+            with open(ruta_checkpoint, 'r', encoding='utf-8') as f:
+                checkpoint = json.load(f)
+            if checkpoint['huella'] == huella and checkpoint['clave_primaria'] == clave_primaria:
+                offset, filas_confirmadas = checkpoint['offset'], checkpoint['filas_confirmadas']
+                logger.info(f" Reanudando '{nombre_tabla}' desde la fila {filas_confirmadas} (byte {offset})")
+            else:
+                logger.warning(f"  El archivo cambió desde el último checkpoint de '{nombre_tabla}', se empieza de cero")
+        
+        for numero, (bloque, offset_fin) in enumerate(self.leer_csv_desde_offset(ruta_csv, tamano_bloque, offset),
+                                                      start=1):
+            if numero == 1:
+                if clave_primaria not in bloque.columns:
+                    raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
+                                   f"Columnas disponibles: {list(bloque.columns)}")
+                if crear_tabla:
+                    self.crear_tabla_desde_df(bloque, nombre_tabla, clave_primaria, muestra=True)
+                # Al reanudar no se limpia: la tabla ya tiene los bloques anteriores de esta importación
+                if limpiar_duplicados and offset is None:
+                    self.limpiar_duplicados(nombre_tabla, clave_primaria)
             
-            # Columnas para UPDATE (excluir clave primaria)
-            update_cols = [col for col in columnas if col != clave_primaria]
+            if descartar_duplicados_csv:
+                bloque = self.descartar_duplicados_df(bloque, clave_primaria)
             
-            if update_cols:  # Solo si hay columnas para actualizar
-                update_str = ", ".join(f"`{col}` = VALUES(`{col}`)" for col in update_cols)
+            # _insertar hace commit; recién después se avanza el checkpoint
+            filas_confirmadas += self._insertar(bloque, nombre_tabla, clave_primaria, tamano_lote)
+            self._guardar_manifiesto(ruta_checkpoint, {
+                'tabla': nombre_tabla,
+                'clave_primaria': clave_primaria,
+                'huella': huella,
+                'offset': offset_fin,
+                'filas_confirmadas': filas_confirmadas
+            })
+            logger.info(f" Bloque {numero} confirmado: {filas_confirmadas} filas (byte {offset_fin})")
+        
+        # Importación terminada: el checkpoint ya no hace falta
+        ruta_checkpoint.unlink(missing_ok=True)
+    
+    def _guardar_manifiesto(self, ruta_manifiesto, manifiesto):
+        """Escribe el manifiesto en un archivo temporal y lo reemplaza (no queda a medio escribir)"""
+        ruta_manifiesto.parent.mkdir(exist_ok=True)
+        temporal = ruta_manifiesto.with_suffix('.tmp')
+        with open(temporal, 'w', encoding='utf-8') as f:
+            json.dump(manifiesto, f, indent=2)
+        temporal.replace(ruta_manifiesto)
+    
+    def _etapa(self, nombre):
+        """Mide una etapa en el informe actual (si no hay importación en curso no mide nada)"""
+        if self._informe is None:
+            return nullcontext({'filas': 0})
+        return self._informe.etapa(nombre)
+    
+    def _iniciar_informe(self, ruta_csv, nombre_tabla):
+        """Empieza el informe de un archivo (y la medición de memoria si está activada)"""
+        if self.medir_memoria and not tracemalloc.is_tracing():
+            tracemalloc.start()
+        self._informe = InformeImportacion(ruta_csv, nombre_tabla, self.medir_memoria)
+    
+    def _cerrar_informe(self):
+        """Cierra el informe del archivo actual y lo agrega a self.informes"""
+        informe = self._informe
+        informe.duracion = time.time() - informe.inicio
+        self.informes.append(informe)
+        self._informe = None
+        logger.info(informe.resumen())
+    
+    def guardar_informe(self, ruta_json):
+        """Exporta los informes de todas las importaciones a un archivo JSON"""
+        with open(ruta_json, 'w', encoding='utf-8') as f:
+            json.dump([informe.a_dict() for informe in self.informes], f, indent=2, ensure_ascii=False)
+        logger.info(f" Informe de importación guardado en: {ruta_json}")
+    
+    def _indices_secundarios(self, nombre_tabla):
+        """Índices de la tabla que no son la PRIMARY KEY: {nombre: (es_unico, [columnas])}"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME, SUB_PART
+                FROM information_schema.STATISTICS
+                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME <> 'PRIMARY'
+                ORDER BY INDEX_NAME, SEQ_IN_INDEX
+            """, (self.database, nombre_tabla))
+            indices = {}
+            for indice, no_unico, columna, prefijo in cursor.fetchall():
+                definicion = f"`{columna}`({prefijo})" if prefijo else f"`{columna}`"
+                indices.setdefault(indice, (not no_unico, []))[1].append(definicion)
+            return indices
+        finally:
+            cursor.close()
+    
+    def _claves_foraneas(self, nombre_tabla):
+        """FOREIGN KEY declaradas en la tabla: [(columna, tabla_padre, columna_padre)]"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT COLUMN_NAME, REFERENCED_TABLE_NAME, REFERENCED_COLUMN_NAME
+                FROM information_schema.KEY_COLUMN_USAGE
+                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND REFERENCED_TABLE_NAME IS NOT NULL
+            """, (self.database, nombre_tabla))
+            return cursor.fetchall()
+        finally:
+            cursor.close()
+    
+    def validar_integridad(self, nombre_tabla, indices_unicos=None):
+        """Busca claves repetidas en índices únicos y filas huérfanas en FOREIGN KEY"""
+        violaciones = []
+        cursor = self.connection.cursor()
+        try:
+            for indice, columnas in (indices_unicos or {}).items():
+                # `col`(10) es un índice por prefijo: en el GROUP BY va la columna sola
+                cols_str = ", ".join(re.sub(r"\(\d+\)$", "", columna) for columna in columnas)
+                cursor.execute(f"""
+                    SELECT COUNT(*) FROM (
+                        SELECT 1 FROM `{nombre_tabla}` GROUP BY {cols_str} HAVING COUNT(*) > 1
+                    ) AS repetidas
+                """)
+                repetidas = cursor.fetchone()[0]
+                if repetidas:
+                    violaciones.append({'tipo': 'unico', 'indice': indice, 'filas': repetidas})
+            
+            for columna, padre, columna_padre in self._claves_foraneas(nombre_tabla):
+                cursor.execute(f"""
+                    SELECT COUNT(*)
+                    FROM `{nombre_tabla}` AS hija
+                    LEFT JOIN `{padre}` AS padre ON hija.`{columna}` = padre.`{columna_padre}`
+                    WHERE hija.`{columna}` IS NOT NULL AND padre.`{columna_padre}` IS NULL
+                """)
+                huerfanas = cursor.fetchone()[0]
+                if huerfanas:
+                    violaciones.append({'tipo': 'foreign_key', 'columna': columna,
+                                        'referencia': f"{padre}.{columna_padre}", 'filas': huerfanas})
+        finally:
+            cursor.close()
+        
+        for violacion in violaciones:
+            logger.warning(f"  Violación de integridad en '{nombre_tabla}': {violacion}")
+        if not violaciones:
+            logger.info(f" Integridad de '{nombre_tabla}' verificada sin violaciones")
+        return violaciones
+    
+    def _columnas_y_tipos(self, nombre_tabla):
+        """Columnas de la tabla en orden, con su tipo de MySQL (DATA_TYPE)"""
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("""
+                SELECT COLUMN_NAME, DATA_TYPE
+                FROM information_schema.COLUMNS
+                WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s
+                ORDER BY ORDINAL_POSITION
+            """, (self.database, nombre_tabla))
+            return [(columna, tipo.lower()) for columna, tipo in cursor.fetchall()]
+        finally:
+            cursor.close()
+    
+    def _sql_verificacion(self, tipos, clave_primaria, clave_entera):
+        """Expresiones SQL de posición en el rango, clave y hash de fila (deben coincidir con _huellas_csv)"""
+        partes = []
+        for columna, tipo in tipos:
+            if tipo in TIPOS_NUMERICOS:
+                valor = f"CAST(`{columna}` AS DECIMAL(65,4))"
+            else:
+                valor = f"CAST(`{columna}` AS CHAR)"
+            partes.append(f"COALESCE({valor}, CHAR(0))")  # NULL distinto de cadena vacía
+        
+        clave = f"CAST(`{clave_primaria}` AS CHAR)"
+        # Clave entera: los rangos usan el índice de la PK; si no, se reparte por CRC32 de la clave
+        posicion = f"`{clave_primaria}`" if clave_entera else f"CRC32({clave})"
+        hash_fila = f"CRC32(CONCAT_WS(CHAR(31), {', '.join(partes)}))"
+        return posicion, clave, hash_fila
+    
+    def _normalizar_numero(self, texto):
+        """Mismo texto que CAST(valor AS DECIMAL(65,4)) en MySQL"""
+        try:
+            return format(Decimal(texto).quantize(Decimal('0.0001'), rounding=ROUND_HALF_UP), 'f')
+        except InvalidOperation:
+            bandera = texto.strip().lower()
+            if bandera in ('true', 'false'):
+                return '1.0000' if bandera == 'true' else '0.0000'
+            return texto
+    
+    def _texto_clave_entera(self, texto):
+        """Clave entera como la devuelve CAST(... AS CHAR) en MySQL (None si el texto no es un entero)"""
+        try:
+            numero = Decimal(texto)
+            if numero == numero.to_integral_value():
+                return str(int(numero))
+        except (InvalidOperation, ValueError, OverflowError):
+            pass
+        return None
+    
+    def _huellas_csv(self, ruta_csv, tipos, clave_primaria, clave_entera, tamano_bloque=500000):
+        """Posición, clave y hash de cada fila del CSV, ordenados por posición, y cuántas filas tienen clave inválida"""
+        formato = self.detectar_formato_csv(ruta_csv)
+        columnas = [columna for columna, _ in tipos]
+        partes = []
+        invalidas = 0
+        
+        lector = pd.read_csv(ruta_csv, dtype=str, chunksize=tamano_bloque, **self._opciones_lectura(formato, 'skip', 'c'))
+        with lector:
+            for bloque in lector:
+                faltantes = [columna for columna in columnas if columna not in bloque.columns]
+                if faltantes:
+                    raise ValueError(f" Columnas de la tabla que no están en el CSV: {faltantes}")
+                
+                valores = []
+                for columna, tipo in tipos:
+                    serie = bloque[columna]
+                    if tipo in TIPOS_NUMERICOS:
+                        serie = serie.map(self._normalizar_numero, na_action='ignore')
+                    valores.append(serie.fillna('\x00'))
+                
+                # Clave vacía (o no entera si la columna es entera): esas filas no pueden estar en la tabla
+                # con esa clave ni ubicarse en un rango; se cuentan aparte y no entran en la comparación
+                claves = bloque[clave_primaria]
+                if clave_entera:
+                    claves = claves.map(self._texto_clave_entera, na_action='ignore')
+                validas = (claves.notna() & (claves.str.strip() != '')).to_numpy()
+                invalidas += int((~validas).sum())
+                claves = claves[validas]
+                valores = [serie[validas] for serie in valores]
                 
-                # Query con ON DUPLICATE KEY UPDATE
-                sql = f"""
-                    INSERT INTO `{nombre_tabla}` ({cols_str})
-                    VALUES ({placeholders})
-                    ON DUPLICATE KEY UPDATE {update_str}
-                """
+                if clave_entera:
+                    posiciones = claves.astype('int64')
+                else:
+                    posiciones = claves.map(lambda texto: zlib.crc32(texto.encode('utf-8'))).astype('int64')
+                
+                filas = valores[0].str.cat(valores[1:], sep='\x1f')
+                partes.append(pd.DataFrame({
+                    'posicion': posiciones.values,
+                    'clave': claves.values,
+                    'hash': [zlib.crc32(fila.encode('utf-8')) for fila in filas],
+                }))
+        
+        huellas = pd.concat(partes, ignore_index=True) if partes else \
+            pd.DataFrame({'posicion': [], 'clave': [], 'hash': []}).astype({'posicion': 'int64', 'hash': 'int64'})
+        # Clave repetida en el CSV: en la tabla quedó la última (upsert)
+        huellas = huellas.drop_duplicates('clave', keep='last')
+        return huellas.sort_values('posicion', kind='stable', ignore_index=True), invalidas
+    
+    def _resumen_ramas_csv(self, posiciones, hashes, desde, ancho):
+        """Filas y suma de hashes por rama del rango, calculadas sobre el CSV"""
+        if len(posiciones) == 0:
+            return {}
+        ramas = (posiciones - desde) // ancho
+        inicio_rama = np.flatnonzero(np.r_[True, ramas[1:] != ramas[:-1]])
+        conteos = np.diff(np.r_[inicio_rama, len(ramas)])
+        sumas = np.add.reduceat(hashes, inicio_rama)
+        return {int(ramas[i]): (int(n), int(suma)) for i, n, suma in zip(inicio_rama, conteos, sumas)}
+    
+    def verificar_contra_csv(self, ruta_csv, nombre_tabla, clave_primaria, ramas=16, filas_por_hoja=1000):
+        """Compara la tabla con su CSV por rangos de clave (filas + suma de hashes) y baja solo a los rangos distintos"""
+        if not self.backend.verificacion_csv:
+            raise ValueError(f"La verificación contra el CSV no está disponible con {self.backend.nombre}")
+        
+        inicio = time.perf_counter()
+        tipos = self._columnas_y_tipos(nombre_tabla)
+        clave_entera = dict(tipos).get(clave_primaria) in TIPOS_ENTEROS
+        posicion, clave, hash_fila = self._sql_verificacion(tipos, clave_primaria, clave_entera)
+        
+        huellas, claves_invalidas = self._huellas_csv(ruta_csv, tipos, clave_primaria, clave_entera)
+        if claves_invalidas:
+            logger.warning(f"  {claves_invalidas} filas del CSV tienen '{clave_primaria}' vacía o inválida: no se comparan")
+        posiciones = huellas['posicion'].to_numpy()
+        hashes = huellas['hash'].to_numpy()
+        
+        cursor = self.connection.cursor()
+        consultas = 0
+        resultado = {'faltantes': [], 'sobrantes': [], 'distintas': []}
+        try:
+            if clave_entera:
+                cursor.execute(f"SELECT MIN({posicion}), MAX({posicion}) FROM `{nombre_tabla}`")
+                consultas += 1
+                minimo, maximo = cursor.fetchone()
+                extremos = [int(v) for v in (minimo, maximo) if v is not None]
+                if len(posiciones):
+                    extremos += [int(posiciones[0]), int(posiciones[-1])]
+                pendientes = [(min(extremos), max(extremos) + 1)] if extremos else []
             else:
-                # Si solo hay clave primaria, usar INSERT IGNORE
-                sql = f"""
-                    INSERT IGNORE INTO `{nombre_tabla}` ({cols_str})
-                    VALUES ({placeholders})
-                """
+                pendientes = [(0, 2 ** 32)]
             
-            # Convertir DataFrame a lista de tuplas (manejar NaN)
-            datos = [tuple(None if pd.isna(val) else val for val in row) 
-                     for row in df.values]
-            
-            # Ejecutar en lote
-            cursor.executemany(sql, datos)
-            filas_afectadas = cursor.rowcount
-            self.connection.commit()
+            while pendientes:
+                desde, hasta = pendientes.pop()
+                i, j = np.searchsorted(posiciones, [desde, hasta])
+                ancho = -(-(hasta - desde) // ramas)  # división redondeando hacia arriba
+                
+                cursor.execute(f"""
+                    SELECT ({posicion} - %s) DIV %s AS rama, COUNT(*), SUM({hash_fila})
+                    FROM `{nombre_tabla}`
+                    WHERE {posicion} >= %s AND {posicion} < %s
+                    GROUP BY rama
+                """, (desde, ancho, desde, hasta))
+                consultas += 1
+                en_tabla = {int(rama): (int(n), int(suma)) for rama, n, suma in cursor.fetchall()}
+                en_csv = self._resumen_ramas_csv(posiciones[i:j], hashes[i:j], desde, ancho)
+                
+                for rama in set(en_tabla) | set(en_csv):
+                    if en_tabla.get(rama) == en_csv.get(rama):
+                        continue
+                    rama_desde = desde + rama * ancho
+                    rama_hasta = min(rama_desde + ancho, hasta)
+                    filas = max(en_tabla.get(rama, (0, 0))[0], en_csv.get(rama, (0, 0))[0])
+                    if filas > filas_por_hoja and ancho > 1:
+                        pendientes.append((rama_desde, rama_hasta))
+                        continue
+                    
+                    # Hoja: se traen las claves y hashes del rango para ver qué filas difieren
+                    cursor.execute(f"""
+                        SELECT {clave}, {hash_fila} FROM `{nombre_tabla}`
+                        WHERE {posicion} >= %s AND {posicion} < %s
+                    """, (rama_desde, rama_hasta))
+                    consultas += 1
+                    tabla_hoja = dict(cursor.fetchall())
+                    a, b = np.searchsorted(posiciones, [rama_desde, rama_hasta])
+                    csv_hoja = dict(zip(huellas['clave'].values[a:b], hashes[a:b]))
+                    
+                    resultado['faltantes'] += [k for k in csv_hoja if k not in tabla_hoja]
+                    resultado['sobrantes'] += [k for k in tabla_hoja if k not in csv_hoja]
+                    resultado['distintas'] += [k for k in csv_hoja if k in tabla_hoja and tabla_hoja[k] != csv_hoja[k]]
+        finally:
+            cursor.close()
+        
+        resultado['claves_invalidas'] = claves_invalidas
+        resultado['coincide'] = not (resultado['faltantes'] or resultado['sobrantes'] or resultado['distintas']
+                                     or claves_invalidas)
+        resultado['consultas'] = consultas
+        duracion = time.perf_counter() - inicio
+        if resultado['coincide']:
+            logger.info(f" '{nombre_tabla}' coincide con el CSV ({len(huellas)} filas, {consultas} consultas, "
+                        f"{duracion:.2f}s)")
+        else:
+            logger.warning(f"  '{nombre_tabla}' difiere del CSV: {len(resultado['faltantes'])} faltantes, "
+                           f"{len(resultado['sobrantes'])} sobrantes, {len(resultado['distintas'])} distintas "
+                           f"({consultas} consultas, {duracion:.2f}s)")
+        return resultado
+    
+    @contextmanager
+    def modo_carga_masiva(self, nombre_tabla):
+        """Desactiva foreign_key_checks y difiere los índices secundarios no únicos mientras se carga la tabla"""
+        if not self.backend.carga_masiva:
+            logger.info(f" Modo carga masiva no aplica a {self.backend.nombre}, se importa normalmente")
+            yield
+            return
+        
+        cursor = self.connection.cursor()
+        indices = {}
+        completa = False
+        try:
+            # unique_checks queda activo y los índices únicos no se tocan: sin ellos ON DUPLICATE KEY UPDATE
+            # no vería las claves repetidas y el resultado de la carga sería otro
+            cursor.execute("SET SESSION foreign_key_checks = 0")
             
-            logger.info(f" Procesadas {len(datos)} filas en '{nombre_tabla}' ({filas_afectadas} afectadas)")
+            # Quitar los índices no únicos: se reconstruyen una sola vez al final
+            if self.tabla_existe(nombre_tabla):
+                for indice, (es_unico, columnas) in self._indices_secundarios(nombre_tabla).items():
+                    if es_unico:
+                        continue
+                    try:
+                        cursor.execute(f"ALTER TABLE `{nombre_tabla}` DROP INDEX `{indice}`")
+                        indices[indice] = columnas
+                    except Error as e:
+                        # Por ejemplo, un índice que usa una FOREIGN KEY: se deja como está
+                        logger.warning(f"  No se pudo diferir el índice '{indice}': {e}")
+            if indices:
+                logger.info(f" Índices diferidos en '{nombre_tabla}': {', '.join(indices)}")
             
-        except Exception as e:
-            self.connection.rollback()
-            logger.error(f" Error al insertar en '{nombre_tabla}': {e}")
-            raise
+            yield
+            completa = True
         finally:
-            cursor.close()
+            try:
+                cursor.execute("SET SESSION foreign_key_checks = 1")
+                
+                # Los índices no únicos se recrean aunque la importación haya fallado (no dependen de los datos);
+                # un error acá no tapa el de la importación
+                if indices:
+                    agregar = [f"ADD INDEX `{nombre}` ({', '.join(columnas)})" for nombre, columnas in indices.items()]
+                    inicio = time.perf_counter()
+                    try:
+                        cursor.execute(f"ALTER TABLE `{nombre_tabla}` {', '.join(agregar)}")
+                        logger.info(f" {len(agregar)} índices reconstruidos en '{nombre_tabla}' "
+                                    f"en {time.perf_counter() - inicio:.2f}s")
+                    except Error as e:
+                        logger.error(f" No se pudieron recrear los índices {', '.join(indices)} de '{nombre_tabla}': {e}")
+                        if completa:
+                            raise
+                
+                # Las FOREIGN KEY no se revisaron durante la carga: solo se validan si la importación terminó
+                if completa:
+                    violaciones = self.validar_integridad(nombre_tabla)
+                    if self._informe is not None:
+                        self._informe.violaciones = violaciones
+            finally:
+                cursor.close()
     
-    def importar_csv_completo(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla=True, limpiar_duplicados=False):
-        """Importa un CSV completo a una tabla MySQL"""
+    def importar_csv_completo(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla=True, limpiar_duplicados=False,
+                              tamano_bloque=None, usar_load_data=False, tamano_lote=None, incremental=False,
+                              descartar_duplicados_csv=False, pipeline=False, carga_masiva=False, reanudable=False):
+        """Importa un CSV completo a una tabla MySQL (por bloques si se indica tamano_bloque)"""
+        self._iniciar_informe(ruta_csv, nombre_tabla)
         try:
             logger.info(f"\n{'='*60}")
             logger.info(f" Procesando: {Path(ruta_csv).name}")
             logger.info(f" Tabla destino: {nombre_tabla}")
             logger.info(f" Clave primaria: {clave_primaria}")
             
-            # 1. Leer CSV
-            df = self.leer_csv(ruta_csv)
-            
-            # Verificar que existe la clave primaria
-            if clave_primaria not in df.columns:
-                raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
-                               f"Columnas disponibles: {list(df.columns)}")
-            
-            logger.info(f" Columnas: {list(df.columns)}")
-            
-            # 2. Crear tabla si no existe
-            if crear_tabla:
-                self.crear_tabla_desde_df(df, nombre_tabla, clave_primaria)
-            
-            # 3. Limpiar duplicados existentes (opcional)
-            if limpiar_duplicados:
-                self.limpiar_duplicados(nombre_tabla, clave_primaria)
-            
-            # 4. Insertar datos
-            self.insertar_datos_bulk(df, nombre_tabla, clave_primaria)
+            # Modo carga masiva: sin chequeos de unicidad/FK ni índices secundarios hasta el final
+            with self.modo_carga_masiva(nombre_tabla) if carga_masiva else nullcontext():
+                self._importar_segun_modo(ruta_csv, nombre_tabla, clave_primaria, crear_tabla, limpiar_duplicados,
+                                          tamano_bloque, usar_load_data, tamano_lote, incremental,
+                                          descartar_duplicados_csv, pipeline, reanudable)
             
             logger.info(f" Importación completada: {nombre_tabla}")
             return True
             
         except Exception as e:
             logger.error(f" Error al importar {ruta_csv}: {e}")
+            self._informe.error = str(e)
             return False
+        finally:
+            self._cerrar_informe()
+    
+    def _importar_segun_modo(self, ruta_csv, nombre_tabla, clave_primaria, crear_tabla, limpiar_duplicados,
+                             tamano_bloque, usar_load_data, tamano_lote, incremental, descartar_duplicados_csv,
+                             pipeline, reanudable=False):
+        """Elige el camino de importación según las opciones de importar_csv_completo"""
+        # Modo incremental: solo filas nuevas, modificadas o eliminadas desde la última vez
+        if incremental:
+            self.importar_csv_incremental(ruta_csv, nombre_tabla, clave_primaria, crear_tabla, tamano_lote,
+                                          limpiar_duplicados, descartar_duplicados_csv)
+            return
+        
+        # Camino rápido: LOAD DATA en staging + merge (si el servidor lo permite)
+        if usar_load_data:
+            if self._importar_con_load_data(ruta_csv, nombre_tabla, clave_primaria, crear_tabla,
+                                            limpiar_duplicados):
+                return
+            # La tabla ya fue creada y los duplicados todavía no se limpiaron
+            crear_tabla = False
+        
+        # Modo reanudable: checkpoint por bloque, si falla se retoma desde el último bloque confirmado
+        if reanudable:
+            self._importar_reanudable(ruta_csv, nombre_tabla, clave_primaria, crear_tabla, limpiar_duplicados,
+                                      tamano_bloque or 50000, tamano_lote, descartar_duplicados_csv)
+            return
+        
+        # Modo pipeline: un hilo lee y convierte mientras otro inserta
+        if pipeline:
+            self._importar_en_pipeline(ruta_csv, nombre_tabla, clave_primaria, crear_tabla,
+                                       limpiar_duplicados, tamano_bloque or 50000, tamano_lote,
+                                       descartar_duplicados_csv)
+            return
+        
+        # Modo streaming: lee, convierte e inserta bloque a bloque
+        if tamano_bloque:
+            self._importar_por_bloques(ruta_csv, nombre_tabla, clave_primaria, crear_tabla,
+                                       limpiar_duplicados, tamano_bloque, tamano_lote,
+                                       descartar_duplicados_csv)
+            return
+        
+        # 1. Leer CSV
+        df = self.leer_csv(ruta_csv)
+        
+        # Verificar que existe la clave primaria
+        if clave_primaria not in df.columns:
+            raise ValueError(f" La columna '{clave_primaria}' no existe en el CSV. "
+                           f"Columnas disponibles: {list(df.columns)}")
+        
+        logger.info(f" Columnas: {list(df.columns)}")
+        
+        # Quitar claves repetidas del CSV antes de enviarlas (opcional)
+        if descartar_duplicados_csv:
+            df = self.descartar_duplicados_df(df, clave_primaria)
+        
+        # 2. Crear tabla si no existe
+        if crear_tabla:
+            self.crear_tabla_desde_df(df, nombre_tabla, clave_primaria)
+        
+        # 3. Limpiar duplicados existentes (opcional)
+        if limpiar_duplicados:
+            self.limpiar_duplicados(nombre_tabla, clave_primaria)
+        
+        # 4. Insertar datos
+        self._insertar(df, nombre_tabla, clave_primaria, tamano_lote)
+
+def inferir_dependencias(archivos, carpeta):
+    """Deduce qué tablas dependen de cuáles a partir de las columnas id_* de cada CSV"""
+    lector = MySQLImporter(None, None, None, None)  # solo se usa para detectar el formato, no se conecta
+    tabla_por_pk = {clave_primaria: nombre_tabla for _, nombre_tabla, clave_primaria in archivos}
+    dependencias = {}
+    
+    for nombre_archivo, nombre_tabla, clave_primaria in archivos:
+        dependencias[nombre_tabla] = set()
+        ruta = Path(carpeta) / nombre_archivo
+        if not ruta.exists():
+            continue
+        
+        formato = lector.detectar_formato_csv(ruta)
+        columnas = pd.read_csv(ruta, nrows=0, **lector._opciones_lectura(formato, 'skip', 'c')).columns
+        
+        # Una columna id_x que es la PK de otra tabla indica una FK hacia esa tabla
+        for col in columnas:
+            padre = tabla_por_pk.get(col)
+            if col.startswith('id_') and col != clave_primaria and padre and padre != nombre_tabla:
+                dependencias[nombre_tabla].add(padre)
+    
+    return dependencias
+
+
+def ordenar_por_dependencias(archivos, carpeta, dependencias=None):
+    """Ordena la lista de archivos para que cada tabla se importe después de sus tablas padre (importación en serie)"""
+    if dependencias is None:
+        dependencias = inferir_dependencias(archivos, carpeta)
+    por_tabla = {nombre_tabla: (nombre_archivo, nombre_tabla, clave_primaria)
+                 for nombre_archivo, nombre_tabla, clave_primaria in archivos}
+    grafo = {t: [p for p in dependencias.get(t, ()) if p in por_tabla and p != t] for t in por_tabla}
+    try:
+        return [por_tabla[t] for t in TopologicalSorter(grafo).static_order()]
+    except CycleError as e:
+        logger.warning(f" Dependencias circulares: {' -> '.join(e.args[1])} - se importa en el orden de la lista")
+        return list(archivos)
+
+
+def _camino_critico(dependencias, duraciones):
+    """Duración de la cadena de dependencias más larga (límite inferior del tiempo total)"""
+    memo = {}
+    
+    def hasta(tabla):
+        if tabla not in memo:
+            padres = [p for p in dependencias.get(tabla, ()) if p in duraciones]
+            memo[tabla] = duraciones[tabla] + max((hasta(p) for p in padres), default=0)
+        return memo[tabla]
+    
+    return max((hasta(t) for t in duraciones), default=0)
+
+
+def _importar_tabla(pool, db_config, ruta_csv, nombre_tabla, clave_primaria, opciones, informes):
+    """Importa una tabla usando una conexión tomada del pool"""
+    importer = MySQLImporter(**db_config)
+    importer.connection = pool.get_connection()
+    try:
+        inicio = time.perf_counter()
+        exito = importer.importar_csv_completo(ruta_csv, nombre_tabla, clave_primaria, **opciones)
+        return exito, time.perf_counter() - inicio
+    finally:
+        informes.extend(importer.informes)
+        importer.connection.close()  # en una conexión de pool, close() la devuelve al pool
+
+
+def importar_en_paralelo(db_config, archivos, carpeta, trabajadores=4, dependencias=None, opciones=None,
+                         informes=None):
+    """Importa varias tablas en paralelo respetando el orden padre -> hijo"""
+    if db_config.get('motor', 'mysql') != 'mysql':
+        raise ValueError("La importación en paralelo solo está disponible con motor='mysql'")
+    opciones = opciones or {}
+    informes = [] if informes is None else informes  # acá se juntan los InformeImportacion de cada tabla
+    if dependencias is None:
+        dependencias = inferir_dependencias(archivos, carpeta)
+    
+    tablas = {nombre_tabla: (nombre_archivo, clave_primaria) for nombre_archivo, nombre_tabla, clave_primaria in archivos}
+    # Solo cuentan las dependencias entre tablas que se importan en esta ejecución
+    grafo = {t: {p for p in dependencias.get(t, ()) if p in tablas and p != t} for t in tablas}
+    pendientes = {t: set(padres) for t, padres in grafo.items()}
+    for tabla, padres in grafo.items():
+        if padres:
+            logger.info(f" {tabla} depende de: {', '.join(sorted(padres))}")
+    
+    pool = pooling.MySQLConnectionPool(
+        pool_name='importador',
+        pool_size=trabajadores,
+        host=db_config['host'],
+        user=db_config['user'],
+        password=db_config['password'],
+        database=db_config['database'],
+        port=db_config.get('port', 3306),
+        charset='utf8mb4',
+        autocommit=False,
+        allow_local_infile=db_config.get('permitir_local_infile', False)
+    )
+    
+    resultado = {}  # tabla -> True (importada) / False (falló o se saltó)
+    duraciones = {}
+    en_curso = {}
+    inicio = time.perf_counter()
+    
+    with ThreadPoolExecutor(max_workers=trabajadores) as ejecutor:
+        while pendientes or en_curso:
+            # Primero se saltean, en cadena, las tablas sin archivo o con un padre fallido: si una hija
+            # quedara esperando a un padre ya saltado, se confundiría con un ciclo de dependencias
+            saltadas = True
+            while saltadas:
+                saltadas = False
+                for tabla, padres in list(pendientes.items()):
+                    nombre_archivo = tablas[tabla][0]
+                    if any(resultado.get(p) is False for p in padres):
+                        logger.warning(f"  {tabla}: falló una tabla padre - SALTANDO")
+                    elif not (Path(carpeta) / nombre_archivo).exists():
+                        logger.warning(f"  Archivo no encontrado: {nombre_archivo} - SALTANDO")
+                    else:
+                        continue
+                    resultado[tabla] = False
+                    del pendientes[tabla]
+                    saltadas = True
+
+            for tabla, padres in list(pendientes.items()):
+                nombre_archivo, clave_primaria = tablas[tabla]
+                ruta = Path(carpeta) / nombre_archivo
+
+                if all(resultado.get(p) is True for p in padres):
+                    futuro = ejecutor.submit(_importar_tabla, pool, db_config, ruta, tabla, clave_primaria, opciones,
+                                             informes)
+                    en_curso[futuro] = tabla
+                    del pendientes[tabla]
+            
+            if not en_curso:
+                if pendientes:
+                    # Nada en curso y nada listo: hay un ciclo de dependencias
+                    logger.error(f" Dependencias circulares entre: {', '.join(sorted(pendientes))}")
+                    resultado.update({t: False for t in pendientes})
+                    pendientes.clear()
+                continue
+            
+            terminados, _ = wait(en_curso, return_when=FIRST_COMPLETED)
+            for futuro in terminados:
+                tabla = en_curso.pop(futuro)
+                try:
+                    resultado[tabla], duraciones[tabla] = futuro.result()
+                except Exception as e:
+                    logger.error(f" Error al importar {tabla}: {e}")
+                    resultado[tabla] = False
+    
+    total = time.perf_counter() - inicio
+    logger.info(f" Tiempo total: {total:.2f}s - camino crítico: {_camino_critico(grafo, duraciones):.2f}s "
+                f"- suma de tablas: {sum(duraciones.values()):.2f}s")
+    
+    exitosos = sum(1 for ok in resultado.values() if ok)
+    return exitosos, len(resultado) - exitosos
+
+
+def _imprimir_resumen(exitosos, fallidos):
+    print("\n" + "="*60)
+    print(" RESUMEN DE IMPORTACIÓN")
+    print("="*60)
+    print(f" Exitosos: {exitosos}")
+    print(f" Fallidos: {fallidos}")
+    print(f" Total procesados: {exitosos + fallidos}")
+    print("="*60 + "\n")
 
 
 def main():
@@ -304,7 +1953,10 @@ def main():
         'user': 'root',
         'password': '',
         'database': 'supermercado',
-        'port': 3306
+        'port': 3306,
+        'permitir_local_infile': True,  # necesario para USAR_LOAD_DATA
+        'tipos_compactos': False,  # True: tipos ajustados a los datos (TINYINT, DECIMAL(p,s), VARCHAR(n), DATE...)
+        'motor': 'mysql'  # 'sqlite' o 'duckdb': base embebida local, 'database' es la ruta del archivo (ej: 'supermercado.db')
     }
     
     # Carpeta donde están tus CSVs
@@ -312,13 +1964,20 @@ def main():
     
     # Lista de archivos CSV a importar
     # Formato: (nombre_archivo, nombre_tabla, clave_primaria)
+    # El orden no importa: cada tabla se importa después de sus tablas padre (ver DEPENDENCIAS)
     ARCHIVOS_A_IMPORTAR = [
-        ('clientes.csv', 'clientes', 'id_cliente'),
-        ('productos.csv', 'productos', 'id_producto'),
+        ('supermercado.csv', 'supermercado', 'id_cliente'),
+        ('provincia.csv', 'provincia', 'id_provincia'),
+        ('localidad.csv', 'localidad', 'id_localidad'),
+        ('sucursal.csv', 'sucursal', 'id_sucursal'),
         ('rubros.csv', 'rubros', 'id_rubro'),
+        ('producto.csv', 'producto', 'id_producto'),
+        ('cliente.csv', 'cliente', 'id_cliente'),  # después de supermercado.csv (misma PK): las FK id_cliente apuntan a cliente
+        ('cliente_mail.csv', 'cliente_mail', 'id_email'),
+        ('cliente_telefono.csv', 'cliente_telefono', 'id_tel'),
         ('venta.csv', 'venta', 'id_venta'),
-        ('supermercado.csv', 'supermercado', 'id'),
-        ('sucursal.csv' , 'sucursal', 'id_sucursal')
+        ('factura_enunciado.csv', 'factura_enunciado', 'id_factura'),
+        ('factura_detalle.csv', 'factura_detalle', 'id_detalle')
         # Agrega más archivos aquí siguiendo el mismo formato
     ]
     
@@ -328,12 +1987,75 @@ def main():
     # NUEVO: Limpiar duplicados antes de importar (poner True si ya hay datos duplicados)
     LIMPIAR_DUPLICADOS_EXISTENTES = True  # Cambiar a False después de la primera ejecución
     
+    # Descartar filas con clave repetida en el CSV antes de insertarlas
+    DESCARTAR_DUPLICADOS_CSV = False
+    
+    # Tamaño de bloque para archivos grandes (None = leer todo el archivo de una vez)
+    TAMANO_BLOQUE = None  # Ej: 50000 para importar en bloques con memoria constante
+    
+    # Pipeline: lee/convierte el próximo bloque mientras se inserta el actual (usa TAMANO_BLOQUE o 50000)
+    PIPELINE = False
+    
+    # Reanudable: guarda un checkpoint por bloque y, si se corta, retoma desde el último bloque confirmado
+    REANUDABLE = False
+    
+    # Carga masiva: sin foreign_key checks e índices no únicos recién al final (valida las FOREIGN KEY después)
+    CARGA_MASIVA = False
+    
+    # Carga rápida con LOAD DATA LOCAL INFILE (si el servidor no lo permite, usa INSERT por lotes)
+    USAR_LOAD_DATA = False
+    
+    # Filas por sentencia INSERT multi-fila (None = executemany de todo el archivo)
+    TAMANO_LOTE = None  # Ej: 1000; se reduce solo si no entra en max_allowed_packet
+    
+    # Importación incremental: saltea archivos sin cambios y envía solo las filas que cambiaron
+    INCREMENTAL = False
+    
+    # Verificar cada tabla importada contra su CSV (filas y hashes por rango de clave; solo con TRABAJADORES = 1)
+    VERIFICAR = False
+    
+    # Tablas importadas a la vez (1 = una por una con una sola conexión)
+    TRABAJADORES = 1
+    
+    # Dependencias entre tablas {hija: [padres]} (None = inferirlas de las columnas id_*)
+    DEPENDENCIAS = None  # Ej: {'localidad': ['provincia'], 'sucursal': ['localidad']}
+    
+    # Reporte JSON con tiempos, filas/s y memoria de cada etapa (None = no guardar)
+    INFORME_JSON = None  # Ej: 'informe_importacion.json'
+    
     # ==================== EJECUCIÓN ====================
     
     print("\n" + "="*60)
     print(" IMPORTADOR DE CSVs A MYSQL")
     print("="*60)
     
+    if TRABAJADORES > 1:
+        opciones = {
+            'crear_tabla': CREAR_TABLAS,
+            'limpiar_duplicados': LIMPIAR_DUPLICADOS_EXISTENTES,
+            'tamano_bloque': TAMANO_BLOQUE,
+            'usar_load_data': USAR_LOAD_DATA,
+            'tamano_lote': TAMANO_LOTE,
+            'incremental': INCREMENTAL,
+            'descartar_duplicados_csv': DESCARTAR_DUPLICADOS_CSV,
+            'pipeline': PIPELINE,
+            'carga_masiva': CARGA_MASIVA,
+            'reanudable': REANUDABLE
+        }
+        informes = []
+        try:
+            exitosos, fallidos = importar_en_paralelo(DB_CONFIG, ARCHIVOS_A_IMPORTAR, CARPETA_CSV,
+                                                      TRABAJADORES, DEPENDENCIAS, opciones, informes)
+        except Error as e:
+            logger.error(f" No se pudo crear el pool de conexiones: {e}")
+            return
+        _imprimir_resumen(exitosos, fallidos)
+        if INFORME_JSON:
+            with open(INFORME_JSON, 'w', encoding='utf-8') as f:
+                json.dump([informe.a_dict() for informe in informes], f, indent=2, ensure_ascii=False)
+        logger.info(" Proceso finalizado")
+        return
+    
     importer = MySQLImporter(**DB_CONFIG)
     
     # Conectar a la base de datos
@@ -345,8 +2067,9 @@ def main():
     exitosos = 0
     fallidos = 0
     
-    # Procesar cada archivo
-    for nombre_archivo, nombre_tabla, clave_primaria in ARCHIVOS_A_IMPORTAR:
+    # Procesar cada archivo, las tablas padre antes que sus hijas
+    for nombre_archivo, nombre_tabla, clave_primaria in ordenar_por_dependencias(ARCHIVOS_A_IMPORTAR, CARPETA_CSV,
+                                                                                 DEPENDENCIAS):
         ruta_completa = Path(CARPETA_CSV) / nombre_archivo
         
         # Verificar si el archivo existe
@@ -357,19 +2080,19 @@ def main():
         
         # Importar el CSV
         if importer.importar_csv_completo(ruta_completa, nombre_tabla, clave_primaria, 
-                                          CREAR_TABLAS, LIMPIAR_DUPLICADOS_EXISTENTES):
+                                          CREAR_TABLAS, LIMPIAR_DUPLICADOS_EXISTENTES, TAMANO_BLOQUE,
+                                          USAR_LOAD_DATA, TAMANO_LOTE, INCREMENTAL,
+                                          DESCARTAR_DUPLICADOS_CSV, PIPELINE, CARGA_MASIVA, REANUDABLE):
             exitosos += 1
+            if VERIFICAR:
+                importer.verificar_contra_csv(ruta_completa, nombre_tabla, clave_primaria)
         else:
             fallidos += 1
     
     # Resumen final
-    print("\n" + "="*60)
-    print(" RESUMEN DE IMPORTACIÓN")
-    print("="*60)
-    print(f" Exitosos: {exitosos}")
-    print(f" Fallidos: {fallidos}")
-    print(f" Total procesados: {exitosos + fallidos}")
-    print("="*60 + "\n")
+    _imprimir_resumen(exitosos, fallidos)
+    if INFORME_JSON:
+        importer.guardar_informe(INFORME_JSON)
     
     # Cerrar conexión
     importer.desconectar()
@@ -0,0 +1,277 @@
+# Registros de un CSV cargado en un DataFrame, compartido por los dos editores
+# (Proyecto_de_a_un_CSV.py y Proyecto_Final_variosCSV.py): índice por clave primaria,
+# filas eliminadas marcadas, filas insertadas pendientes y el modo por lotes.
+# El estado es del módulo (un editor tiene un solo archivo abierto a la vez); se usa como registros.INDICE, etc.
+
+import io
+import itertools
+import json
+
+import pandas as pd
+
+# --- Índice por clave primaria ---
+# La columna id_* se indexa una sola vez al cargar (valor -> posición de la fila), así buscar, modificar
+# y eliminar por clave no recorren la tabla. Las filas eliminadas se marcan en BORRADAS y se quitan
+# del DataFrame de una sola vez al guardar, en lugar de copiar la tabla entera en cada eliminación.
+CLAVE = None
+INDICE = {}
+BORRADAS = set()
+
+
+def columna_clave(df):
+    for col in df.columns:
+        if str(col).startswith("id_"):
+            return col
+    return df.columns[0] if len(df.columns) else None
+
+
+def construir_indice(df):
+    global CLAVE
+    CLAVE = columna_clave(df)
+    INDICE.clear()
+    BORRADAS.clear()
+    PENDIENTES.clear()
+    if CLAVE is not None:
+        INDICE.update(zip(map(str, df[CLAVE].tolist()), range(len(df))))
+        repetidas = len(df) - len(INDICE)
+        if repetidas:
+            print(f"Atención: {repetidas} filas repiten el {CLAVE}; se usa la última de cada una.")
+
+
+def indexar(claves, inicio):
+    # Las filas nuevas van al final del DataFrame, así que su posición se conoce antes de agregarlas
+    INDICE.update(zip((str(clave) for clave in claves), range(inicio, inicio + len(claves))))
+
+
+def buscar_registro(clave):
+    posicion = INDICE.get(clave)
+    if posicion is None:
+        print(f"No hay ningún registro con {CLAVE} = {clave}.")
+    return posicion
+
+
+def modificar_por_clave(df, clave, cambios):
+    posicion = INDICE[clave]
+    for col, valor in cambios.items():
+        asignar_columna(df, col, pd.Series({posicion: valor}, dtype=object))
+    if CLAVE in cambios and str(cambios[CLAVE]) != clave:
+        del INDICE[clave]
+        INDICE[str(cambios[CLAVE])] = posicion
+
+
+def eliminar_por_clave(clave):
+    BORRADAS.add(INDICE.pop(clave))
+
+
+def quitar_borradas(df):
+    if not BORRADAS:
+        return df
+    df = df.drop(index=list(BORRADAS)).reset_index(drop=True)
+    construir_indice(df)  # las posiciones cambiaron
+    return df
+
+
+# --- Tipos de las columnas ---
+# Lo que se escribe en la consola llega como texto: antes de juntarlo con la tabla se lleva al tipo de
+# cada columna, así una columna numérica no pasa a ser de texto (y las comparaciones de los lotes siguen andando).
+
+def enteros_con_nulos(df):
+    # pandas lee como float una columna de enteros con celdas vacías y al guardar quedaría 1.0, 2.0...:
+    # se pasa a Int64, que admite nulos
+    for col in df.columns:
+        valores = df[col]
+        if pd.api.types.is_float_dtype(valores) and valores.isna().any() and (valores.dropna() % 1 == 0).all():
+            df[col] = valores.astype("Int64")
+    return df
+
+
+def es_numerica(serie):
+    # pandas cuenta las booleanas como numéricas
+    return pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)
+
+
+def convertir_filas(df, nuevos):
+    # Convierte las columnas de `nuevos` (todas o algunas de las de df) a los tipos de df. Devuelve las filas
+    # convertidas y, por columna, qué valores no son un número en una columna numérica (vacío es un nulo válido).
+    nuevos = nuevos.copy()
+    invalidos = pd.DataFrame(False, index=nuevos.index, columns=nuevos.columns)
+    for col in nuevos.columns:
+        if es_numerica(df[col]):
+            valores = nuevos[col].astype(object)
+            vacios = valores.isna() | (valores.astype(str).str.strip() == "")
+            numeros = pd.to_numeric(valores.mask(vacios), errors="coerce")
+            invalidos[col] = numeros.isna() & ~vacios
+            if pd.api.types.is_integer_dtype(df[col]) and (numeros.dropna() % 1 == 0).all():
+                # Nulos en una columna de enteros: Int64 los admite sin pasar a float (se guardaría 1.0, 2.0...)
+                numeros = numeros.astype(df[col].dtype if numeros.notna().all() else "Int64")
+            nuevos[col] = numeros
+        elif pd.api.types.is_string_dtype(df[col]):
+            nuevos[col] = nuevos[col].astype(df[col].dtype)
+    return nuevos, invalidos
+
+
+def columnas_invalidas(df, valores):
+    # Columnas numéricas en las que un registro (columna -> valor) trae algo que no es un número
+    _, invalidos = convertir_filas(df, pd.DataFrame([valores]))
+    return [col for col in invalidos.columns if invalidos.at[0, col]]
+
+
+def asignar_columna(df, col, valores):
+    # Todas las modificaciones de una columna en una sola asignación (valores: posición -> valor ya validado)
+    valores = convertir_filas(df, valores.to_frame(col))[0][col]
+    if pd.api.types.is_integer_dtype(df[col]) and pd.api.types.is_float_dtype(valores):
+        df[col] = df[col].astype("float64")  # decimales en una columna de enteros
+    elif valores.dtype == "Int64" and df[col].dtype != "Int64":
+        df[col] = df[col].astype("Int64")  # nulos en una columna de enteros
+    try:
+        df.loc[valores.index, col] = valores
+    except TypeError:
+        df[col] = df[col].astype(object)  # p. ej. texto en una columna booleana
+        df.loc[valores.index, col] = valores
+
+
+# --- Inserciones ---
+# Filas insertadas que todavía no se agregaron al DataFrame: se juntan en una lista (agregar al final
+# de una lista no copia nada) y se pasan al DataFrame de una sola vez al mostrar, modificar, eliminar o guardar
+PENDIENTES = []
+
+
+def agregar_pendientes(df):
+    if not PENDIENTES:
+        return df
+    nuevos, _ = convertir_filas(df, pd.DataFrame(PENDIENTES, columns=df.columns))  # ya validadas al insertarlas
+    PENDIENTES.clear()
+    return pd.concat([df, nuevos], ignore_index=True)
+
+
+def leer_filas(columnas):
+    # Filas nuevas desde un archivo CSV o pegadas en la consola (None si no hay nada para insertar)
+    origen = input("Ruta de un archivo CSV (Enter para pegar las filas): ").strip()
+    try:
+        if origen:
+            nuevos = pd.read_csv(origen)
+            faltan = [col for col in columnas if col not in nuevos.columns]
+            if faltan:
+                print(f"Al archivo le faltan las columnas: {faltan}")
+                return None
+            return nuevos[columnas]
+        print(f"Pegue las filas ({', '.join(columnas)}) separadas por comas y termine con una línea vacía:")
+        lineas = []
+        while True:
+            linea = input()
+            if linea.strip() == "":
+                break
+            lineas.append(linea)
+        if lineas and [valor.strip() for valor in lineas[0].split(",")] == columnas:
+            lineas = lineas[1:]  # se pegó también el encabezado
+        if not lineas:
+            print("No se ingresaron filas.")
+            return None
+        return pd.read_csv(io.StringIO("\n".join(lineas)), header=None, names=columnas)
+    except (OSError, pd.errors.ParserError) as e:
+        print(f"No se pudieron leer las filas: {e}")
+        return None
+
+
+def claves_vacias(nuevos):
+    # Filas sin clave (nula o en blanco): no se podrían buscar, modificar ni eliminar
+    claves = nuevos[CLAVE]
+    return claves.isna() | (claves.astype(str).str.strip() == "")
+
+
+def claves_repetidas(nuevos):
+    # Filas cuya clave ya está en la tabla o se repite entre las nuevas
+    claves = nuevos[CLAVE].astype(str)
+    return pd.Series([clave in INDICE for clave in claves], index=claves.index) | claves.duplicated()
+
+
+def insertar_filas(df, nuevos):
+    # Agrega un DataFrame de filas nuevas (sin claves repetidas) de una sola vez
+    df = agregar_pendientes(df)
+    # Se vuelven a convertir sin las filas descartadas: sus nulos habían pasado las columnas enteras a Int64
+    nuevos, _ = convertir_filas(df, nuevos)
+    indexar(nuevos[CLAVE].tolist(), len(df))
+    return pd.concat([df, nuevos], ignore_index=True)
+
+
+# --- Modo por lotes (sin menú) ---
+# Una operación JSON por línea:
+#   {"op": "insertar", "fila": {"id_producto": 10, "nombre": "Yerba"}}
+#   {"op": "modificar", "clave": 10, "cambios": {"precio": 1500}}
+#   {"op": "eliminar", "clave": 10}
+#   {"op": "eliminar", "donde": "precio <= 0"}   (condición de DataFrame.eval)
+# Se aplican en el orden del archivo; las operaciones seguidas del mismo tipo se aplican juntas (una sola
+# concatenación para las inserciones, una asignación por columna para las modificaciones).
+
+def leer_lote(ruta_lote):
+    with open(ruta_lote, "r", encoding="utf-8") as f:
+        return [json.loads(linea) for linea in f if linea.strip()]
+
+
+def aplicar_lote(df, operaciones):
+    desconocidas = {op.get("op") for op in operaciones} - {"insertar", "modificar", "eliminar"}
+    if desconocidas:
+        raise ValueError(f"operaciones desconocidas: {desconocidas}")
+    columnas = {col for op in operaciones if op["op"] == "modificar" for col in op["cambios"]}
+    if columnas - set(df.columns) or CLAVE in columnas:
+        raise ValueError(f"solo se pueden modificar columnas existentes y no la clave: {sorted(columnas)}")
+    resumen = {"insertadas": 0, "modificadas": 0, "eliminadas": len(BORRADAS), "repetidas": 0, "no_encontradas": 0,
+               "invalidas": 0}
+    modificadas = set()
+
+    # Tramos de operaciones seguidas del mismo tipo: eliminar y volver a insertar una clave, o insertar
+    # y después eliminar con una condición, da lo mismo que aplicarlas de a una
+    for tipo, tramo in itertools.groupby(operaciones, key=lambda op: op["op"]):
+        tramo = list(tramo)
+        if tipo == "insertar":
+            nuevos, invalidos = convertir_filas(df, pd.DataFrame([op["fila"] for op in tramo], columns=df.columns))
+            invalidas = invalidos.any(axis=1) | claves_vacias(nuevos)
+            repetidas = claves_repetidas(nuevos) & ~invalidas
+            nuevos = nuevos[~(repetidas | invalidas)]
+            df = insertar_filas(df, nuevos)
+            resumen["insertadas"] += len(nuevos)
+            resumen["repetidas"] += int(repetidas.sum())
+            resumen["invalidas"] += int(invalidas.sum())
+
+        elif tipo == "modificar":
+            _, invalidos = convertir_filas(df, pd.DataFrame([op["cambios"] for op in tramo]))
+            invalidas = invalidos.any(axis=1).tolist()
+            resumen["invalidas"] += sum(invalidas)
+            por_columna = {}  # columna -> {posición: valor}; si una clave se modifica varias veces, gana la última
+            for op, invalida in zip(tramo, invalidas):
+                if invalida:
+                    continue
+                posicion = INDICE.get(str(op["clave"]))
+                if posicion is None:
+                    resumen["no_encontradas"] += 1
+                    continue
+                modificadas.add(posicion)
+                for col, valor in op["cambios"].items():
+                    por_columna.setdefault(col, {})[posicion] = valor
+            for col, valores in por_columna.items():
+                asignar_columna(df, col, pd.Series(valores, dtype=object))
+
+        else:
+            mascara = pd.Series(False, index=df.index)
+            for op in tramo:
+                if "donde" in op:
+                    cumple = df.eval(op["donde"])
+                    if not pd.api.types.is_bool_dtype(cumple):
+                        raise ValueError(f"la condición '{op['donde']}' no da verdadero/falso por fila")
+                    mascara |= cumple
+                elif str(op["clave"]) in INDICE:
+                    eliminar_por_clave(str(op["clave"]))
+                else:
+                    resumen["no_encontradas"] += 1
+            # Se marcan las posiciones que cumplen, no las claves: si el CSV repite una clave, solo la última
+            # fila está en el índice y las otras también tienen que poder borrarse
+            mascara[list(BORRADAS)] = False
+            posiciones = set(mascara.index[mascara])
+            for clave in set(df.loc[mascara, CLAVE].astype(str)):
+                if INDICE.get(clave) in posiciones:
+                    del INDICE[clave]
+            BORRADAS.update(posiciones)
+
+    resumen["modificadas"] = len(modificadas)
+    resumen["eliminadas"] = len(BORRADAS) - resumen["eliminadas"]
+    return df, resumen
@@ -0,0 +1,5 @@
+# Los módulos de Proyecto_1 se importan por nombre (como cuando se ejecutan los scripts desde la carpeta)
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
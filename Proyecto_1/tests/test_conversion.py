@@ -0,0 +1,46 @@
+# Modo streaming de Proyecto1_csv_json con columnas que cambian de tipo después del primer bloque
+import importlib
+import json
+
+import pandas as pd
+import pyarrow.feather
+import pyarrow.parquet
+
+
+def preparar(tmp_path, monkeypatch):
+    # El módulo crea sus carpetas al importarse: se importa parado en tmp_path para no ensuciar el repo
+    monkeypatch.chdir(tmp_path)
+    c = importlib.import_module("Proyecto1_csv_json")
+    monkeypatch.setattr(c, "CARPETA_SUPER", str(tmp_path))
+    monkeypatch.setattr(c, "SALIDAS", {formato: (str(tmp_path / formato), extension)
+                                       for formato, (_, extension) in c.SALIDAS.items()})
+    for formato in c.SALIDAS:
+        (tmp_path / formato).mkdir()
+    return c
+
+
+def test_streaming_con_tipo_que_cambia_despues_del_primer_bloque(tmp_path, monkeypatch):
+    c = preparar(tmp_path, monkeypatch)
+    filas = ["id_cliente,codigo_postal,fecha,saldo"]
+    filas += [f"{i},{1800 + i},2025-08-{1 + i % 28:02d},{i}" for i in range(1, 11)]
+    filas += ["11,B1870,01/09/2025,10.5", "12,1900,2025-09-02,12"]
+    (tmp_path / "cliente.csv").write_text("\n".join(filas) + "\n", encoding="utf-8")
+
+    formatos = ["excel", "json", "csv", "parquet", "feather", "arrow"]
+    tiempos, errores = c.convertir_por_bloques("cliente.csv", formatos, tamano_bloque=4)
+
+    assert errores == {}
+    assert sorted(tiempos) == sorted(formatos)
+    for tabla in (pyarrow.parquet.read_table(tmp_path / "parquet" / "cliente.parquet"),
+                  pyarrow.feather.read_table(tmp_path / "feather" / "cliente.feather"),
+                  pyarrow.feather.read_table(tmp_path / "arrow" / "cliente.arrow")):
+        datos = tabla.to_pydict()
+        assert datos["id_cliente"] == list(range(1, 13))
+        assert datos["codigo_postal"][0] == "1801" and datos["codigo_postal"][10] == "B1870"
+        # La fecha que no es ISO queda como texto, no como nulo
+        assert datos["fecha"][0] == "2025-08-02" and datos["fecha"][10] == "01/09/2025"
+        assert datos["saldo"][10] == 10.5 and datos["saldo"][0] == 1
+    registros = json.loads((tmp_path / "json" / "cliente.json").read_text(encoding="utf-8"))
+    assert len(registros) == 12 and registros[10]["codigo_postal"] == "B1870"
+    assert len(pd.read_csv(tmp_path / "csv" / "cliente.csv")) == 12
+    assert not list(tmp_path.glob("*/*.tmp*"))
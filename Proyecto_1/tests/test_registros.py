@@ -0,0 +1,61 @@
+# Índice, conversión de tipos y modo por lotes de registros.py (el núcleo de los dos editores)
+import io
+
+import pandas as pd
+
+import registros
+
+
+def tabla():
+    df = pd.read_csv(io.StringIO("id_producto,nombre,stock,precio\n1,Yerba,10,1500.5\n2,Azúcar,20,900\n"
+                                 "3,Arroz,30,700\n"))
+    registros.construir_indice(df)
+    return df
+
+
+def como_csv(df):
+    return df.to_csv(index=False).splitlines()
+
+
+def test_insertar_con_entero_vacio_no_pasa_la_columna_a_float():
+    df = tabla()
+    df = registros.aplicar_lote(df, [{"op": "insertar", "fila": {"id_producto": 4, "nombre": "Fideos",
+                                                                "precio": 500}}])[0]
+    assert df["stock"].dtype == "Int64"
+    assert como_csv(df)[1:] == ["1,Yerba,10,1500.5", "2,Azúcar,20,900.0", "3,Arroz,30,700.0", "4,Fideos,,500.0"]
+
+
+def test_modificar_con_entero_vacio_y_con_decimales():
+    df = tabla()
+    df = registros.aplicar_lote(df, [{"op": "modificar", "clave": 2, "cambios": {"stock": ""}}])[0]
+    assert df["stock"].dtype == "Int64" and como_csv(df)[2] == "2,Azúcar,,900.0"
+    # Un decimal de verdad sí pasa la columna a float
+    df = registros.aplicar_lote(df, [{"op": "modificar", "clave": 3, "cambios": {"stock": 2.5}}])[0]
+    assert df["stock"].dtype == "float64" and df.at[2, "stock"] == 2.5
+
+
+def test_al_volver_a_cargar_los_enteros_con_vacios_siguen_enteros():
+    df = registros.enteros_con_nulos(pd.read_csv(io.StringIO("id_producto,stock,precio\n1,10,1.5\n2,,\n3,7,2.0\n")))
+    assert df["stock"].dtype == "Int64" and df["precio"].dtype == "float64"
+    assert como_csv(df)[1:] == ["1,10,1.5", "2,,", "3,7,2.0"]
+
+
+def test_lote_rechaza_inserciones_sin_clave_y_la_clave_sigue_entera():
+    df = tabla()
+    df, resumen = registros.aplicar_lote(df, [
+        {"op": "insertar", "fila": {"nombre": "Sal", "stock": 5, "precio": 300}},
+        {"op": "insertar", "fila": {"id_producto": "  ", "nombre": "Té", "stock": 1, "precio": 200}},
+        {"op": "insertar", "fila": {"id_producto": 4, "nombre": "Café", "stock": 2, "precio": 800}},
+    ])
+    assert resumen["insertadas"] == 1 and resumen["invalidas"] == 2
+    assert df["id_producto"].dtype == "int64"
+    assert [fila.split(",")[0] for fila in como_csv(df)[1:]] == ["1", "2", "3", "4"]
+
+
+def test_eliminar_por_condicion_con_claves_repetidas():
+    df = pd.read_csv(io.StringIO("id_producto,stock\n1,0\n2,5\n1,0\n3,0\n2,8\n"))
+    registros.construir_indice(df)
+    df, resumen = registros.aplicar_lote(df, [{"op": "eliminar", "donde": "stock == 0"}])
+    assert resumen["eliminadas"] == 3
+    assert registros.quitar_borradas(df).to_dict("list") == {"id_producto": [2, 2], "stock": [5, 8]}
+    assert registros.INDICE == {"2": 1}
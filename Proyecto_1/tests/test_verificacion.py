@@ -0,0 +1,89 @@
+# verificar_contra_csv sin servidor: un cursor falso responde las consultas con las filas del mismo CSV,
+# agrupando por rama con la aritmética de MySQL (DIV entero; "/" da un DECIMAL redondeado a 4 decimales)
+import math
+from decimal import Decimal, ROUND_HALF_UP
+
+from python_sql_union import MySQLImporter
+
+TIPOS = [('id_producto', 'int'), ('nombre', 'varchar'), ('precio', 'int')]
+
+
+class CursorFalso:
+    def __init__(self, filas):
+        self.filas = filas  # [(posicion, clave, hash)] tal como quedaron en la tabla
+        self.resultado = []
+
+    def execute(self, sql, params=()):
+        if 'information_schema' in sql:
+            self.resultado = TIPOS
+        elif 'MIN(' in sql:
+            posiciones = [p for p, _, _ in self.filas]
+            self.resultado = [(min(posiciones), max(posiciones))]
+        elif 'GROUP BY rama' in sql:
+            desde, ancho, _, hasta = params
+            ramas = {}
+            for p, _, h in self.filas:
+                if desde <= p < hasta:
+                    if ' DIV ' in sql:
+                        rama = (p - desde) // ancho
+                    else:
+                        cociente = (Decimal(p - desde) / Decimal(ancho)).quantize(Decimal('0.0001'), ROUND_HALF_UP)
+                        rama = math.floor(cociente)
+                    n, suma = ramas.get(rama, (0, 0))
+                    ramas[rama] = (n + 1, suma + h)
+            self.resultado = [(rama, n, suma) for rama, (n, suma) in ramas.items()]
+        else:
+            desde, hasta = params
+            self.resultado = [(k, h) for p, k, h in self.filas if desde <= p < hasta]
+
+    def fetchone(self):
+        return self.resultado[0]
+
+    def fetchall(self):
+        return list(self.resultado)
+
+    def close(self):
+        pass
+
+
+class ConexionFalsa:
+    def __init__(self, filas):
+        self.filas = filas
+
+    def cursor(self):
+        return CursorFalso(self.filas)
+
+
+def test_tabla_igual_al_csv_no_baja_a_las_hojas(tmp_path):
+    # 700000 claves repartidas en 16 ramas de 43750: no es múltiplo del ancho, y hay filas justo antes
+    # de cada borde de rama, donde el cociente redondeado a 4 decimales ya da la rama siguiente
+    ancho = -(-700000 // 16)
+    claves = sorted(set(range(1, 700001, 997)) | {1 + k * ancho - 1 for k in range(1, 16)} | {700000})
+    ruta = tmp_path / 'producto.csv'
+    ruta.write_text('id_producto,nombre,precio\n' + ''.join(f'{k},p{k},{k % 500}\n' for k in claves))
+
+    importador = MySQLImporter('localhost', 'root', '', 'supermercado')
+    huellas, _ = importador._huellas_csv(ruta, TIPOS, 'id_producto', True)
+    importador.connection = ConexionFalsa(list(zip(huellas['posicion'], huellas['clave'], huellas['hash'])))
+
+    resultado = importador.verificar_contra_csv(ruta, 'producto', 'id_producto', filas_por_hoja=10)
+
+    assert resultado['coincide']
+    assert resultado['consultas'] == 2  # MIN/MAX y un solo nivel de ramas
+
+
+def test_fila_distinta_se_encuentra(tmp_path):
+    claves = range(1, 50001, 7)
+    ruta = tmp_path / 'producto.csv'
+    ruta.write_text('id_producto,nombre,precio\n' + ''.join(f'{k},p{k},{k % 500}\n' for k in claves))
+
+    importador = MySQLImporter('localhost', 'root', '', 'supermercado')
+    huellas, _ = importador._huellas_csv(ruta, TIPOS, 'id_producto', True)
+    filas = list(zip(huellas['posicion'], huellas['clave'], huellas['hash']))
+    filas[100] = (filas[100][0], filas[100][1], filas[100][2] + 1)
+    importador.connection = ConexionFalsa(filas)
+
+    resultado = importador.verificar_contra_csv(ruta, 'producto', 'id_producto', filas_por_hoja=10)
+
+    assert resultado['distintas'] == [filas[100][1]]
+    assert not resultado['faltantes'] and not resultado['sobrantes']
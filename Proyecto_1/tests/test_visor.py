@@ -0,0 +1,24 @@
+# visor_csv cuando el índice en segundo plano no se puede armar
+import visor_csv
+
+
+def test_sin_indice_avanza_desde_la_ultima_fila_conocida(tmp_path, monkeypatch, capsys):
+    ruta = tmp_path / "venta.csv"
+    ruta.write_text("id_venta,total\n" + "".join(f"{i},{i * 10}\n" for i in range(2500)), encoding="utf-8")
+
+    def falla(self):
+        raise MemoryError("sin memoria")
+    monkeypatch.setattr(visor_csv.VisorCSV, "_indexar", falla)
+
+    visor = visor_csv.VisorCSV(str(ruta))
+    try:
+        assert visor.leer(0, 20)["id_venta"].tolist() == list(range(20))
+        assert visor.leer(1500, 3)["id_venta"].tolist() == [1500, 1501, 1502]
+        assert visor.leer(1490, 2)["total"].tolist() == [14900, 14910]
+        assert visor.buscar_clave("2100") == 2100
+        assert visor.buscar_clave("9999") is None
+        assert len(visor.leer(3000, 20)) == 0
+    finally:
+        visor.cerrar()
+    assert capsys.readouterr().out.count("No se pudo armar el índice (sin memoria)") == 1
+    assert not (tmp_path / "venta.csv.indice.npz").exists()
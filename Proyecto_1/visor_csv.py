@@ -0,0 +1,298 @@
+# Visor paginado para CSV muy grandes: el archivo no se carga en memoria.
+# Una sola pasada arma un índice con la posición (en bytes) de cada PASO filas y el mínimo/máximo
+# de la clave en cada tramo; se guarda al lado del CSV (archivo.csv.indice.npz) y se reutiliza
+# mientras el CSV no cambie. Cada página se lee del archivo mapeado en memoria (mmap) y se parsea sola.
+
+import io
+import itertools
+import mmap
+import os
+import sys
+import threading
+import time
+
+import numpy as np
+import pandas as pd
+
+# Filas por tramo del índice (para llegar a una fila se saltean como mucho PASO - 1 filas)
+PASO = 1000
+
+# Bytes que se revisan por vuelta al armar el índice
+TAMANO_VENTANA = 16 * 1024 * 1024
+
+FILAS_POR_PAGINA = 20
+
+SALTO, COMILLA = ord("\n"), ord('"')
+
+
+def ruta_indice(ruta):
+    return ruta + ".indice.npz"
+
+
+def huella(ruta):
+    # Identifica la versión del CSV para la que se armó el índice
+    info = os.stat(ruta)
+    return np.array([info.st_size, info.st_mtime_ns], dtype=np.int64)
+
+
+def columna_clave(columnas):
+    for col in columnas:
+        if str(col).startswith("id_"):
+            return col
+    return columnas[0]
+
+
+def fines_de_fila(datos):
+    """Posiciones de los saltos de línea que terminan una fila (los que están entre comillas no cuentan)"""
+    saltos = np.flatnonzero(datos == SALTO)
+    comillas = np.flatnonzero(datos == COMILLA)
+    if len(comillas):
+        saltos = saltos[np.searchsorted(comillas, saltos) % 2 == 0]
+    return saltos
+
+
+def avanzar(mm, inicio, filas):
+    """Byte donde empieza la fila que está `filas` filas después de la que empieza en `inicio`"""
+    ventana = 64 * 1024
+    while filas > 0 and inicio < len(mm):
+        fin = min(inicio + ventana, len(mm))
+        fines = fines_de_fila(np.frombuffer(mm, np.uint8, fin - inicio, inicio))
+        if len(fines) >= filas:
+            return inicio + int(fines[filas - 1]) + 1
+        if fin == len(mm):
+            return len(mm)  # la última fila no termina en salto de línea
+        if len(fines) == 0:
+            ventana *= 2  # una sola fila más larga que la ventana
+            continue
+        filas -= len(fines)
+        inicio += int(fines[-1]) + 1
+    return inicio
+
+
+class VisorCSV:
+    """Lee páginas de un CSV por número de fila o por clave sin cargar el archivo"""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.archivo = open(ruta, "rb")
+        self.mm = mmap.mmap(self.archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        self.inicio_datos = avanzar(self.mm, 0, 1)
+        self.encabezado = self.mm[:self.inicio_datos]
+        self.columnas = list(pd.read_csv(io.BytesIO(self.encabezado), nrows=0).columns)
+        self.clave = columna_clave(self.columnas)
+        self.conocidas = {0: self.inicio_datos}  # fila -> byte donde empieza (páginas ya vistas)
+
+        self.filas = None
+        self.posiciones = self.minimos = self.maximos = None
+        self.error = None  # por qué no se pudo armar el índice (se avisa una sola vez)
+        self.listo = threading.Event()
+        self.detener = threading.Event()
+        # El índice se arma en segundo plano: la primera página no lo necesita
+        self.indexador = threading.Thread(target=self._cargar_o_indexar, daemon=True)
+        self.indexador.start()
+
+    def _cargar_o_indexar(self):
+        try:
+            with np.load(ruta_indice(self.ruta)) as guardado:
+                if np.array_equal(guardado["huella"], huella(self.ruta)) and int(guardado["paso"]) == PASO:
+                    self.filas = int(guardado["filas"])
+                    self.posiciones = guardado["posiciones"]
+                    if "minimos" in guardado:
+                        self.minimos, self.maximos = guardado["minimos"], guardado["maximos"]
+                    self.listo.set()
+                    return
+        except (OSError, KeyError, ValueError):
+            pass  # no hay índice o es de otra versión
+        try:
+            if self._indexar():
+                self._guardar_indice()
+        except Exception as e:  # sin índice el visor sigue andando: avanza desde las páginas ya vistas
+            self.error = e
+        finally:
+            self.listo.set()  # aunque falle, quien espera el índice no queda colgado
+
+    def _indexar(self):
+        """Una pasada por el archivo: posición de cada PASO filas y mínimo/máximo de la clave por tramo"""
+        mm = self.mm
+        numero_clave = self.columnas.index(self.clave)
+        posiciones, zonas = [], []
+        numerica = None
+        fila, inicio, ventana = 0, self.inicio_datos, TAMANO_VENTANA
+        while inicio < len(mm):
+            if self.detener.is_set():
+                return False
+            fin = min(inicio + ventana, len(mm))
+            fines = fines_de_fila(np.frombuffer(mm, np.uint8, fin - inicio, inicio))
+            if fin == len(mm) and (len(fines) == 0 or fines[-1] != fin - inicio - 1):
+                fines = np.append(fines, fin - inicio - 1)  # última fila sin salto de línea al final
+            if len(fines) == 0:
+                ventana *= 2
+                continue
+
+            numeros = fila + np.arange(len(fines))
+            arranques = inicio + np.concatenate(([0], fines[:-1] + 1))
+            posiciones.append(arranques[numeros % PASO == 0])
+
+            # La columna clave de las filas de esta ventana (ya está en memoria: no se vuelve a leer el archivo)
+            if zonas is not None:
+                try:
+                    claves = pd.read_csv(io.BytesIO(mm[inicio:inicio + int(fines[-1]) + 1]), header=None,
+                                         usecols=[numero_clave], skip_blank_lines=False)[numero_clave]
+                except (pd.errors.ParserError, ValueError):
+                    claves = None
+                if numerica is None and claves is not None:
+                    numerica = pd.api.types.is_numeric_dtype(claves)
+                if claves is not None and len(claves) == len(fines):
+                    claves = pd.to_numeric(claves, errors="coerce") if numerica else claves.astype(str)
+                    zonas.append(claves.groupby(numeros // PASO).agg(["min", "max"]))
+                else:
+                    zonas = None  # filas que pandas no puede leer o cuenta distinto: se busca recorriendo todo
+
+            fila += len(fines)
+            inicio += int(fines[-1]) + 1
+
+        self.filas = fila
+        self.posiciones = np.concatenate(posiciones) if posiciones else np.array([], dtype=np.int64)
+        if zonas:
+            # Un tramo puede quedar repartido entre dos ventanas
+            zonas = pd.concat(zonas).groupby(level=0).agg({"min": "min", "max": "max"})
+            tipo = np.float64 if numerica else str
+            self.minimos, self.maximos = zonas["min"].to_numpy(tipo), zonas["max"].to_numpy(tipo)
+        return True
+
+    def _guardar_indice(self):
+        temporal = ruta_indice(self.ruta) + ".tmp"
+        datos = {"huella": huella(self.ruta), "paso": PASO, "filas": self.filas, "posiciones": self.posiciones}
+        if self.minimos is not None:
+            datos.update(minimos=self.minimos, maximos=self.maximos)
+        try:
+            with open(temporal, "wb") as f:
+                np.savez(f, **datos)
+            os.replace(temporal, ruta_indice(self.ruta))
+        except OSError as e:
+            print(f"\nNo se pudo guardar el índice ({e}); se volverá a armar la próxima vez.")
+
+    def esperar_indice(self):
+        if not self.listo.is_set():
+            print("Esperando el índice del archivo...")
+            self.listo.wait()
+
+    def sin_indice(self):
+        """True si el índice no se pudo armar (la primera vez avisa por qué)"""
+        self.esperar_indice()
+        if self.posiciones is not None:
+            return False
+        if self.error is not None:
+            print(f"No se pudo armar el índice ({self.error}); se avanza recorriendo el archivo.")
+            self.error = None
+        return True
+
+    def ubicar(self, fila):
+        """Byte donde empieza la fila: de una página ya vista o del tramo del índice"""
+        if fila in self.conocidas:
+            return self.conocidas[fila]
+        if self.sin_indice():
+            # Desde la fila conocida más cercana antes de la pedida
+            desde = max(conocida for conocida in self.conocidas if conocida < fila)
+            self.conocidas[fila] = avanzar(self.mm, self.conocidas[desde], fila - desde)
+            return self.conocidas[fila]
+        tramo = fila // PASO
+        return avanzar(self.mm, int(self.posiciones[tramo]), fila - tramo * PASO)
+
+    def leer(self, fila, cantidad):
+        """Parsea solo las filas [fila, fila + cantidad)"""
+        inicio = self.ubicar(fila)
+        fin = avanzar(self.mm, inicio, cantidad)
+        pagina = pd.read_csv(io.BytesIO(self.encabezado + self.mm[inicio:fin]), skip_blank_lines=False)
+        pagina.index = range(fila, fila + len(pagina))
+        self.conocidas[fila + len(pagina)] = fin
+        return pagina
+
+    def buscar_clave(self, valor):
+        """Número de fila del registro con esa clave (None si no está)"""
+        if self.sin_indice():
+            numerica, buscado, tramos = False, valor, itertools.count()  # hasta que se acabe el archivo
+        elif self.minimos is not None:
+            numerica = self.minimos.dtype.kind == "f"
+            try:
+                buscado = float(valor) if numerica else valor
+            except ValueError:
+                return None
+            # Solo se parsean los tramos cuyo rango de claves puede contenerla
+            tramos = np.flatnonzero((self.minimos <= buscado) & (buscado <= self.maximos))
+        else:
+            numerica, buscado, tramos = False, valor, range(len(self.posiciones))
+        for tramo in tramos:
+            claves = self.leer(int(tramo) * PASO, PASO)[self.clave]
+            if len(claves) == 0:
+                break
+            coincide = pd.to_numeric(claves, errors="coerce") == buscado if numerica else claves.astype(str) == buscado
+            if coincide.any():
+                return int(claves.index[coincide.to_numpy().argmax()])
+        return None
+
+    def cerrar(self):
+        self.detener.set()
+        self.indexador.join()
+        self.mm.close()
+        self.archivo.close()
+
+
+def ver_csv(ruta, filas_por_pagina=FILAS_POR_PAGINA):
+    if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+        print(f"El archivo {ruta} no existe o está vacío.")
+        return
+    inicio = time.perf_counter()
+    visor = VisorCSV(ruta)
+    fila = 0
+    try:
+        while True:
+            pagina = visor.leer(fila, filas_por_pagina)
+            if not visor.listo.is_set():
+                total = "indexando..."
+            else:
+                total = f"{visor.filas} filas" if visor.filas is not None else "sin índice"
+            print(f"\n--- {os.path.basename(ruta)} ({total}) ---")
+            print(pagina.to_string() if len(pagina) else "(no hay más filas)")
+            if inicio is not None:
+                print(f"Primera página en {(time.perf_counter() - inicio) * 1000:.0f} ms")
+                inicio = None
+
+            orden = input("[Enter] siguiente, [a] anterior, [f N] ir a la fila N, [c valor] buscar por "
+                          f"{visor.clave}, [s] salir: ").strip()
+            if orden == "":
+                if len(pagina) == filas_por_pagina:
+                    fila += filas_por_pagina
+            elif orden == "a":
+                fila = max(fila - filas_por_pagina, 0)
+            elif orden.startswith("f "):
+                try:
+                    numero = int(orden[2:])
+                except ValueError:
+                    print("Debe ingresar un número válido.")
+                    continue
+                if visor.sin_indice() and numero >= 0:
+                    fila = numero  # sin índice no se sabe cuántas filas hay: si no existe se ve la página vacía
+                elif 0 <= numero < (visor.filas or 0):
+                    fila = numero
+                else:
+                    print(f"Fila fuera de rango (el archivo tiene {visor.filas} filas).")
+            elif orden.startswith("c "):
+                encontrada = visor.buscar_clave(orden[2:].strip())
+                if encontrada is None:
+                    print(f"No hay ningún registro con {visor.clave} = {orden[2:].strip()}.")
+                else:
+                    fila = encontrada
+            elif orden == "s":
+                break
+            else:
+                print("Opción no válida.")
+    finally:
+        visor.cerrar()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) < 2:
+        print("Uso: python visor_csv.py archivo.csv")
+    else:
+        ver_csv(sys.argv[1])